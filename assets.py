@@ -0,0 +1,224 @@
+"""
+DayZ Geometry Maker - Asset Registry
+Decoded template P3Ds, shared for the whole session.
+
+Templates come from two places: the bundled assets/ folder and an optional
+user folder set in the addon preferences (door / window presets etc.). Each
+file is decoded the first time it is asked for and kept in array form:
+
+    co          (N, 3) float32 vertex positions, Blender space
+    loops       int32 vertex index per face corner
+    starts      int32 first loop of each face
+    selections  named selection -> int32 vertex indices
+    mass        float32 per-vertex mass, or None
+    resolution  LOD resolution value
+    lods        the same dict for every LOD of the file (the fields above
+                are the first LOD's)
+
+An entry is decoded again only when its file's mtime changes. Entries are
+shared between callers — copy before modifying.
+"""
+
+import os
+import struct
+
+import bpy
+import numpy as np
+
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# P3D point record: x, z, y (Arma is Y-up) and point flags
+_POINT_DTYPE = np.dtype([("x", "<f4"), ("z", "<f4"), ("y", "<f4"), ("flags", "<u4")])
+
+_entries = {}   # path -> (mtime, entry)
+_listing = {"key": None, "files": {}}   # asset_files() result and the folder mtimes it was read at
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+def decode_p3d(filepath):
+    """
+    Decode an MLOD P3D into an entry dict. The entry carries the first LOD's
+    arrays (see module doc) plus "lods", the same dict for every LOD in the
+    file. Internal selections ('#...') are skipped; per-vertex mass from
+    '#Mass#' is kept as "mass" (None when the LOD has none).
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    if data[0:4] != b'MLOD':
+        raise ValueError("Not a valid MLOD P3D: {}".format(filepath))
+    nlods = struct.unpack_from('<I', data, 8)[0]
+    pos = 12  # sig(4) + version(4) + nlods(4)
+
+    lods = []
+    for _ in range(nlods):
+        lod, pos = _decode_lod(data, pos, filepath)
+        lods.append(lod)
+    if not lods:
+        raise ValueError("P3D has no LODs: {}".format(filepath))
+    return dict(lods[0], name=os.path.splitext(os.path.basename(filepath))[0],
+                path=filepath, lods=lods)
+
+
+def _decode_lod(data, pos, filepath):
+    """One P3DM LOD starting at pos. Returns (lod dict, position after it)."""
+    if data[pos:pos + 4] != b'P3DM':
+        raise ValueError("Expected P3DM LOD: {}".format(filepath))
+    pos += 4 + 8  # sig + version_major + version_minor
+
+    npoints, nnormals, nfaces = struct.unpack_from('<III', data, pos)
+    pos += 16  # 3 counts + flags
+
+    points = np.frombuffer(data, dtype=_POINT_DTYPE, count=npoints, offset=pos)
+    co = np.column_stack([points["x"], points["y"], points["z"]]).astype(np.float32)
+    pos += npoints * 16
+    pos += nnormals * 12  # skip normals
+
+    # Faces are variable length (texture / material strings), so walk them
+    loops = []
+    sizes = np.empty(nfaces, dtype=np.int32)
+    for i in range(nfaces):
+        count_sides = struct.unpack_from('<I', data, pos)[0]; pos += 4
+        loops.extend(data[pos + k * 16:pos + k * 16 + 4] for k in range(count_sides))
+        pos += count_sides * 16
+        if count_sides < 4:
+            pos += 16  # triangle padding slot
+        pos += 4  # face flags
+        pos = data.index(b'\x00', pos) + 1  # texture string
+        pos = data.index(b'\x00', pos) + 1  # material string
+        sizes[i] = count_sides
+    loops = np.frombuffer(b"".join(loops), dtype="<u4").astype(np.int32)
+    starts = np.zeros(nfaces, dtype=np.int32)
+    np.cumsum(sizes[:-1], out=starts[1:])
+
+    if data[pos:pos + 4] == b'TAGG':
+        pos += 4
+    selections = {}
+    mass = None
+    while pos < len(data):
+        active = data[pos]; pos += 1
+        end = data.index(b'\x00', pos)
+        name = data[pos:end].decode('ascii', errors='replace'); pos = end + 1
+        length = struct.unpack_from('<I', data, pos)[0]; pos += 4
+        tagg = data[pos:pos + length]; pos += length
+        if name == '#EndOfFile#':
+            break
+        if not active:
+            continue
+        if name == '#Mass#':
+            mass = np.frombuffer(tagg, dtype="<f4", count=min(npoints, length // 4)).copy()
+            continue
+        if name.startswith('#') or not name.isascii() or '\x01' in name:
+            continue
+        weights = np.frombuffer(tagg, dtype=np.uint8, count=min(npoints, length))
+        selections[name] = np.flatnonzero(weights).astype(np.int32)
+
+    resolution = struct.unpack_from('<f', data, pos)[0] if pos + 4 <= len(data) else 0.0
+    pos += 4
+    return {"co": co, "loops": loops, "starts": starts, "selections": selections,
+            "mass": mass, "resolution": resolution}, pos
+
+
+def write_mesh(mesh, lod, scale=None):
+    """
+    Write one decoded LOD (an entry or one of its "lods") into an empty mesh.
+    Per-vertex mass goes to the FHQWeights attribute. scale (x, y, z) is
+    baked into the vertices.
+    """
+    co = lod["co"]
+    if scale is not None:
+        co = co * np.asarray(scale, dtype=np.float32)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(len(lod["loops"]))
+    mesh.loops.foreach_set("vertex_index", lod["loops"])
+    mesh.polygons.add(len(lod["starts"]))
+    mesh.polygons.foreach_set("loop_start", lod["starts"])
+    mesh.update(calc_edges=True)
+    if lod["mass"] is not None and len(lod["mass"]) == len(co):
+        attr = mesh.attributes.new("FHQWeights", 'FLOAT', 'POINT')
+        attr.data.foreach_set("value", lod["mass"])
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+def user_assets_dir():
+    """The template folder from the addon preferences, or None."""
+    from .updater import ADDON_BL_IDNAME
+    addon = bpy.context.preferences.addons.get(ADDON_BL_IDNAME)
+    path = getattr(addon.preferences, "user_assets_path", "") if addon else ""
+    path = bpy.path.abspath(path) if path else ""
+    return path if path and os.path.isdir(path) else None
+
+
+def asset_files():
+    """
+    {name: (path, source)} for every P3D the registry can serve. Bundled
+    assets win over user files of the same name, so the ladder templates
+    can't be shadowed by accident. The folders are only listed again when
+    one of them (or its modification time) changed, so panel redraws stay
+    cheap. Shared result — don't modify it.
+    """
+    folders = [(source, folder) for source, folder in
+               (("bundled", ASSETS_DIR), ("user", user_assets_dir()))
+               if folder is not None and os.path.isdir(folder)]
+    key = tuple((folder, os.path.getmtime(folder)) for _source, folder in folders)
+    if _listing["key"] == key:
+        return _listing["files"]
+
+    found = {}
+    for source, folder in folders:
+        for filename in sorted(os.listdir(folder)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() != ".p3d":
+                continue
+            if name not in found:
+                found[name] = (os.path.join(folder, filename), source)
+    _listing["key"], _listing["files"] = key, found
+    return found
+
+
+def load(filepath):
+    """Decoded entry for a P3D path, decoded again only after the file changed."""
+    mtime = os.path.getmtime(filepath)
+    hit = _entries.get(filepath)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    entry = decode_p3d(filepath)
+    _entries[filepath] = (mtime, entry)
+    return entry
+
+
+def get(name):
+    """Decoded entry for an asset name (file stem), bundled or user."""
+    bundled = os.path.join(ASSETS_DIR, name + ".p3d")
+    if os.path.exists(bundled):
+        return load(bundled)
+    item = asset_files().get(name)
+    if item is None:
+        raise FileNotFoundError("P3D asset not found: {}".format(name))
+    return load(item[0])
+
+
+def preload():
+    """Decode every known asset now. Returns the number that failed."""
+    failed = 0
+    for name, (path, _source) in asset_files().items():
+        try:
+            load(path)
+        except Exception as e:
+            print("[DGM] Failed to decode asset '{}': {}".format(name, e))
+            failed += 1
+    return failed
+
+
+def clear():
+    """Drop all decoded entries and the folder listing (Reload Templates, unregister)."""
+    _entries.clear()
+    _listing["key"], _listing["files"] = None, {}
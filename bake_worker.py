@@ -0,0 +1,64 @@
+"""
+DayZ Geometry Maker - Background Bake Worker
+One selection bake inside a background Blender, started by baker_bridge:
+
+    blender --background <snapshot.blend> --python bake_worker.py -- \
+        <object> <output dir> <addon package> <license wait>
+
+Waits for the DayZ Texture Tools license check, makes <object> the only
+selected / active object, points the baker at <output dir> and runs it
+without its modal UI. Exit code 0 when the baker finished.
+"""
+
+import importlib
+import sys
+import time
+
+import bpy
+
+
+def _main(argv):
+    if len(argv) < 4:
+        print("usage: bake_worker.py -- <object> <output dir> <addon package> <license wait>")
+        return 2
+    obj_name, out_dir, package, wait = argv[0], argv[1], argv[2], float(argv[3])
+
+    try:
+        bridge = importlib.import_module(package + ".baker_bridge")
+    except ImportError as e:
+        print("[DGM] Addon not loaded in background Blender: {}".format(e))
+        return 3
+
+    deadline = time.monotonic() + wait
+    while not bridge.baker_licensed():
+        if time.monotonic() > deadline:
+            print("[DGM] Baker not licensed in background Blender")
+            return 3
+        time.sleep(0.5)
+
+    obj = bpy.data.objects.get(obj_name)
+    if obj is None:
+        print("[DGM] Object '{}' not in snapshot".format(obj_name))
+        return 4
+
+    view_layer = bpy.context.view_layer
+    for o in view_layer.objects:
+        o.select_set(False)
+    obj.hide_set(False)
+    obj.select_set(True)
+    view_layer.objects.active = obj
+
+    bridge._set_baker_output(out_dir)
+    result = bpy.ops.dayztexturetools.texture_baker_run('EXEC_DEFAULT')
+    return 0 if 'FINISHED' in result else 5
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    try:
+        code = _main(argv)
+    except Exception as e:
+        print("[DGM] Background bake failed: {}".format(e))
+        code = 1
+    sys.stdout.flush()
+    sys.exit(code)
@@ -301,79 +301,424 @@ def _restore_baker_output(path: str) -> None:
     _set_baker_output(path)
 
 
-def _isolate_selection_as_object(target_obj, sel_name: str):
+def _isolate_selection_as_object(target_obj, vgroup_name: str, name: str):
     """
-    Duplicate target_obj, delete all vertices NOT in vertex group sel_name,
-    return the new isolated object (or None on failure).
-    The new object is in Object Mode when returned.
+    Copy of target_obj holding only the vertices in vertex group vgroup_name,
+    linked to the scene and hidden. Built through the data API (no duplicate
+    operator, no Edit Mode). Returns None if the group has no geometry.
     """
     import bmesh
 
-    # Ensure we're in object mode first
-    if bpy.context.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
+    vg = target_obj.vertex_groups.get(vgroup_name)
+    if vg is None:
+        return None
 
-    # Deselect all, select + activate target
-    bpy.ops.object.select_all(action='DESELECT')
-    target_obj.select_set(True)
-    bpy.context.view_layer.objects.active = target_obj
+    bm = bmesh.new()
+    bm.from_mesh(target_obj.data)
+    deform_layer = bm.verts.layers.deform.active
+    if deform_layer is None:
+        bm.free()
+        return None
+    vg_idx = vg.index
+    verts_to_delete = [v for v in bm.verts if v[deform_layer].get(vg_idx, 0.0) == 0.0]
+    if len(verts_to_delete) == len(bm.verts):
+        bm.free()
+        return None
+    bmesh.ops.delete(bm, geom=verts_to_delete, context='VERTS')
+
+    mesh = target_obj.data.copy()
+    mesh.name = name
+    bm.to_mesh(mesh)
+    bm.free()
+
+    dup = target_obj.copy()
+    dup.data = mesh
+    dup.name = name
+    dup.dgm_props.is_dayz_object = False
+    bpy.context.scene.collection.objects.link(dup)
+    dup.matrix_world = target_obj.matrix_world
+    dup.hide_set(True)
+    return dup
 
-    # Duplicate
-    bpy.ops.object.duplicate(linked=False)
-    dup = bpy.context.active_object
-    dup.name = "__dgm_bake_tmp__"
 
-    # Get the vertex group index for this selection
-    vg = dup.vertex_groups.get(sel_name)
-    if vg is None:
-        # No matching vertex group — delete dup and bail
-        bpy.data.objects.remove(dup, do_unlink=True)
+# ---------------------------------------------------------------------------
+# Bake job queue
+# ---------------------------------------------------------------------------
+
+# The running bake (empty when idle):
+#   {"target", "model_name", "final_dir", "temp_dir", "bake_rvmat", "snapshot",
+#    "workers", "jobs": [job], "queue": [job], "session": [job],
+#    "background": [job], "foreground": job or None, "started", "cancelled",
+#    "original_active", "original_selected"}
+# job = {"sel", "vgroup", "obj", "dir", "log", "status", "mode", "proc",
+#        "start", "end"}
+# "queue" jobs wait for a background Blender process, "session" jobs for
+# the baker in this Blender (one at a time).
+_bake = {}
+
+# Summary line of the last finished bake, for the panel
+_last_bake = {"summary": ""}
+
+# How often the main thread checks on running bakes (seconds)
+_BAKE_POLL_INTERVAL = 0.5
+
+# Seconds a background worker waits for the baker license check
+_BAKE_LICENSE_WAIT = 30
+
+# Isolated selection objects are named with this prefix
+_BAKE_OBJ_PREFIX = "__dgm_bake_"
+
+_STEM_TAGS = ("_co", "_nohq", "_smdi", "_em", "_as")
+_TEXTURE_EXTS = (".paa", ".png", ".tga", ".bmp")
+
+
+def _baker_op_class():
+    try:
+        from bl_ext.user_default.phlanka_library_beta.texture_baker.ops import (
+            DAYZTEXTTOOLS_OT_TextureBakerRun as _BakerOp
+        )
+        return _BakerOp
+    except Exception:
         return None
 
-    vg_idx = vg.index
 
-    # Enter edit mode on the duplicate to delete non-group vertices
-    bpy.context.view_layer.objects.active = dup
-    bpy.ops.object.mode_set(mode='EDIT')
+def baker_supports_background() -> bool:
+    """True if the baker operator can run without its modal UI (execute())."""
+    op = _baker_op_class()
+    return op is not None and callable(getattr(op, "execute", None))
 
-    bm = bmesh.from_edit_mesh(dup.data)
-    bm.verts.ensure_lookup_table()
 
-    deform_layer = bm.verts.layers.deform.active
-    verts_to_delete = []
+def _bake_worker_count(scene, jobs: int) -> int:
+    """Background bakes to run at once (dgm_bake_workers, 0 = auto)."""
+    wanted = getattr(scene, "dgm_bake_workers", 0)
+    if wanted <= 0:
+        wanted = max(1, (os.cpu_count() or 2) // 2)
+    return max(1, min(wanted, jobs))
+
+
+def bake_running() -> bool:
+    return bool(_bake)
+
 
-    if deform_layer is not None:
-        for v in bm.verts:
-            weight = v[deform_layer].get(vg_idx, 0.0)
-            if weight == 0.0:
-                verts_to_delete.append(v)
+def last_bake_summary() -> str:
+    return _last_bake["summary"]
+
+
+def bake_progress():
+    """
+    None when idle, else {"total", "done", "failed", "running": [sel names],
+    "elapsed", "eta"}. eta (seconds) is None until the first selection has
+    finished; it assumes the remaining ones take the average time so far.
+    """
+    if not _bake:
+        return None
+    import time
+    now = time.monotonic()
+    jobs = _bake["jobs"]
+    finished = [j for j in jobs if j["end"] is not None]
+    timed = [j["end"] - j["start"] for j in finished if j["start"] is not None]
+    running = [j for j in jobs if j["status"] == "running"]
+    remaining = len(jobs) - len(finished)
+
+    eta = None
+    if timed:
+        lanes = max(1, len(running))
+        avg = sum(timed) / len(timed)
+        eta = avg * remaining / lanes
+        if running:
+            eta -= min(avg, sum(now - j["start"] for j in running) / len(running))
+        eta = max(0.0, eta)
+    return {
+        "total": len(jobs),
+        "done": len(finished),
+        "failed": sum(1 for j in finished if j["status"] != "done"),
+        "running": [j["sel"] for j in running],
+        "elapsed": now - _bake["started"],
+        "eta": eta,
+    }
+
+
+def format_seconds(seconds) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return "{}s".format(seconds)
+    return "{}m {:02d}s".format(seconds // 60, seconds % 60)
+
+
+def _copy_files_for_sel(bake, job, new_files):
+    """Copy one selection's baker output from its temp folder to data/ under final names."""
+    import shutil
+    model_name, final_dir, sel_name = bake["model_name"], bake["final_dir"], job["sel"]
+    base = "{}_{}".format(model_name, sel_name) if model_name else sel_name
+    os.makedirs(final_dir, exist_ok=True)
+
+    tagged = {}
+    rv_src = None
+    for fpath in new_files:
+        fname = os.path.basename(fpath)
+        fname_lower = fname.lower()
+        if fname_lower.endswith(".rvmat"):
+            rv_src = fpath
+            continue
+        stem_lower, ext_lower = os.path.splitext(fname_lower)
+        if ext_lower not in _TEXTURE_EXTS:
+            continue
+        matched_tag = next((t for t in _STEM_TAGS if stem_lower.endswith(t)), None)
+        if matched_tag:
+            tagged[matched_tag] = (fpath, ext_lower)
+
+    for tag, (src, actual_ext) in tagged.items():
+        dst = os.path.join(final_dir, base + tag + actual_ext)
+        try:
+            shutil.copy2(src, dst)
+            print("[DGM] Copied {} -> {}".format(os.path.basename(src), os.path.basename(dst)))
+        except Exception as e:
+            print("[DGM] Could not copy {} to '{}': {}".format(tag, dst, e))
+
+    if rv_src:
+        rv_dst = os.path.join(final_dir, base + ".rvmat")
+        try:
+            shutil.copy2(rv_src, rv_dst)
+            _fix_rvmat_paths(rv_dst, job["dir"], final_dir, model_name, sel_name)
+        except Exception as e:
+            print("[DGM] Could not copy/fix RVMAT to '{}': {}".format(rv_dst, e))
+
+
+def _remove_job_obj(job):
+    obj = bpy.data.objects.get(job["obj"])
+    if obj is not None:
+        mesh = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def _finish_job(bake, job, ok=True):
+    """Collect a finished selection's files and record its timing."""
+    import time
+    job["end"] = time.monotonic()
+    if job["start"] is None:
+        job["start"] = job["end"]
+    new_files = _collect_new_files(job["dir"], set()) if ok else []
+    if new_files:
+        _copy_files_for_sel(bake, job, new_files)
+        job["status"] = "done"
+        print("[DGM] Baked '{}' in {} ({})".format(
+            job["sel"], format_seconds(job["end"] - job["start"]), job["mode"]))
     else:
-        # No deform data — remove all verts (nothing to bake)
-        verts_to_delete = list(bm.verts)
+        job["status"] = "failed"
+        print("[DGM] No output files for selection '{}'".format(job["sel"]))
+    _remove_job_obj(job)
+
+
+def _start_background_job(bake, job):
+    """Bake job in a background Blender opened on the snapshot."""
+    import subprocess
+    import time
+    worker = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bake_worker.py")
+    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+    os.makedirs(job["dir"], exist_ok=True)
+    with open(job["log"], "wb") as log:
+        job["proc"] = subprocess.Popen(
+            [bpy.app.binary_path, "--background", bake["snapshot"],
+             "--python", worker, "--",
+             job["obj"], job["dir"], __package__, str(_BAKE_LICENSE_WAIT)],
+            stdout=log, stderr=subprocess.STDOUT, creationflags=flags,
+        )
+    job["status"], job["mode"], job["start"] = "running", "background", time.monotonic()
+    bake["background"].append(job)
 
-    bmesh.ops.delete(bm, geom=verts_to_delete, context='VERTS')
-    bmesh.update_edit_mesh(dup.data)
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+def _start_session_job(bake, job):
+    """Bake job with the baker in this Blender. Returns False if it could not start."""
+    import shutil
+    import time
+    obj = bpy.data.objects.get(job["obj"])
+    if obj is None:
+        return False
+
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    obj.hide_set(False)
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+    # A failed background attempt may have left partial output behind
+    shutil.rmtree(job["dir"], ignore_errors=True)
+    os.makedirs(job["dir"], exist_ok=True)
+    _set_baker_output(job["dir"])
+    job["status"], job["mode"], job["start"] = "running", "session", time.monotonic()
+    try:
+        result = bpy.ops.dayztexturetools.texture_baker_run('INVOKE_DEFAULT')
+    except Exception as exc:
+        print("[DGM] Baker failed for '{}': {}".format(job["sel"], exc))
+        return False
+    if 'CANCELLED' in result:
+        print("[DGM] Baker cancelled for '{}'".format(job["sel"]))
+        return False
+    bake["foreground"] = job
+    return True
+
 
-    # If nothing left, remove and bail
-    if len(dup.data.vertices) == 0:
-        bpy.data.objects.remove(dup, do_unlink=True)
+def _poll_bake():
+    """Timer: collect finished bakes, start queued ones, finish the run."""
+    bake = _bake
+    if not bake:
         return None
 
-    return dup
+    for job in list(bake["background"]):
+        rc = job["proc"].poll()
+        if rc is None:
+            continue
+        bake["background"].remove(job)
+        if rc == 0:
+            _finish_job(bake, job)
+            continue
+        with open(job["log"], "rb") as log:
+            tail = log.read().decode(errors="replace").strip().splitlines()[-3:]
+        print("[DGM] Background bake of '{}' failed (exit code {}): {}".format(
+            job["sel"], rc, " / ".join(tail)))
+        # Retry in this Blender; if the baker can't run in the background
+        # at all, stop starting workers and bake the rest here too.
+        job["status"], job["start"], job["proc"] = "queued", None, None
+        bake["session"].append(job)
+        if not any(j["status"] == "done" and j["mode"] == "background" for j in bake["jobs"]):
+            bake["session"].extend(bake["queue"])
+            bake["queue"].clear()
+
+    fg = bake["foreground"]
+    if fg is not None and not _baker_is_running():
+        bake["foreground"] = None
+        _finish_job(bake, fg)
+
+    if not bake["cancelled"]:
+        while bake["queue"] and len(bake["background"]) < bake["workers"]:
+            _start_background_job(bake, bake["queue"].pop(0))
+        while bake["foreground"] is None and bake["session"]:
+            job = bake["session"].pop(0)
+            if not _start_session_job(bake, job):
+                _finish_job(bake, job, ok=False)
+
+    _redraw_view3d()
+    if bake["background"] or bake["foreground"] is not None or bake["queue"] or bake["session"]:
+        return _BAKE_POLL_INTERVAL
+    _complete_bake(bake)
+    return None
+
+
+def _complete_bake(bake):
+    """All selections finished: assign paths, clean up, print timings."""
+    import shutil
+    _restore_baker_output(bake["final_dir"])
+    if not bake["cancelled"]:
+        _assign_baked_paths(bake)
+
+    for job in bake["jobs"]:
+        _remove_job_obj(job)
+    try:
+        shutil.rmtree(bake["temp_dir"])
+    except Exception as e:
+        print("[DGM] Could not remove temp dir: {}".format(e))
+
+    try:
+        bpy.ops.object.select_all(action='DESELECT')
+        for obj in bake["original_selected"]:
+            obj.select_set(True)
+        bpy.context.view_layer.objects.active = bake["original_active"]
+    except (ReferenceError, RuntimeError):
+        pass
+
+    done = [j for j in bake["jobs"] if j["status"] == "done"]
+    failed = len(bake["jobs"]) - len(done)
+    import time
+    elapsed = time.monotonic() - bake["started"]
+    print("[DGM] Per-selection bake {}: {}/{} selection(s) in {}".format(
+        "cancelled" if bake["cancelled"] else "complete", len(done), len(bake["jobs"]),
+        format_seconds(elapsed)))
+    for job in bake["jobs"]:
+        took = format_seconds(job["end"] - job["start"]) if job["end"] is not None else "-"
+        print("[DGM]   {:<24} {:>8}  {:<10} {}".format(job["sel"], took, job["mode"] or "-", job["status"]))
+
+    _last_bake["summary"] = "Last bake: {}/{} selection(s) in {}{}".format(
+        len(done), len(bake["jobs"]), format_seconds(elapsed),
+        ", {} failed".format(failed) if failed else "")
+    _bake.clear()
+    _redraw_view3d()
+
+
+def _assign_baked_paths(bake):
+    assigned = 0
+    target_obj = bpy.data.objects.get(bake["target"]) if bake["target"] else None
+    t_props = getattr(target_obj, "dgm_props", None) if target_obj else None
+    if t_props is None:
+        print("[DGM] Bake complete — no target object to assign paths to.")
+        return
+    for sm in t_props.selection_mats:
+        if not sm.bake_texture:
+            continue
+        if getattr(sm, "no_texture", False):
+            continue
+        name = _selection_base_name(sm)
+        if not name:
+            continue
+        co_path, rv_path = predict_texture_paths(bake["final_dir"], bake["model_name"], name)
+        if co_path:
+            sm.texture = co_path
+            assigned += 1
+        if bake["bake_rvmat"] and rv_path:
+            sm.rv_mat = rv_path
+    print("[DGM] Bake complete — assigned paths to {} named selections.".format(assigned))
+
+
+def cancel_bake(force=False):
+    """
+    Stop queued and background bakes. A bake running in this Blender is left
+    to finish (the baker's modal can't be interrupted from here) unless force
+    is set (addon unregister), which drops everything at once.
+    """
+    if not _bake:
+        return
+    _bake["cancelled"] = True
+    for job in _bake["background"]:
+        if job["proc"].poll() is None:
+            job["proc"].kill()
+            job["proc"].wait()
+        _finish_job(_bake, job, ok=False)
+    _bake["background"].clear()
+    _bake["queue"].clear()
+    _bake["session"].clear()
+    if force:
+        if bpy.app.timers.is_registered(_poll_bake):
+            bpy.app.timers.unregister(_poll_bake)
+        _bake["foreground"] = None
+        _complete_bake(_bake)
+
+
+def _redraw_view3d():
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    except Exception:
+        pass
 
 
 def run_baker_and_assign(operator, objects: list, model_name: str, p3d_filepath: str = "") -> bool:
     """
-    Per-selection bake flow:
-      For each named selection with a vertex group:
-        1. Duplicate the target object, isolate to just that vertex group's verts
-        2. Set as active, point baker at data_temp/
-        3. Baker runs modally
-        4. On completion: copy/rename files to data/, fix RVMAT paths, delete temp object
-        5. Move to next selection
-      After all selections: restore baker output path, assign final paths to selection_mats
+    Per-selection bake as a job queue:
+      1. An isolated copy of the target is prepared for every selection
+         marked Bake Texture, each baking into its own data_temp/ folder.
+      2. If the baker can run without its UI, the file is snapshotted and
+         selections bake concurrently in background Blender processes
+         (Parallel Bakes); otherwise, or if a worker fails, they bake one
+         at a time in this Blender through the baker's modal operator.
+      3. Each finished selection's files are copied / renamed into data/
+         and its RVMAT paths fixed; progress, ETA and per-selection timings
+         are reported (panel and console).
+      4. When all are done the baker output path is restored and the final
+         paths are assigned to the selection_mats.
     """
     if not baker_licensed():
         operator.report(
@@ -382,6 +727,9 @@ def run_baker_and_assign(operator, objects: list, model_name: str, p3d_filepath:
             "Check phlanka_library_beta is installed and activated."
         )
         return False
+    if _bake:
+        operator.report({'ERROR'}, "A bake is already running — wait for it or cancel it first.")
+        return False
 
     # Resolve the final data/ dir — always prefer the P3D export location so
     # textures land next to the model. Fall back to the baker panel path only
@@ -432,174 +780,63 @@ def run_baker_and_assign(operator, objects: list, model_name: str, p3d_filepath:
         operator.report({'WARNING'}, "No named selections with vertex groups found to bake.")
         return False
 
-    bake_rvmat = getattr(bpy.context.scene, "dayz_bake_rvmat", False)
-
-    # Queue state — captured by the timer closures
-    queue = list(sel_entries)  # mutable list of (sel_name, vgroup_name), pop from front
-    state = {
-        "phase": "idle",          # idle | baking | collecting
-        "current_sel": None,
-        "temp_obj": None,
-        "pre_files": set(),
-        "total_assigned": 0,
-        "original_active": bpy.context.view_layer.objects.active,
-        "original_selected": [o for o in bpy.context.selected_objects],
-    }
+    import time
+    scene = bpy.context.scene
+    original_active = bpy.context.view_layer.objects.active
+    original_selected = list(bpy.context.selected_objects)
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
 
-    _STEM_TAGS = ("_co", "_nohq", "_smdi", "_em", "_as")
-    _TEXTURE_EXTS = (".paa", ".png", ".tga", ".bmp")
-
-    def _copy_files_for_sel(new_files, sel_name):
-        import shutil
-        base = "{}_{}".format(model_name, sel_name) if model_name else sel_name
-        os.makedirs(final_dir, exist_ok=True)
-
-        tagged = {}
-        rv_src = None
-        for fpath in new_files:
-            fname = os.path.basename(fpath)
-            fname_lower = fname.lower()
-            if fname_lower.endswith(".rvmat"):
-                rv_src = fpath
-                continue
-            stem_lower, ext_lower = os.path.splitext(fname_lower)
-            if ext_lower not in _TEXTURE_EXTS:
-                continue
-            matched_tag = next((t for t in _STEM_TAGS if stem_lower.endswith(t)), None)
-            if matched_tag:
-                tagged[matched_tag] = (fpath, ext_lower)
-
-        for tag, (src, actual_ext) in tagged.items():
-            dst = os.path.join(final_dir, base + tag + actual_ext)
-            try:
-                shutil.copy2(src, dst)
-                print("[DGM] Copied {} -> {}".format(os.path.basename(src), os.path.basename(dst)))
-            except Exception as e:
-                print("[DGM] Could not copy {} to '{}': {}".format(tag, dst, e))
-
-        if rv_src:
-            rv_dst = os.path.join(final_dir, base + ".rvmat")
-            try:
-                shutil.copy2(rv_src, rv_dst)
-                _fix_rvmat_paths(rv_dst, temp_dir, final_dir, model_name, sel_name)
-            except Exception as e:
-                print("[DGM] Could not copy/fix RVMAT to '{}': {}".format(rv_dst, e))
-
-    def _clean_temp():
-        import shutil
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            print("[DGM] Could not remove temp dir: {}".format(e))
-
-    def _remove_temp_obj():
-        tmp = state.get("temp_obj")
-        if tmp and tmp.name in bpy.data.objects:
-            bpy.data.objects.remove(tmp, do_unlink=True)
-        state["temp_obj"] = None
-
-    def _assign_all_paths():
-        assigned = 0
-        t_props = getattr(target_obj, "dgm_props", None) if target_obj else None
-        if t_props is None:
-            print("[DGM] Bake complete — no target object to assign paths to.")
-            return
-        for sm in t_props.selection_mats:
-            if not sm.bake_texture:
-                continue
-            if getattr(sm, "no_texture", False):
-                continue
-            name = _selection_base_name(sm)
-            if not name:
-                continue
-            co_path, rv_path = predict_texture_paths(final_dir, model_name, name)
-            if co_path:
-                sm.texture = co_path
-                assigned += 1
-            if bake_rvmat and rv_path:
-                sm.rv_mat = rv_path
-        print("[DGM] Bake complete — assigned paths to {} named selections.".format(assigned))
-
-    def _start_next():
-        """Pop next selection from queue, isolate geometry, start baker. Returns timer interval or None."""
-        if not queue:
-            # All done
-            _restore_baker_output(final_dir)
-            _assign_all_paths()
-            print("[DGM] Per-selection bake complete.")
-            return None
-
-        sel_name, vgroup_name = queue.pop(0)
-        state["current_sel"] = sel_name
-        print("[DGM] Baking selection: '{}' (vertex group: '{}')".format(sel_name, vgroup_name))
-
-        # Isolate this selection's geometry using its vertex group name
-        tmp_obj = _isolate_selection_as_object(target_obj, vgroup_name)
-        if tmp_obj is None:
+    # Prepare every isolated selection up front
+    jobs = []
+    for i, (sel_name, vgroup_name) in enumerate(sel_entries):
+        obj = _isolate_selection_as_object(
+            target_obj, vgroup_name, "{}{:02d}".format(_BAKE_OBJ_PREFIX, i))
+        if obj is None:
             print("[DGM] No geometry for selection '{}', skipping.".format(sel_name))
-            return 0.1  # skip to next immediately
-
-        state["temp_obj"] = tmp_obj
-
-        # Set isolated object as active for baker
-        bpy.ops.object.select_all(action='DESELECT')
-        tmp_obj.select_set(True)
-        bpy.context.view_layer.objects.active = tmp_obj
-
-        # Point baker at temp_dir (recreate if previous selection deleted it)
-        os.makedirs(temp_dir, exist_ok=True)
-        _set_baker_output(temp_dir)
-
-        # Snapshot existing files
-        state["pre_files"] = set(os.listdir(temp_dir))
+            continue
+        job_dir = os.path.join(temp_dir, "{:02d}".format(i))
+        jobs.append({"sel": sel_name, "vgroup": vgroup_name, "obj": obj.name,
+                     "dir": job_dir, "log": job_dir + ".log", "status": "queued",
+                     "mode": None, "proc": None, "start": None, "end": None})
+    if not jobs:
+        operator.report({'WARNING'}, "None of the marked selections has geometry to bake.")
+        return False
 
-        # Launch baker
+    workers = 0
+    snapshot = ""
+    if getattr(scene, "dgm_bake_parallel", True) and len(jobs) > 1 and baker_supports_background():
+        snapshot = os.path.join(temp_dir, "bake_snapshot.blend")
         try:
-            result = bpy.ops.dayztexturetools.texture_baker_run('INVOKE_DEFAULT')
-        except Exception as exc:
-            print("[DGM] Baker failed for '{}': {}".format(sel_name, exc))
-            _remove_temp_obj()
-            return 0.1  # try next selection
-
-        if 'CANCELLED' in result:
-            print("[DGM] Baker cancelled for '{}'".format(sel_name))
-            _remove_temp_obj()
-            return 0.1
-
-        state["phase"] = "baking"
-        return 0.5  # start polling
-
-    def _tick():
-        """Timer callback — drives the per-selection bake state machine."""
-        phase = state["phase"]
-
-        if phase == "idle":
-            return _start_next()
-
-        if phase == "baking":
-            if _baker_is_running():
-                return 0.5  # still running, keep polling
-
-            # Baker finished for this selection
-            sel_name = state["current_sel"]
-            new_files = _collect_new_files(temp_dir, state["pre_files"])
-            if new_files:
-                _copy_files_for_sel(new_files, sel_name)
-            else:
-                print("[DGM] No output files for selection '{}'".format(sel_name))
-
-            _clean_temp()
-            _remove_temp_obj()
-
-            state["phase"] = "idle"
-            return _start_next()
-
-        # Unknown phase — stop
-        return None
-
-    # Kick off the first selection via timer (needs main thread)
-    state["phase"] = "idle"
-    bpy.app.timers.register(_tick, first_interval=0.1)
-    operator.report({'INFO'}, "Baking {} selection(s) individually...".format(len(sel_entries)))
+            bpy.ops.wm.save_as_mainfile(filepath=snapshot, copy=True, check_existing=False)
+            workers = _bake_worker_count(scene, len(jobs))
+        except Exception as e:
+            print("[DGM] Could not write bake snapshot, baking in this Blender: {}".format(e))
+
+    _bake.update({
+        "target": target_obj.name,
+        "model_name": model_name,
+        "final_dir": final_dir,
+        "temp_dir": temp_dir,
+        "bake_rvmat": getattr(scene, "dayz_bake_rvmat", False),
+        "snapshot": snapshot,
+        "workers": workers,
+        "jobs": jobs,
+        "queue": list(jobs) if workers else [],
+        "session": [] if workers else list(jobs),
+        "background": [],
+        "foreground": None,
+        "started": time.monotonic(),
+        "cancelled": False,
+        "original_active": original_active,
+        "original_selected": original_selected,
+    })
+
+    # Start via timer (the modal baker needs to be invoked from the main loop)
+    bpy.app.timers.register(_poll_bake, first_interval=0.1)
+    if workers:
+        operator.report({'INFO'}, "Baking {} selection(s), {} at a time in the background...".format(
+            len(jobs), workers))
+    else:
+        operator.report({'INFO'}, "Baking {} selection(s) individually...".format(len(jobs)))
     return True
-    
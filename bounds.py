@@ -0,0 +1,455 @@
+"""
+DayZ Geometry Maker - Bounds
+Bounding volumes over plain NumPy arrays: convex hull (2D), minimum
+bounding sphere, oriented boxes and support polygons.
+
+Like mesh_simplify, nothing in here touches bpy; geometry.py feeds it world
+space vertex arrays and turns the results back into LOD objects. Fits are
+cached per vertex-array hash, so panels and repeated operators reuse them.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# 2D convex hull
+# ---------------------------------------------------------------------------
+
+def _cross_2d(o, a, b):
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - \
+           (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+# Direction counts of the pre-filter polygons, each pass on the survivors of
+# the previous one: a coarse pass over every point, then a fine one that
+# leaves little more than the hull itself even for round outlines
+_FILTER_PASSES = (16, 256)
+
+
+def _inside_extremes(pts, directions):
+    """
+    Mask of the points strictly inside the polygon spanned by the extreme
+    points of pts along `directions` evenly spaced directions.
+    """
+    angles = np.linspace(0.0, 2.0 * np.pi, directions, endpoint=False)
+    extremes = np.argmax(pts @ np.vstack([np.cos(angles), np.sin(angles)]), axis=0)
+    # CCW by direction; neighbouring directions can share an extreme
+    poly = extremes[np.r_[True, extremes[1:] != extremes[:-1]]]
+    if len(poly) > 1 and poly[0] == poly[-1]:
+        poly = poly[:-1]
+    inside = np.zeros(len(pts), dtype=bool)
+    if len(poly) < 3:
+        return inside
+    inside[:] = True
+    for a, b in zip(poly, np.roll(poly, -1)):
+        inside &= _cross_2d(pts[a], pts[b], pts) > 0.0
+    return inside
+
+
+def _hull_candidates(pts):
+    """
+    Indices of the points that can be hull vertices (Akl-Toussaint): points
+    inside a polygon of directional extremes can't be, and are dropped with
+    one vectorised pass per polygon edge.
+    """
+    cand = np.arange(len(pts))
+    for directions in _FILTER_PASSES:
+        cand = cand[~_inside_extremes(pts[cand], directions)]
+    return cand
+
+
+def convex_hull_2d(points):
+    """
+    Indices of the convex hull of (N,2) points, counter-clockwise, without
+    collinear points (Andrew's monotone chain). Points inside the polygon of
+    directional extremes are filtered out first, so the Python chain only
+    walks the few near the outline.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(pts) < 3:
+        return np.arange(len(pts))
+
+    cand = _hull_candidates(pts)
+    order = cand[np.lexsort((pts[cand, 1], pts[cand, 0]))]
+    # Drop exact duplicates so they can't show up as zero-length hull edges
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = np.any(np.diff(pts[order], axis=0) != 0.0, axis=1)
+    order = order[keep]
+    if len(order) < 3:
+        return order
+
+    xy = pts[order].tolist()  # plain floats: numpy scalars are slow in this loop
+
+    def chain(idx):
+        out = []
+        for i in idx:
+            px, py = xy[i]
+            while len(out) >= 2:
+                (ox, oy), (ax, ay) = xy[out[-2]], xy[out[-1]]
+                if (ax - ox) * (py - oy) - (ay - oy) * (px - ox) > 0.0:
+                    break
+                out.pop()
+            out.append(i)
+        return out
+
+    lower = chain(range(len(order)))
+    upper = chain(range(len(order) - 1, -1, -1))
+    return order[lower[:-1] + upper[:-1]]
+
+
+def polygon_area(points):
+    """Signed area of a (N,2) polygon (positive when counter-clockwise)."""
+    p = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(p) < 3:
+        return 0.0
+    q = np.roll(p, -1, axis=0)
+    return 0.5 * float(np.sum(p[:, 0] * q[:, 1] - q[:, 0] * p[:, 1]))
+
+
+# ---------------------------------------------------------------------------
+# Support polygon
+# ---------------------------------------------------------------------------
+
+# Hulls larger than this are thinned greedily before the exact search
+_MAX_HULL = 128
+
+
+def _thin_hull(hull, size):
+    """Indices of `size` hull vertices, dropping the one that loses least area each time."""
+    picked = list(range(len(hull)))
+    while len(picked) > size:
+        p = hull[picked]
+        loss = np.abs(_cross_2d(np.roll(p, 1, axis=0), p, np.roll(p, -1, axis=0)))
+        picked.pop(int(np.argmin(loss)))
+    return np.array(picked, dtype=np.int64)
+
+
+def max_area_subset(hull, count):
+    """
+    Pick `count` vertices of a convex CCW polygon (K,2) whose polygon has the
+    largest area. Exact dynamic programme over triangle fans from every
+    start vertex; hulls above _MAX_HULL vertices are thinned greedily first.
+    Returns sorted indices into hull.
+    """
+    hull = np.asarray(hull, dtype=np.float64).reshape(-1, 2)
+    k = len(hull)
+    if count >= k:
+        return np.arange(k)
+    if count < 3:
+        # Farthest pair (or a single point) — the widest base for 1–2 points
+        d = np.linalg.norm(hull[:, None] - hull[None], axis=2)
+        i, j = np.unravel_index(np.argmax(d), d.shape)
+        return np.array(sorted({int(i), int(j)})[:max(count, 1)])
+
+    base = np.arange(k)
+    if k > _MAX_HULL:
+        base = _thin_hull(hull, _MAX_HULL)
+        hull = hull[base]
+        k = len(hull)
+
+    upper = np.triu(np.ones((k, k), dtype=bool), 1)
+    best_area, best_pick = -1.0, None
+    for s in range(k):
+        order = (np.arange(k) + s) % k
+        p = hull[order]
+        # tri[i, j]: area of the fan triangle (start, i, j), i < j
+        tri = _cross_2d(p[0], p[:, None], p[None, :]) * 0.5
+        tri = np.where(upper, tri, -np.inf)
+        tri[0, :] = -np.inf
+        dp = np.where(np.arange(k) > 0, 0.0, -np.inf)
+        back = []
+        for _ in range(count - 2):
+            cand = dp[:, None] + tri
+            arg = np.argmax(cand, axis=0)
+            dp = cand[arg, np.arange(k)]
+            back.append(arg)
+        j = int(np.argmax(dp))
+        if dp[j] > best_area:
+            chain = [j]
+            for arg in reversed(back):
+                chain.append(int(arg[chain[-1]]))
+            best_area = dp[j]
+            best_pick = sorted(int(base[order[i]]) for i in chain + [0])
+    return np.array(best_pick, dtype=np.int64)
+
+
+def lowest_points(co, tolerance):
+    """(M,3) vertices within `tolerance` of the lowest Z of co (N,3)."""
+    co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+    if not len(co):
+        return co
+    return co[co[:, 2] <= co[:, 2].min() + tolerance]
+
+
+def land_contact_points(co, count=4, tolerance=0.05):
+    """
+    Ground contact points for world space vertices co (N,3): the vertices
+    within `tolerance` of the lowest point are projected onto the ground
+    plane, and `count` corners of their 2D convex hull spanning the largest
+    support polygon are returned at ground height as (M,3).
+    """
+    low = lowest_points(co, tolerance)
+    if not len(low):
+        return low
+    ground = float(low[:, 2].min())
+    hull_idx = convex_hull_2d(low[:, :2])
+    hull = low[hull_idx, :2]
+    chosen = hull[max_area_subset(hull, count)]
+    return np.column_stack([chosen, np.full(len(chosen), ground)])
+
+
+# ---------------------------------------------------------------------------
+# Minimum bounding sphere
+# ---------------------------------------------------------------------------
+
+def _sphere_on(boundary):
+    """Smallest sphere with every boundary point (0-4 of them) on its surface."""
+    k = len(boundary)
+    if k == 0:
+        return np.zeros(3), -1.0
+    if k == 1:
+        return boundary[0].copy(), 0.0
+    if k == 2:
+        c = (boundary[0] + boundary[1]) * 0.5
+        return c, float(np.linalg.norm(boundary[0] - c))
+
+    a = boundary[0]
+    rows = boundary[1:] - a
+    if k == 3:
+        # Circumcentre in the plane of the triangle
+        u, v = rows
+        n = np.cross(u, v)
+        nn = float(n @ n)
+        if nn < 1e-24:
+            return None
+        c = a + (np.cross(n, u) * (v @ v) + np.cross(v, n) * (u @ u)) / (2.0 * nn)
+        return c, float(np.linalg.norm(a - c))
+
+    rhs = 0.5 * np.sum(rows * rows, axis=1)
+    if abs(np.linalg.det(rows)) < 1e-18:
+        return None
+    c = a + np.linalg.solve(rows, rhs)
+    return c, float(np.linalg.norm(a - c))
+
+
+def _welzl(points, boundary=()):
+    """Welzl's algorithm (move-to-front free, iterative over points)."""
+    boundary = list(boundary)
+    sphere = _sphere_on(np.array(boundary).reshape(-1, 3))
+    if sphere is None:
+        # Degenerate boundary (collinear / coplanar) — drop the newest point
+        return _welzl(points, boundary[:-1])
+    c, r = sphere
+    if len(boundary) == 4:
+        return c, r
+    for i in range(len(points)):
+        p = points[i]
+        if r < 0.0 or np.linalg.norm(p - c) > r * (1.0 + 1e-12) + 1e-12:
+            c, r = _welzl(points[:i], boundary + [p])
+    return c, r
+
+
+def min_bounding_sphere(points):
+    """
+    Exact minimum enclosing sphere of (N,3) points, returned as
+    (centre (3,), radius). The full point set is only ever scanned with
+    vectorised distance checks; Welzl runs on a small core set that grows by
+    the farthest outlier until every point is inside.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if not len(pts):
+        return np.zeros(3), 0.0
+    core = pts[np.unique(np.concatenate([pts.argmin(axis=0), pts.argmax(axis=0)]))]
+    scale = max(float(np.ptp(pts, axis=0).max()), 1e-9)
+    while True:
+        c, r = _welzl(core[::-1])
+        d = np.linalg.norm(pts - c, axis=1)
+        far = int(np.argmax(d))
+        if d[far] <= r + scale * 1e-9:
+            return c, max(r, 0.0)
+        core = np.vstack([core, pts[far]])
+
+
+# ---------------------------------------------------------------------------
+# Oriented bounding boxes
+#
+# A box is a dict: center (3,), axes (3,3) — one unit axis per row — and
+# half (3,) half extents along those axes.
+# ---------------------------------------------------------------------------
+
+def _box(center, axes, half):
+    return {"center": np.asarray(center, dtype=np.float64),
+            "axes": np.asarray(axes, dtype=np.float64),
+            "half": np.asarray(half, dtype=np.float64)}
+
+
+def _fit_axes(pts, axes):
+    """Tightest box around pts with the given axes."""
+    local = pts @ axes.T
+    lo, hi = local.min(axis=0), local.max(axis=0)
+    return _box(((lo + hi) * 0.5) @ axes, axes, (hi - lo) * 0.5)
+
+
+def box_volume(box):
+    return float(np.prod(box["half"] * 2.0))
+
+
+def aabb(points):
+    """World-axis box around (N,3) points."""
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return _fit_axes(pts, np.eye(3))
+
+
+def obb_pca(points):
+    """Box along the principal axes of the points."""
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    rel = pts - pts.mean(axis=0)
+    _vals, vecs = np.linalg.eigh(rel.T @ rel)
+    axes = vecs[:, ::-1].T
+    axes[2] = np.cross(axes[0], axes[1])
+    return _fit_axes(pts, axes)
+
+
+def min_area_rect(points):
+    """
+    Minimum-area rectangle around (N,2) points by rotating calipers over the
+    hull edges. Returns (angle of the first side, area).
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    hull = pts[convex_hull_2d(pts)]
+    if len(hull) < 3:
+        if len(hull) == 2:
+            d = hull[1] - hull[0]
+            return float(np.arctan2(d[1], d[0])), 0.0
+        return 0.0, 0.0
+    edges = np.roll(hull, -1, axis=0) - hull
+    angles = np.arctan2(edges[:, 1], edges[:, 0]) % (np.pi / 2)
+    angles = np.unique(np.round(angles, 12))
+    c, s = np.cos(angles), np.sin(angles)
+    # Project the hull on every candidate frame at once
+    u = hull[:, 0][None] * c[:, None] + hull[:, 1][None] * s[:, None]
+    v = -hull[:, 0][None] * s[:, None] + hull[:, 1][None] * c[:, None]
+    area = (u.max(axis=1) - u.min(axis=1)) * (v.max(axis=1) - v.min(axis=1))
+    best = int(np.argmin(area))
+    return float(angles[best]), float(area[best])
+
+
+def obb_upright(points):
+    """
+    Box that keeps world Z vertical and turns only about it — the minimum
+    area footprint rectangle by rotating calipers. Best fit for buildings
+    and props that stand on the ground.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    angle, _area = min_area_rect(pts[:, :2])
+    c, s = np.cos(angle), np.sin(angle)
+    axes = np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+    return _fit_axes(pts, axes)
+
+
+def obb(points):
+    """Smallest of the upright, PCA and axis-aligned boxes."""
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(pts) < 2:
+        return aabb(pts)
+    return min((obb_upright(pts), obb_pca(pts), aabb(pts)), key=box_volume)
+
+
+def cluster_boxes(points, count, iterations=12):
+    """
+    Up to `count` oriented boxes covering the points: k-means on the
+    positions (seeded by farthest-point sampling, so results are repeatable)
+    and an obb() per cluster. Falls back to a single box when splitting
+    doesn't reduce the total volume.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    single = obb(pts)
+    if count < 2 or len(pts) < count * 4:
+        return [single]
+
+    seeds = [int(np.argmin(pts[:, 2]))]
+    dist = np.linalg.norm(pts - pts[seeds[0]], axis=1)
+    for _ in range(count - 1):
+        seeds.append(int(np.argmax(dist)))
+        dist = np.minimum(dist, np.linalg.norm(pts - pts[seeds[-1]], axis=1))
+    centers = pts[seeds]
+
+    label = np.zeros(len(pts), dtype=np.int64)
+    for _ in range(iterations):
+        # |p - c|^2 without the |p|^2 term, which is the same for every centre
+        new = np.argmin(np.sum(centers * centers, axis=1) - 2.0 * (pts @ centers.T), axis=1)
+        if _ and np.array_equal(new, label):
+            break
+        label = new
+        sizes = np.bincount(label, minlength=count)
+        sums = np.column_stack([np.bincount(label, weights=pts[:, i], minlength=count)
+                                for i in range(3)])
+        filled = sizes > 0
+        centers[filled] = sums[filled] / sizes[filled, None]
+
+    order = np.argsort(label, kind="stable")
+    groups = np.split(pts[order], np.cumsum(np.bincount(label, minlength=count))[:-1])
+    boxes = [obb(members) for members in groups if len(members) >= 4]
+    if not boxes or sum(box_volume(b) for b in boxes) >= box_volume(single):
+        return [single]
+    return boxes
+
+
+def box_corners(box):
+    """(8,3) corners, ordered like Blender's bound_box."""
+    signs = np.array([[-1, -1, -1], [-1, -1, 1], [-1, 1, 1], [-1, 1, -1],
+                      [1, -1, -1], [1, -1, 1], [1, 1, 1], [1, 1, -1]], dtype=np.float64)
+    return box["center"] + (signs * box["half"]) @ box["axes"]
+
+
+# ---------------------------------------------------------------------------
+# Cache — fits keyed by a hash of the vertex array
+# ---------------------------------------------------------------------------
+
+_CACHE_SIZE = 32
+_cache = OrderedDict()
+
+_FITS = {
+    "aabb": aabb,
+    "obb": obb,
+    "obb_pca": obb_pca,
+    "obb_upright": obb_upright,
+    "sphere": min_bounding_sphere,
+    "hull_2d": lambda pts: pts[convex_hull_2d(pts[:, :2])],
+    "boxes": cluster_boxes,  # takes count
+}
+
+
+def points_hash(points):
+    """Stable digest of a vertex array (shape and contents)."""
+    pts = np.ascontiguousarray(points, dtype=np.float64)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(pts.shape).encode())
+    h.update(pts.tobytes())
+    return h.hexdigest()
+
+
+def cached_fit(points, kind, key=None, count=None):
+    """
+    fit `kind` (one of _FITS) of points, memoised. key defaults to
+    points_hash(points); pass one in when the caller already has it. count
+    goes to the "boxes" fit and is part of the cache key. Results are
+    shared — don't modify them.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    key = (key or points_hash(pts), kind, count)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    result = _FITS[kind](pts) if count is None else _FITS[kind](pts, count)
+    _cache[key] = result
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def clear_cache():
+    _cache.clear()
@@ -3,8 +3,17 @@ DayZ Geometry Maker - Cabin Generator
 Procedural low-poly cabin shell with gable roof, door and windows.
 """
 
+import csv
+import json
+import math
+import os
+import random
+
 import bpy
 import bmesh
+import numpy as np
+
+from . import integrity, preview
 
 
 def _add_box(bm, min_xyz, max_xyz):
@@ -22,22 +31,43 @@ def _add_box(bm, min_xyz, max_xyz):
         bm.faces.new([v[i] for i in f])
 
 
-def _add_gable_roof(bm, width, length, wall_h, roof_h, overhang):
-    hw = width * 0.5 + overhang
-    hl = length * 0.5 + overhang
-    z0 = wall_h
-    zr = wall_h + roof_h
-    pts = [
-        (-hw, -hl, z0), (0.0, -hl, zr), (hw, -hl, z0),
-        (-hw,  hl, z0), (0.0,  hl, zr), (hw,  hl, z0),
-    ]
-    v = [bm.verts.new(p) for p in pts]
-    for f in ((0,1,2), (3,5,4), (0,3,4,1), (1,4,5,2), (0,2,5,3)):
-        bm.faces.new([v[i] for i in f])
+# ---------------------------------------------------------------------------
+#  Analytical description — one source for the mesh, its LODs and the
+#  Geometry / View Geometry / Roadway / Memory parts
+# ---------------------------------------------------------------------------
 
+# Openings filled in on Resolution LODs, by LOD step (0 = full detail)
+_LOD_CLOSED = ((), ("window",), ("window", "door"))
 
-def build_cabin(params):
-    bm = bmesh.new()
+# Box corners as in _add_box; quads wound outward
+_BOX_QUADS = [(3, 2, 1, 0), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+# Faces of the cabin_layout roof prism, wound outward
+_ROOF_FACES = [(2, 1, 0), (4, 5, 3), (1, 4, 3, 0), (2, 5, 4, 1), (3, 5, 2, 0)]
+
+
+def _box(boxes, min_xyz, max_xyz):
+    """Append (min, max) to boxes unless it is empty (same rule as _add_box)."""
+    if all(b > a for a, b in zip(min_xyz, max_xyz)):
+        boxes.append((tuple(min_xyz), tuple(max_xyz)))
+
+
+def cabin_layout(params):
+    """
+    The cabin as boxes and openings in object space, with every parameter
+    clamped the way the dialog expects. The visual mesh, the Resolution LODs
+    and the helper LODs are all generated from this.
+
+    Returns a dict:
+        height      total height (walls + roof)
+        floor       (min, max) box
+        walls       [{"side", "opening", "solid": (min, max), "pieces": [(min, max), ...]}]
+                    opening is "door", "window" or None; pieces leave the
+                    openings free, solid is the same wall closed
+        roof        [6 points] gable prism
+        door        {"min", "max"} opening box of the front door
+        windows     [(min, max), ...]
+        interior    (min, max) of the walkable floor inside the walls
+    """
     width = max(1.0, float(params.get('width', 4.0)))
     length = max(1.0, float(params.get('length', 5.0)))
     wall_h = max(1.0, float(params.get('wall_height', 2.4)))
@@ -54,80 +84,410 @@ def build_cabin(params):
 
     hx = width * 0.5
     hy = length * 0.5
-
-    # floor / foundation
-    _add_box(bm, (-hx, -hy, -floor_t), (hx, hy, 0.0))
+    walls = []
 
     # back wall solid
-    _add_box(bm, (-hx, hy - wall_t, 0.0), (hx, hy, wall_h))
+    back = [((-hx, hy - wall_t, 0.0), (hx, hy, wall_h))]
+    walls.append({"side": "back", "opening": None, "solid": back[0], "pieces": back})
 
     # front wall with centered door opening
     door_w = min(door_w, width - 2 * wall_t - 0.2)
     dx0 = -door_w * 0.5
     dx1 = door_w * 0.5
-    _add_box(bm, (-hx, -hy, 0.0), (dx0, -hy + wall_t, wall_h))
-    _add_box(bm, (dx1, -hy, 0.0), (hx, -hy + wall_t, wall_h))
-    _add_box(bm, (dx0, -hy, door_h), (dx1, -hy + wall_t, wall_h))
+    front = []
+    _box(front, (-hx, -hy, 0.0), (dx0, -hy + wall_t, wall_h))
+    _box(front, (dx1, -hy, 0.0), (hx, -hy + wall_t, wall_h))
+    _box(front, (dx0, -hy, door_h), (dx1, -hy + wall_t, wall_h))
+    walls.append({"side": "front", "opening": "door",
+                  "solid": ((-hx, -hy, 0.0), (hx, -hy + wall_t, wall_h)), "pieces": front})
+    door = {"min": (dx0, -hy, 0.0), "max": (dx1, -hy + wall_t, door_h)}
 
     # side walls with simple repeated window holes
-    def side_wall(left=True):
-        x0, x1 = (-hx, -hx + wall_t) if left else (hx - wall_t, hx)
-        y_start = -hy + wall_t
-        y_end = hy - wall_t
+    window_boxes = []
+    y_start = -hy + wall_t
+    y_end = hy - wall_t
+    for side, x0, x1 in (("left", -hx, -hx + wall_t), ("right", hx - wall_t, hx)):
+        solid = ((x0, y_start, 0.0), (x1, y_end, wall_h))
+        pieces = []
         if windows <= 0:
-            _add_box(bm, (x0, y_start, 0.0), (x1, y_end, wall_h))
-            return
-        usable = y_end - y_start
-        ww = min(win_w, usable / max(1, windows) * 0.65)
-        wh = min(win_h, max(0.25, wall_h - sill - 0.25))
-        z0 = sill
-        z1 = sill + wh
-        gap = usable / (windows + 1)
-        cursor = y_start
-        for i in range(windows):
-            cy = y_start + gap * (i + 1)
-            wy0 = cy - ww * 0.5
-            wy1 = cy + ww * 0.5
-            _add_box(bm, (x0, cursor, 0.0), (x1, wy0, wall_h))
-            _add_box(bm, (x0, wy0, 0.0), (x1, wy1, z0))
-            _add_box(bm, (x0, wy0, z1), (x1, wy1, wall_h))
-            cursor = wy1
-        _add_box(bm, (x0, cursor, 0.0), (x1, y_end, wall_h))
-
-    side_wall(True)
-    side_wall(False)
-
-    _add_gable_roof(bm, width, length, wall_h, roof_h, over)
+            _box(pieces, *solid)
+        else:
+            usable = y_end - y_start
+            ww = min(win_w, usable / max(1, windows) * 0.65)
+            wh = min(win_h, max(0.25, wall_h - sill - 0.25))
+            z0 = sill
+            z1 = sill + wh
+            gap = usable / (windows + 1)
+            cursor = y_start
+            for i in range(windows):
+                cy = y_start + gap * (i + 1)
+                wy0 = cy - ww * 0.5
+                wy1 = cy + ww * 0.5
+                _box(pieces, (x0, cursor, 0.0), (x1, wy0, wall_h))
+                _box(pieces, (x0, wy0, 0.0), (x1, wy1, z0))
+                _box(pieces, (x0, wy0, z1), (x1, wy1, wall_h))
+                window_boxes.append(((x0, wy0, z0), (x1, wy1, z1)))
+                cursor = wy1
+            _box(pieces, (x0, cursor, 0.0), (x1, y_end, wall_h))
+        walls.append({"side": side, "opening": "window" if windows > 0 else None,
+                      "solid": solid, "pieces": pieces})
+
+    rw = hx + over
+    rl = hy + over
+    zr = wall_h + roof_h
+    roof = [(-rw, -rl, wall_h), (0.0, -rl, zr), (rw, -rl, wall_h),
+            (-rw,  rl, wall_h), (0.0,  rl, zr), (rw,  rl, wall_h)]
+
+    return {
+        "height": zr,
+        "floor": ((-hx, -hy, -floor_t), (hx, hy, 0.0)),
+        "walls": walls,
+        "roof": roof,
+        "door": door,
+        "windows": window_boxes,
+        "interior": ((-hx + wall_t, -hy + wall_t, 0.0), (hx - wall_t, hy - wall_t, 0.0)),
+    }
+
+
+def cabin_wall_boxes(layout, lod=0):
+    """Wall boxes for Resolution LOD step lod — openings are filled in at distance."""
+    closed = _LOD_CLOSED[min(max(lod, 0), len(_LOD_CLOSED) - 1)]
+    boxes = []
+    for wall in layout["walls"]:
+        if wall["opening"] in closed:
+            boxes.append(wall["solid"])
+        else:
+            boxes.extend(wall["pieces"])
+    return boxes
+
+
+def build_cabin(params, lod=0):
+    """
+    Cabin shell as a bmesh: floor, walls and gable roof.
+    lod > 0 builds a Resolution LOD with the windows (and further out the
+    door) filled in. Returns (bm, height).
+    """
+    layout = cabin_layout(params)
+    bm = bmesh.new()
+
+    # floor / foundation
+    _add_box(bm, *layout["floor"])
+    for min_xyz, max_xyz in cabin_wall_boxes(layout, lod):
+        _add_box(bm, min_xyz, max_xyz)
+
+    v = [bm.verts.new(p) for p in layout["roof"]]
+    for f in ((0,1,2), (3,5,4), (0,3,4,1), (1,4,5,2), (0,2,5,3)):
+        bm.faces.new([v[i] for i in f])
 
     bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=1e-5)
     bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
-    return bm, wall_h + roof_h
+    return bm, layout["height"]
+
+
+def _box_part(min_xyz, max_xyz):
+    (x0, y0, z0), (x1, y1, z1) = min_xyz, max_xyz
+    co = np.array([(x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+                   (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)], dtype=np.float64)
+    return co, _BOX_QUADS
+
+
+def part_volume(co, faces):
+    """Volume of a closed, outward-facing part (fan of tetrahedra per face)."""
+    vol = 0.0
+    for face in faces:
+        a = co[face[0]]
+        for i in range(1, len(face) - 1):
+            vol += np.dot(a, np.cross(co[face[i]], co[face[i + 1]]))
+    return vol / 6.0
+
+
+def cabin_convex_parts(layout):
+    """
+    Closed convex parts for Geometry and View Geometry, in object space:
+    [(role, co (k, 3), faces)] — the floor, one box per wall segment (the
+    openings stay free, so the door is walkable and windows see through)
+    and the roof prism.
+    """
+    parts = [("floor",) + _box_part(*layout["floor"])]
+    for wall in layout["walls"]:
+        parts.extend((wall["side"],) + _box_part(*piece) for piece in wall["pieces"])
+    parts.append(("roof", np.array(layout["roof"], dtype=np.float64), _ROOF_FACES))
+    return parts
+
+
+def cabin_roadway(layout, lift=0.01):
+    """
+    Roadway surface in object space as (co, faces): the floor inside the
+    walls plus the door threshold, lifted clear of the Geometry floor.
+    """
+    lo, hi = layout["interior"]
+    ix0, iy0, ix1, iy1 = lo[0], lo[1], hi[0], hi[1]
+    dx0, dy0 = layout["door"]["min"][:2]
+    dx1 = layout["door"]["max"][0]
+    co = np.array([(ix0, iy0, lift), (ix1, iy0, lift), (ix1, iy1, lift), (ix0, iy1, lift),
+                   (dx0, dy0, lift), (dx1, dy0, lift), (dx1, iy0, lift), (dx0, iy0, lift)])
+    return co, [(0, 1, 2, 3), (4, 5, 6, 7)]
+
+
+def cabin_door_axis(layout):
+    """(top, bottom) hinge axis of the front door — its left jamb, mid-wall."""
+    dx0, y0, z0 = layout["door"]["min"]
+    y1, z1 = layout["door"]["max"][1:]
+    ym = (y0 + y1) * 0.5
+    return (dx0, ym, z1), (dx0, ym, z0)
+
+
+def build_cabin_arrays(params, lod=0):
+    """
+    build_cabin as plain arrays, for the preview cache and Resolution LODs:
+    ({"co": (N, 3), "loops": (L,), "starts": (F,)}, height).
+    """
+    bm, height = build_cabin(params, lod)
+    bm.verts.index_update()
+    co = np.array([v.co[:] for v in bm.verts], dtype=np.float64).reshape(-1, 3)
+    sizes = np.array([len(f.verts) for f in bm.faces], dtype=np.int64)
+    loops = np.array([v.index for f in bm.faces for v in f.verts], dtype=np.int64)
+    bm.free()
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]) if len(sizes) else sizes
+    return {"co": co, "loops": loops, "starts": starts}, height
+
+
+def write_cabin_mesh(mesh, result):
+    """Replace mesh's geometry with a build_cabin_arrays result."""
+    data = result[0]
+    mesh.clear_geometry()
+    mesh.vertices.add(len(data["co"]))
+    mesh.vertices.foreach_set("co", data["co"].ravel())
+    mesh.loops.add(len(data["loops"]))
+    mesh.loops.foreach_set("vertex_index", data["loops"])
+    mesh.polygons.add(len(data["starts"]))
+    mesh.polygons.foreach_set("loop_start", data["starts"])
+    mesh.update(calc_edges=True)
+
+
+def mesh_tris(data):
+    """Triangle count of build_cabin_arrays data."""
+    sizes = np.diff(np.append(data["starts"], len(data["loops"])))
+    return int((sizes - 2).sum())
+
+
+def apply_cabin(obj, params):
+    """Write a cabin into obj's mesh through the preview build cache."""
+    _data, height = preview.apply(obj, "cabin", build_cabin_arrays, write_cabin_mesh, params)
+    obj['dgm_cabin_height'] = round(height, 4)
+    return height
+
+
+def schedule_cabin_preview(obj, params):
+    """Debounced apply_cabin — rapid dialog edits only build the last value."""
+    name = obj.name
+
+    def rebuild():
+        target = bpy.data.objects.get(name)
+        if target is not None:
+            apply_cabin(target, params)
+
+    preview.schedule(("cabin", name), rebuild)
 
 
 def _count_scene_cabins():
-    return sum(1 for o in bpy.data.objects if o.type == 'MESH' and o.get('dgm_cabin') is True and o.users_scene)
+    """Count DZ_Cabin objects in the scene, excluding Resolution LOD copies."""
+    return sum(1 for o in bpy.data.objects
+               if o.type == 'MESH' and o.get('dgm_cabin') is True and o.users_scene
+               and '.LOD' not in o.name)
 
 
 def _is_active_cabin(obj):
-    return obj is not None and obj.type == 'MESH' and obj.get('dgm_cabin') is True
-
-
-def _params_from_obj(obj):
-    return dict(
-        width=obj.get('dgm_p_width', 4.0),
-        length=obj.get('dgm_p_length', 5.0),
-        wall_height=obj.get('dgm_p_wall_height', 2.4),
-        wall_thickness=obj.get('dgm_p_wall_thickness', 0.12),
-        roof_height=obj.get('dgm_p_roof_height', 0.9),
-        roof_overhang=obj.get('dgm_p_roof_overhang', 0.25),
-        floor_thickness=obj.get('dgm_p_floor_thickness', 0.12),
-        door_width=obj.get('dgm_p_door_width', 0.9),
-        door_height=obj.get('dgm_p_door_height', 2.0),
-        window_count=obj.get('dgm_p_window_count', 2),
-        window_width=obj.get('dgm_p_window_width', 0.75),
-        window_height=obj.get('dgm_p_window_height', 0.75),
-        window_sill=obj.get('dgm_p_window_sill', 0.95),
-    )
+    return (obj is not None and obj.type == 'MESH' and obj.get('dgm_cabin') is True
+            and '.LOD' not in obj.name)
+
+
+def is_confirmed_cabin(obj):
+    """True for a tracked cabin whose build params are stored (OK pressed at least once)."""
+    return _is_active_cabin(obj) and (obj.get('dgm_cabin_confirmed', False)
+                                      or obj.get('dgm_p_width') is not None)
+
+
+# Cabin build parameters and their defaults (same as the dialog)
+CABIN_DEFAULTS = dict(
+    width=4.0,
+    length=5.0,
+    wall_height=2.4,
+    wall_thickness=0.12,
+    roof_height=0.9,
+    roof_overhang=0.25,
+    floor_thickness=0.12,
+    door_width=0.9,
+    door_height=2.0,
+    window_count=2,
+    window_width=0.75,
+    window_height=0.75,
+    window_sill=0.95,
+)
+
+
+def stored_cabin_params(obj):
+    """Build params from the dgm_p_* values stored on a cabin."""
+    return {k: obj.get('dgm_p_' + k, v) for k, v in CABIN_DEFAULTS.items()}
+
+
+def _tag_cabin(obj, params, height):
+    """Mark obj as a confirmed generated cabin built from params."""
+    obj['dgm_cabin'] = True
+    obj['dgm_cabin_type'] = 1
+    for k, v in params.items():
+        obj['dgm_p_' + k] = v
+    obj['dgm_cabin_confirmed'] = True
+    obj['dgm_cabin_height'] = round(height, 4)
+
+
+# ---------------------------------------------------------------------------
+#  Batch mode — many cabins from a CSV / JSON table
+# ---------------------------------------------------------------------------
+
+# Table columns besides the CABIN_DEFAULTS parameters, and their types
+BATCH_COLUMNS = dict(
+    name=str,        # object name (default DZ_Cabin_N); count > 1 appends _01, _02, ...
+    count=int,       # variants generated from the row (default 1)
+    seed=int,        # random seed of the first variant; variant i uses seed + i (default: row N * 1000)
+    jitter=float,    # float parameters vary by up to +/- this fraction (default 0)
+    x=float,         # placement; rows without x / y are laid out on a grid
+    y=float,
+    rotation=float,  # Z rotation in degrees
+    mass=float,      # Geometry mass for the P3D export (default 1000)
+    p3d=str,         # P3D file name for the export (default <name>.p3d)
+)
+
+
+def _table_value(key, value):
+    """Typed value of one table cell; None for empty cells."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    typ = type(CABIN_DEFAULTS[key]) if key in CABIN_DEFAULTS else BATCH_COLUMNS[key]
+    if typ is int:
+        return int(round(float(value)))
+    return typ(value.strip() if isinstance(value, str) else value)
+
+
+def load_cabin_table(filepath):
+    """
+    Rows of a cabin batch table as dicts of typed values.
+    CSV: a header row of column names, then one row per cabin.
+    JSON: a list of row objects, or {"defaults": {...}, "cabins": [...]} where
+    defaults fill the columns a row leaves out.
+    Columns are the cabin parameters (CABIN_DEFAULTS) and BATCH_COLUMNS;
+    anything else raises ValueError.
+    """
+    # utf-8-sig: spreadsheet exports often start with a byte order mark
+    if filepath.lower().endswith(".json"):
+        with open(filepath, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        defaults = {}
+        if isinstance(data, dict):
+            defaults = data.get("defaults", {})
+            data = data.get("cabins", [])
+        if not isinstance(defaults, dict):
+            raise ValueError("\"defaults\" must be an object of column values")
+        if not isinstance(data, list):
+            raise ValueError("expected a list of cabin rows")
+        raw = []
+        for line, row in enumerate(data, 1):
+            if not isinstance(row, dict):
+                raise ValueError("Row {}: expected an object of column values, got {!r}".format(line, row))
+            raw.append(dict(defaults, **row))
+    else:
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+            raw = list(csv.DictReader(f))
+
+    rows = []
+    for line, row in enumerate(raw, 1):
+        if None in row:
+            raise ValueError("Row {}: row has more cells than the header".format(line))
+        unknown = [k for k in row if k not in CABIN_DEFAULTS and k not in BATCH_COLUMNS]
+        if unknown:
+            raise ValueError("Row {}: unknown column(s) {}".format(line, ", ".join(unknown)))
+        typed = {}
+        for k, v in row.items():
+            try:
+                v = _table_value(k, v)
+            except (TypeError, ValueError):
+                raise ValueError("Row {}: bad value for {}: {!r}".format(line, k, v))
+            if v is not None:
+                typed[k] = v
+        rows.append(typed)
+    return rows
+
+
+def expand_cabin_rows(rows, first_index=1):
+    """
+    One entry per cabin: [(name, params, extra)]. params are full build
+    params; extra holds the placement and export columns of the row.
+    Float parameters are jittered with random.Random(seed + variant) and
+    rounded to the millimetre, so rows without jitter (or repeating a seed)
+    give identical parameter sets — build_cabin_batch shares their mesh.
+    Rows without a seed start at row number * 1000, so unseeded rows don't
+    all produce the same variants.
+    """
+    entries = []
+    for line, row in enumerate(rows, 1):
+        count = max(1, row.get('count', 1))
+        jitter = max(0.0, row.get('jitter', 0.0))
+        seed = row.get('seed', line * 1000)
+        base = {k: row.get(k, v) for k, v in CABIN_DEFAULTS.items()}
+        extra = {k: row[k] for k in ('x', 'y', 'rotation', 'mass', 'p3d') if k in row}
+        for i in range(count):
+            rng = random.Random(seed + i)
+            params = {}
+            for k, v in base.items():
+                if isinstance(v, float):
+                    if jitter > 0.0:
+                        v *= 1.0 + rng.uniform(-jitter, jitter)
+                    v = round(v, 3)
+                params[k] = v
+            if 'name' in row:
+                name = row['name'] if count == 1 else "{}_{:02d}".format(row['name'], i + 1)
+            else:
+                name = "DZ_Cabin_{}".format(first_index + len(entries))
+            variant = dict(extra)
+            if 'p3d' in variant and count > 1:
+                stem, ext = os.path.splitext(variant['p3d'])
+                variant['p3d'] = "{}_{:02d}{}".format(stem, i + 1, ext)
+            entries.append((name, params, variant))
+    return entries
+
+
+def build_cabin_batch(context, entries, spacing=2.0):
+    """
+    Create one cabin object per expanded entry in a single pass. Each
+    distinct parameter set is built once and its mesh is shared by every
+    cabin using it. Entries without x / y are laid out on a grid, `spacing`
+    metres apart. Returns [(obj, extra)].
+    """
+    meshes = {}
+    cols = max(1, int(math.ceil(math.sqrt(len(entries)))))
+    cell = max((max(p['width'], p['length']) + 2 * p['roof_overhang'] for _n, p, _e in entries),
+               default=0.0) + spacing
+
+    created = []
+    for i, (name, params, extra) in enumerate(entries):
+        key = preview.params_key(params)
+        if key not in meshes:
+            result = build_cabin_arrays(params)
+            mesh = bpy.data.meshes.new("DZ_Cabin_Mesh")
+            write_cabin_mesh(mesh, result)
+            meshes[key] = (mesh, result[1], integrity.mesh_signature(mesh))
+        mesh, height, signature = meshes[key]
+
+        obj = bpy.data.objects.new(name, mesh)
+        context.collection.objects.link(obj)
+        obj.location = (extra.get('x', (i % cols) * cell), extra.get('y', (i // cols) * cell), 0.0)
+        obj.rotation_euler = (0.0, 0.0, math.radians(extra.get('rotation', 0.0)))
+        _tag_cabin(obj, params, height)
+        integrity.store(obj, params, signature)
+        created.append((obj, extra))
+
+    print("[DGM] Cabin batch: {} cabins, {} distinct meshes".format(len(created), len(meshes)))
+    return created
 
 
 class DGM_OT_add_cabin(bpy.types.Operator):
@@ -181,15 +541,15 @@ class DGM_OT_add_cabin(bpy.types.Operator):
         self._created_obj_name = name
         return obj
 
-    def _rebuild(self, context):
+    def _rebuild(self, context, debounce=False):
         obj = context.active_object
         if not _is_active_cabin(obj):
             return
-        bm, h = build_cabin(self._get_params())
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
-        obj['dgm_cabin_height'] = round(h, 4)
+        if debounce:
+            schedule_cabin_preview(obj, self._get_params())
+        else:
+            preview.cancel(("cabin", obj.name))
+            apply_cabin(obj, self._get_params())
 
     def _commit(self, context):
         obj = context.active_object
@@ -199,6 +559,7 @@ class DGM_OT_add_cabin(bpy.types.Operator):
         for k, v in p.items():
             obj['dgm_p_' + k] = v
         obj['dgm_cabin_confirmed'] = True
+        integrity.store(obj, stored_cabin_params(obj))
 
     def invoke(self, context, event):
         self._create_object(context)
@@ -206,6 +567,7 @@ class DGM_OT_add_cabin(bpy.types.Operator):
         return context.window_manager.invoke_props_dialog(self, width=420)
 
     def cancel(self, context):
+        preview.cancel(("cabin", self._created_obj_name))
         obj = bpy.data.objects.get(self._created_obj_name)
         if obj:
             mesh = obj.data
@@ -215,7 +577,7 @@ class DGM_OT_add_cabin(bpy.types.Operator):
         self._created_obj_name = ""
 
     def check(self, context):
-        self._rebuild(context)
+        self._rebuild(context, debounce=True)
         return True
 
     def draw(self, context):
@@ -266,49 +628,61 @@ class DGM_OT_edit_cabin(bpy.types.Operator):
             window_height=self.window_height, window_sill=self.window_sill,
         )
 
-    def _rebuild(self, context):
+    def _rebuild(self, context, debounce=False):
         obj = context.active_object
         if not _is_active_cabin(obj):
             return
-        bm, h = build_cabin(self._get_params())
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
-        obj['dgm_cabin_height'] = round(h, 4)
+        if debounce:
+            schedule_cabin_preview(obj, self._get_params())
+        else:
+            preview.cancel(("cabin", obj.name))
+            apply_cabin(obj, self._get_params())
 
     def invoke(self, context, event):
         obj = context.active_object
-        p = _params_from_obj(obj)
+        p = stored_cabin_params(obj)
         for k, v in p.items():
             setattr(self, k, v)
+        # Batch cabins share one mesh per parameter set — edit a copy
+        if obj.data.users > 1:
+            obj.data = obj.data.copy()
         snap = bmesh.new()
         snap.from_mesh(obj.data)
         self._snapshot_mesh = snap
+        # The mesh may have been edited by hand since the last preview
+        preview.forget(obj)
         return context.window_manager.invoke_props_dialog(self, width=420)
 
     def cancel(self, context):
         obj = context.active_object
+        if obj is not None:
+            preview.cancel(("cabin", obj.name))
         if obj is not None and self._snapshot_mesh is not None:
             self._snapshot_mesh.to_mesh(obj.data)
             obj.data.update()
             self._snapshot_mesh.free()
             self._snapshot_mesh = None
+        preview.forget(obj)
 
     def check(self, context):
-        self._rebuild(context)
+        self._rebuild(context, debounce=True)
         return True
 
     def draw(self, context):
         _draw_props(self.layout, self)
 
     def execute(self, context):
+        from . import geometry
         self._rebuild(context)
         obj = context.active_object
         for k, v in self._get_params().items():
             obj['dgm_p_' + k] = v
+        integrity.store(obj, stored_cabin_params(obj))
         if self._snapshot_mesh:
             self._snapshot_mesh.free()
             self._snapshot_mesh = None
+        # Keep Geometry / View Geometry / Roadway / door axes in step with the shell
+        geometry.refresh_cabin_asset(obj)
         return {'FINISHED'}
 
 
@@ -324,21 +698,150 @@ class DGM_OT_restore_cabin(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.active_object
-        p = _params_from_obj(obj)
+        p = stored_cabin_params(obj)
         saved_loc = obj.location.copy()
         saved_rot = obj.rotation_euler.copy()
         obj.scale = (1.0, 1.0, 1.0)
+        if obj.data.users > 1:
+            obj.data = obj.data.copy()
         bm, h = build_cabin(p)
         bm.to_mesh(obj.data)
         bm.free()
         obj.data.update()
+        preview.forget(obj)
         obj.location = saved_loc
         obj.rotation_euler = saved_rot
         obj['dgm_cabin_height'] = round(h, 4)
+        integrity.store(obj, p)
         self.report({'INFO'}, "Cabin restored")
         return {'FINISHED'}
 
 
+class DGM_OT_cabin_asset(bpy.types.Operator):
+    bl_idname = "dgm.cabin_asset"
+    bl_label = "Generate Cabin LODs"
+    bl_description = (
+        "Build the cabin's Resolution LODs, Geometry, View Geometry, Roadway and "
+        "door axis memory points from its parameters. Replaces parts generated earlier"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mass: bpy.props.FloatProperty(
+        name="Mass",
+        description="Geometry mass in kg, split over the wall, floor and roof components by volume",
+        default=1000.0, min=10.0, max=1000000.0,
+    )
+    lods: bpy.props.BoolProperty(name="Resolution LODs", default=True,
+                                 description="Uses the enabled LODs in the Resolution LODs section")
+    geometry: bpy.props.BoolProperty(name="Geometry", default=True)
+    view_geometry: bpy.props.BoolProperty(name="View Geometry", default=True)
+    roadway: bpy.props.BoolProperty(name="Roadway", default=True)
+    door_axes: bpy.props.BoolProperty(name="Door Axis Points", default=True)
+
+    @classmethod
+    def poll(cls, context):
+        return is_confirmed_cabin(context.active_object)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=320)
+
+    def draw(self, context):
+        col = self.layout.column(align=True)
+        col.prop(self, "lods")
+        col.prop(self, "geometry")
+        sub = col.row()
+        sub.enabled = self.geometry
+        sub.prop(self, "mass")
+        col.prop(self, "view_geometry")
+        col.prop(self, "roadway")
+        col.prop(self, "door_axes")
+
+    def execute(self, context):
+        from . import geometry
+        obj = context.active_object
+        result = geometry.create_cabin_asset(
+            obj, mass=self.mass, lods=self.lods, geometry=self.geometry,
+            view=self.view_geometry, roadway=self.roadway, door=self.door_axes)
+        if self.door_axes and result["door"] is None:
+            self.report({'WARNING'}, "No free door number (1-8) for the door axis points")
+        else:
+            self.report({'INFO'}, "{}: {} LODs, {} Geometry components".format(
+                obj.name, len(result["lods"]), len(result["geometry"])))
+        return {'FINISHED'}
+
+
+class DGM_OT_cabin_batch(bpy.types.Operator):
+    bl_idname = "dgm.cabin_batch"
+    bl_label = "Cabins from Table"
+    bl_description = (
+        "Create many cabins from a CSV or JSON table of parameters, one row per "
+        "cabin (seed / jitter / count columns make random variants), and "
+        "optionally export each cabin as its own P3D"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+    spacing: bpy.props.FloatProperty(
+        name="Grid Spacing", default=2.0, min=0.0, max=100.0, unit='LENGTH',
+        description="Gap between cabins placed on the grid (rows without x / y)",
+    )
+    export_p3d: bpy.props.BoolProperty(
+        name="Export P3D per Cabin", default=False,
+        description="Write every cabin with its LODs, Geometry, View Geometry, Roadway "
+                    "and door memory points to its own P3D",
+    )
+    output_dir: bpy.props.StringProperty(
+        name="P3D Folder", subtype='DIR_PATH',
+        description="Folder for the exported P3D files. Empty = next to the table",
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.abspath(self.filepath)
+        try:
+            rows = load_cabin_table(path)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, "Cabin table: {}".format(e))
+            return {'CANCELLED'}
+        if not rows:
+            self.report({'ERROR'}, "No cabins in the table")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            try:
+                bpy.ops.object.mode_set(mode='OBJECT')
+            except Exception:
+                pass
+        # One scene scan for the whole table; rows are numbered on from it
+        first_index = _count_scene_cabins() + 1
+        entries = expand_cabin_rows(rows, first_index)
+        created = build_cabin_batch(context, entries, self.spacing)
+
+        if not self.export_p3d:
+            self.report({'INFO'}, "{} cabins created".format(len(created)))
+            return {'FINISHED'}
+
+        from . import exporter
+        out_dir = bpy.path.abspath(self.output_dir) if self.output_dir else os.path.dirname(path)
+        os.makedirs(out_dir, exist_ok=True)
+        exported = 0
+        for obj, extra in created:
+            name = extra.get('p3d') or obj.name
+            if not name.lower().endswith(".p3d"):
+                name += ".p3d"
+            result = exporter.export_cabin_p3d(self, obj, os.path.join(out_dir, name),
+                                               mass=extra.get('mass', 1000.0))
+            if 'FINISHED' in result:
+                exported += 1
+        self.report({'INFO'}, "{} cabins created, {} P3D files written to {}".format(
+            len(created), exported, out_dir))
+        return {'FINISHED'}
+
+
 def _draw_props(layout, op):
     box = layout.box()
     box.label(text="Simple Cabin", icon='HOME')
@@ -380,18 +883,31 @@ def draw_cabin_generator_section(layout, context):
     add_row.scale_y = 1.3
     add_row.operator_context = 'INVOKE_DEFAULT'
     add_row.operator("dgm.add_cabin", text="Add Cabin", icon='ADD')
+    box.operator("dgm.cabin_batch", text="Cabins from Table", icon='FILE_TEXT')
 
     if is_cabin:
         box.separator(factor=0.5)
         box.label(text="{} | {} m".format(obj.name, obj.get('dgm_cabin_height', '?')), icon='CHECKMARK')
         box.operator("dgm.edit_cabin", text="Edit Selected Cabin", icon='PREFERENCES')
         box.operator("dgm.restore_cabin", text="Restore Cabin", icon='FILE_REFRESH')
+        result = integrity.check(obj, stored_cabin_params(obj))
+        if result is not None and not result["ok"]:
+            warn = box.box()
+            warn.alert = True
+            wcol = warn.column(align=True)
+            wcol.label(text="Cabin geometry was modified!", icon='ERROR')
+            for issue in result["issues"]:
+                wcol.label(text=issue, icon='DOT')
+            wcol.label(text="Restore Cabin rebuilds it from its parameters", icon='INFO')
+        box.operator("dgm.cabin_asset", text="Generate Cabin LODs", icon='MOD_BUILD')
 
 
 cabin_classes = (
     DGM_OT_add_cabin,
     DGM_OT_edit_cabin,
     DGM_OT_restore_cabin,
+    DGM_OT_cabin_asset,
+    DGM_OT_cabin_batch,
 )
 
 
@@ -13,6 +13,7 @@ import os
 from .properties import GEOMETRY_LODS, needs_resolution, lod_name
 from .modelcfg import write_model_cfg
 from . import baker_bridge
+from .geometry import MAX_DOORS, renumber_components as _renumber_components
 
 
 # ---------------------------------------------------------------------------
@@ -161,20 +162,6 @@ def _fixup_resolution(lod, offset):
     return float(exp)
 
 
-def _renumber_components(obj):
-    tmp = "__DGM_TMP__"
-    idx = 1
-    for grp in obj.vertex_groups:
-        if grp.name.startswith("Component"):
-            grp.name = tmp + str(idx)
-            idx += 1
-    idx = 1
-    for grp in obj.vertex_groups:
-        if grp.name.startswith(tmp):
-            grp.name = "Component{:02d}".format(idx)
-            idx += 1
-
-
 def _optimize_export_lod(obj):
     obj.select_set(True)
     bpy.ops.object.mode_set(mode='EDIT')
@@ -533,7 +520,7 @@ def _merge_door_axes_on_duplicate(scene, dup):
     individual axis_1/axis_2 groups from the duplicate only.
     The original scene objects are never touched.
     """
-    for di in range(1, 9):
+    for di in range(1, MAX_DOORS + 1):
         door_vg = getattr(scene, 'dgm_door_{}_vgroup'.format(di), "").strip()
         if not door_vg:
             continue
@@ -567,11 +554,28 @@ def export_objects_as_p3d(operator, filepath, objects,
                           write_model_cfg_file=True):
     """Export a list of DayZ/Arma mesh objects to a P3D MLOD file."""
 
+    from . import template_library
+    objects = [o for o in objects if not template_library.is_template_source(o)]
+    instances = [o for o in objects if template_library.is_template_instance(o)]
     objects = [o for o in objects if o.type == 'MESH' and o.dgm_props.is_dayz_object]
-    if not objects:
+    if not objects and not instances:
         operator.report({'ERROR'}, "No DayZ objects found to export")
         return {'CANCELLED'}
 
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    tmp_col = bpy.data.collections.get("__dgm_tmp__")
+    if tmp_col is None:
+        tmp_col = bpy.data.collections.new("__dgm_tmp__")
+    if tmp_col.name not in [c.name for c in bpy.context.scene.collection.children]:
+        bpy.context.scene.collection.children.link(tmp_col)
+
+    # Template instances are expanded into temporary parts (sharing the
+    # library meshes) that join the matching LODs below.
+    # They are kept until model.cfg has been written.
+    expanded = template_library.expand_for_export(instances, tmp_col)
+    objects += expanded
+
     # Use the target object as the authoritative source of material/selection settings.
     # All LODs inherit material assignments from it so stale selection_mats on
     # duplicated/auto-synced LOD objects never bleed wrong texture paths into the P3D.
@@ -590,14 +594,6 @@ def export_objects_as_p3d(operator, filepath, objects,
     # The canonical object for each group is the first one (carries named props / mass)
     objects = [group[0] for group in lod_groups.values()]
 
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    tmp_col = bpy.data.collections.get("__dgm_tmp__")
-    if tmp_col is None:
-        tmp_col = bpy.data.collections.new("__dgm_tmp__")
-    if tmp_col.name not in [c.name for c in bpy.context.scene.collection.children]:
-        bpy.context.scene.collection.children.link(tmp_col)
-
     wm = bpy.context.window_manager
     wm.progress_begin(0, len(objects) * 5)
 
@@ -640,9 +636,10 @@ def export_objects_as_p3d(operator, filepath, objects,
 
     except Exception as e:
         operator.report({'ERROR'}, "Export failed: " + str(e))
+        template_library.remove_expanded(expanded)
         return {'CANCELLED'}
     finally:
-        obs = [o for o in tmp_col.objects if o.users == 1]
+        obs = [o for o in tmp_col.objects if o.users == 1 and o not in expanded]
         for o in obs:
             bpy.data.objects.remove(o)
         bpy.data.collections.remove(tmp_col)
@@ -654,10 +651,37 @@ def export_objects_as_p3d(operator, filepath, objects,
             operator.report({'INFO'}, "model.cfg written: " + cfg_path)
         except Exception as e:
             operator.report({'WARNING'}, "model.cfg write failed: " + str(e))
+    template_library.remove_expanded(expanded)
 
     return {'FINISHED'}
 
 
+def export_cabin_p3d(operator, cabin_obj, filepath, mass=1000.0):
+    """
+    Export one generated cabin as its own P3D. Its LODs are generated with
+    the cabin moved to the origin (see geometry.cabin_export_objects),
+    exported, and removed again; the cabin keeps its place in the scene.
+    Parts generated for the cabin earlier are replaced by the export set and
+    removed with it. No model.cfg is written.
+    """
+    from . import geometry
+    import mathutils
+
+    scene = bpy.context.scene
+    saved_matrix = cabin_obj.matrix_world.copy()
+    saved_target = scene.dgm_target_object
+    try:
+        cabin_obj.matrix_world = mathutils.Matrix.Identity(4)
+        scene.dgm_target_object = cabin_obj
+        objects = geometry.cabin_export_objects(cabin_obj, mass)
+        return export_objects_as_p3d(operator, filepath, objects,
+                                     write_model_cfg_file=False)
+    finally:
+        geometry.remove_cabin_asset(cabin_obj)
+        cabin_obj.matrix_world = saved_matrix
+        scene.dgm_target_object = saved_target
+
+
 # ---------------------------------------------------------------------------
 # Script / config.cpp template export
 # ---------------------------------------------------------------------------
@@ -3,9 +3,21 @@ DayZ Geometry Maker - Geometry creation functions.
 Implements DayZ/Arma LOD spec from community.bistudio.com/wiki/LOD
 """
 
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
 import bpy
 import bmesh
 import mathutils
+import numpy as np
+
+from . import assets, bounds, cabin_generator, ladder_generator, mesh_simplify
+from .properties import LOD_PRESETS, mark_material_shared, material_settings
 
 LOD_VALUES = {
     "Geometry":        "1.000e+13",
@@ -129,19 +141,79 @@ def assign_default_material(obj, tex="dz\\data\\data\\duha.paa",
     obj.data.materials.append(mat)
 
 
+def _lod_materials(obj, prefix):
+    """
+    Materials for a generated LOD copy. With Shared LOD Materials on, the LOD
+    keeps using the source materials and only gets its own "<prefix>_" copy
+    when its DayZ settings are edited (copy on write, see properties).
+    Otherwise every slot gets its own prefixed copy straight away.
+    """
+    if bpy.context.scene.dgm_share_lod_materials:
+        obj["dgm_shared_materials"] = prefix
+        for slot in obj.material_slots:
+            if slot.material:
+                mark_material_shared(slot.material)
+        return
+
+    if "dgm_shared_materials" in obj:
+        del obj["dgm_shared_materials"]
+    for slot in obj.material_slots:
+        if slot.material:
+            new_mat = slot.material.copy()
+            new_mat.name = "{}_{}".format(prefix, slot.material.name)
+            slot.material = new_mat
+
+
+def merge_duplicate_materials():
+    """
+    Merge materials whose DayZ settings (dgm_mat) are identical into one,
+    remapping every user. The shortest name of each group is kept, so
+    "Wood" wins over "LOD3_Wood". Materials with no texture, rvmat or
+    procedural string set are left alone.
+    Returns the number of materials removed.
+    """
+    groups = {}
+    for mat in bpy.data.materials:
+        if mat.library is not None:
+            continue
+        mp = mat.dgm_mat
+        if not (mp.texture or mp.rv_mat or mp.color_string or mp.tex_type != 'Texture'):
+            continue
+        groups.setdefault(material_settings(mp), []).append(mat)
+
+    removed = 0
+    for mats in groups.values():
+        if len(mats) < 2:
+            continue
+        mats.sort(key=lambda m: (len(m.name), m.name))
+        keep = mats[0]
+        for dup in mats[1:]:
+            dup.user_remap(keep)
+            bpy.data.materials.remove(dup)
+            removed += 1
+    return removed
+
+
 def renumber_components(obj):
-    """Renumber all ComponentXX vertex groups to be contiguous from 01."""
-    tmp = "__DGM_TMP__"
-    idx = 1
-    for grp in obj.vertex_groups:
-        if grp.name.startswith("Component"):
-            grp.name = tmp + str(idx)
-            idx += 1
-    idx = 1
-    for grp in obj.vertex_groups:
-        if grp.name.startswith(tmp):
-            grp.name = "Component{:02d}".format(idx)
-            idx += 1
+    """
+    Renumber all ComponentXX vertex groups to be contiguous from 01, in group
+    order. The final names are worked out first and only groups whose name
+    changes are renamed: groups sitting on a name another group needs are
+    parked on a temporary name, then everything is renamed straight to its
+    target, so no rename ever collides.
+    """
+    comps = [grp for grp in obj.vertex_groups if grp.name.startswith("Component")]
+    targets = ["Component{:02d}".format(i) for i in range(1, len(comps) + 1)]
+    moves = [(grp, grp.name, name) for grp, name in zip(comps, targets) if grp.name != name]
+    if not moves:
+        return
+
+    wanted = {name for _grp, _old, name in moves}
+    for i, (grp, old, _name) in enumerate(moves):
+        if old in wanted:
+            grp.name = "__DGM_TMP__{}".format(i)
+    for grp, _old, name in moves:
+        grp.name = name
 
 
 def warn_fire_geo_points(obj, operator=None):
@@ -158,24 +230,88 @@ def warn_fire_geo_points(obj, operator=None):
 # Geometry LOD
 # ---------------------------------------------------------------------------
 
-def _next_geometry_component_index():
-    """Return the next available ComponentXX index by scanning the Geometry collection."""
-    used = set()
+# ComponentXX registry for the Geometry LOD. The used indices are scanned from
+# the Geometry collection once and then kept up to date by allocate / free, so
+# bulk component creation doesn't rescan every vertex group per component.
+# Freed indices and gaps go into a min-heap and are reused lowest first. A
+# depsgraph handler drops the registry when a Geometry object changes outside
+# our own code (manual group rename / delete), the key catches added or
+# removed objects.
+#
+# Renumbering never has to be applied to the registry: the Geometry LOD keeps
+# its numbers while editing (gaps are refilled by the heap, and the ladder
+# collision maps refer to them by name), and contiguous numbering happens on
+# the joined export copy through renumber_components.
+_component_registry = {"key": None, "used": set(), "free": [], "top": 1}
+_component_generation = 0
+
+
+def invalidate_component_registry():
+    global _component_generation
+    _component_generation += 1
+
+
+def _component_registry_state():
+    """The registry, rescanned from the Geometry collection if it is stale."""
     col = bpy.data.collections.get("Geometry")
+    key = (col.as_pointer() if col else 0, len(col.all_objects) if col else 0,
+           _component_generation)
+    reg = _component_registry
+    if reg["key"] == key:
+        return reg
+
+    used = set()
     if col:
-        for o in col.objects:
+        for o in col.all_objects:
             for vg in o.vertex_groups:
                 if vg.name.startswith("Component"):
                     try:
                         used.add(int(vg.name[9:]))
                     except ValueError:
                         pass
-    idx = 1
-    while idx in used:
-        idx += 1
-    return idx
+    top = max(used, default=0) + 1
+    reg["key"] = key
+    reg["used"] = used
+    reg["free"] = [i for i in range(1, top) if i not in used]
+    reg["top"] = top
+    return reg
+
+
+def allocate_components(count=1):
+    """
+    Reserve `count` ComponentXX indices in one go, lowest free first.
+    The caller is expected to create the matching vertex groups.
+    """
+    reg = _component_registry_state()
+    out = []
+    for _ in range(count):
+        if reg["free"]:
+            idx = heapq.heappop(reg["free"])
+        else:
+            idx = reg["top"]
+            reg["top"] += 1
+        reg["used"].add(idx)
+        out.append(idx)
+    return out
+
+
+def free_components(names_or_indices):
+    """Give ComponentXX indices (ints or "ComponentXX" names) back to the registry."""
+    reg = _component_registry_state()
+    for item in names_or_indices:
+        if isinstance(item, str):
+            try:
+                item = int(item[9:])
+            except ValueError:
+                continue
+        if item in reg["used"]:
+            reg["used"].discard(item)
+            heapq.heappush(reg["free"], item)
 
 
+def _next_geometry_component_index():
+    """Allocate the next free ComponentXX index from the component registry."""
+    return allocate_components(1)[0]
 
 
 def create_geometry_from_selection(operator, mass=100.0):
@@ -250,79 +386,137 @@ def create_geometry_from_selection(operator, mass=100.0):
     return obj
 
 
-def create_geometry(mass=100.0):
+# Box fits offered by create_geometry / create_view_geometry
+BOX_FITS = [
+    ('AABB',  "World Box",      "One box aligned to the world axes (bounding box)"),
+    ('OBB',   "Oriented Box",   "One box turned to fit the mesh tightly"),
+    ('MULTI', "Oriented Boxes", "Several oriented boxes from a clustering pass — for L-shaped or spread-out assets"),
+]
+
+# Boxes thinner than this are padded so collision stays closed
+_MIN_BOX_HALF = 0.005
+
+# Quads of a box in bounds.box_corners order, outward facing
+_BOX_FACES = [(0, 1, 2, 3), (4, 7, 6, 5), (0, 4, 5, 1), (3, 2, 6, 7), (0, 3, 7, 4), (1, 5, 6, 2)]
+
+
+def _fit_boxes(obj, fit, count):
+    """World space boxes (bounds dicts) around obj for a BOX_FITS mode, cached per mesh."""
+    if fit == 'AABB':
+        return [object_bounds(obj, "aabb")]
+    if fit == 'OBB':
+        return [object_bounds(obj, "obb")]
+    return object_bounds(obj, "boxes", count)
+
+
+def _parts_object(name, parts, group_names, origin=None):
+    """
+    One object holding closed parts written straight to mesh data.
+    parts is a list of (co (k, 3), faces) in world space; part i goes into
+    vertex group group_names[i]. The origin sits at `origin`, or the centre
+    of the first part.
+    """
+    origin = np.asarray(parts[0][0]).mean(axis=0) if origin is None else np.asarray(origin)
+    verts, faces, ranges = [], [], []
+    for co, part_faces in parts:
+        base = len(verts)
+        verts.extend((np.asarray(co) - origin).tolist())
+        faces.extend(tuple(base + i for i in face) for face in part_faces)
+        ranges.append(range(base, len(verts)))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = origin.tolist()
+    bpy.context.scene.collection.objects.link(obj)
+
+    for group_name, rng in zip(group_names, ranges):
+        vg = obj.vertex_groups.get(group_name) or obj.vertex_groups.new(name=group_name)
+        vg.add(list(rng), 1.0, 'REPLACE')
+    return obj
+
+
+def _box_object(name, boxes, group_names):
+    """
+    One object holding a closed box per bounds box (see _parts_object).
+    The origin sits at the centre of the first box.
+    """
+    parts = [(bounds.box_corners(dict(box, half=np.maximum(box["half"], _MIN_BOX_HALF))), _BOX_FACES)
+             for box in boxes]
+    return _parts_object(name, parts, group_names, origin=boxes[0]["center"])
+
+
+def create_geometry(mass=100.0, fit='AABB', count=2):
     """
-    Geometry LOD: one cube per call, each named ComponentXX.
-    Each cube is a separate object so it can be reshaped independently.
+    Geometry LOD: one box per component, each named ComponentXX.
+    Each box is a separate object so it can be reshaped independently.
     On export all Geometry objects are joined into one LOD with transforms applied.
     Wiki: must be closed+convex, ComponentXX named, must have Mass (min 10 for
     character collision). autocenter named property controls centering.
+
+    fit picks the box (see BOX_FITS): the world bounding box, one oriented
+    box, or up to `count` oriented boxes from clustering. Mass is split by
+    box volume. Returns the first component object.
     """
     original_obj = bpy.context.scene.dgm_target_object
     if not original_obj or original_obj.type != 'MESH':
         return None
 
-    comp_idx = _next_geometry_component_index()
-    comp_name = "Component{:02d}".format(comp_idx)
-
-    min_x, max_x, min_y, max_y, min_z, max_z = get_bbox(original_obj)
-    cx = (max_x + min_x) / 2
-    cy = (max_y + min_y) / 2
-    cz = (max_z + min_z) / 2
+    ensure_object_mode()
+    boxes = _fit_boxes(original_obj, fit, count)
+    volumes = np.array([max(bounds.box_volume(b), 1e-9) for b in boxes])
+    masses = mass * volumes / volumes.sum()
 
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, cz))
-    obj = bpy.context.object
-    obj.name = "Geometry_{}".format(comp_name)
-    obj.scale = (max_x - min_x, max_y - min_y, max_z - min_z)
-    bpy.ops.object.transform_apply(scale=True)
+    created = []
+    for box, box_mass in zip(boxes, masses):
+        comp_idx = _next_geometry_component_index()
+        comp_name = "Component{:02d}".format(comp_idx)
+        obj = _box_object("Geometry_{}".format(comp_name), [box], [comp_name])
 
-    vg = obj.vertex_groups.new(name=comp_name)
-    vg.add([v.index for v in obj.data.vertices], 1.0, 'REPLACE')
+        # FHQWeights — mass distributed evenly across verts
+        add_fhq_weights(obj, weight=box_mass / max(len(obj.data.vertices), 1))
 
-    # FHQWeights — mass distributed evenly across verts
-    add_fhq_weights(obj, weight=mass / max(len(obj.data.vertices), 1))
+        set_dgm_props(obj, LOD_VALUES["Geometry"], mass=float(box_mass))
+        clear_named_props(obj)
+        add_named_prop(obj, "autocenter", "0")
+        add_named_prop(obj, "canbeoccluded", "1")
+        add_named_prop(obj, "canocclude", "0")
 
-    set_dgm_props(obj, LOD_VALUES["Geometry"], mass=mass)
-    clear_named_props(obj)
-    add_named_prop(obj, "autocenter", "0")
-    add_named_prop(obj, "canbeoccluded", "1")
-    add_named_prop(obj, "canocclude", "0")
+        assign_default_material(obj)
+        move_to_collection(obj, "Geometry")
+        created.append(obj)
 
-    assign_default_material(obj)
-    move_to_collection(obj, "Geometry")
-    return obj
+    set_active(created[-1])
+    return created[0]
 
 
 # ---------------------------------------------------------------------------
 # View Geometry LOD
 # ---------------------------------------------------------------------------
 
-def create_view_geometry():
+def create_view_geometry(fit='AABB', count=2):
     """
     View Geometry: defines object visibility for AI and players.
     Wiki: if absent, Geometry LOD is used instead. Can be a bounding box.
+
+    fit picks the box (see BOX_FITS). Oriented boxes hug rotated or
+    L-shaped assets, so the View Geometry occludes less empty space.
+    Several boxes go into one object as Component01, Component02, ...
     """
     original_obj = bpy.context.scene.dgm_target_object
     if not original_obj or original_obj.type != 'MESH':
         return None
 
-    min_x, max_x, min_y, max_y, min_z, max_z = get_bbox(original_obj)
-    cx = (max_x + min_x) / 2
-    cy = (max_y + min_y) / 2
-    cz = (max_z + min_z) / 2
-
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, cz))
-    obj = bpy.context.object
-    obj.name = "View Geometry"
-    obj.scale = (max_x - min_x, max_y - min_y, max_z - min_z)
-    bpy.ops.object.transform_apply(scale=True)
-
-    vg = obj.vertex_groups.new(name="Component01")
-    vg.add([v.index for v in obj.data.vertices], 1.0, 'REPLACE')
+    ensure_object_mode()
+    boxes = _fit_boxes(original_obj, fit, count)
+    obj = _box_object("View Geometry", boxes,
+                      ["Component{:02d}".format(i) for i in range(1, len(boxes) + 1)])
 
     set_dgm_props(obj, LOD_VALUES["View Geometry"])
     assign_default_material(obj)
     move_to_collection(obj, "View Geometry")
+    set_active(obj)
     return obj
 
 
@@ -413,76 +607,229 @@ def create_fire_geometry(operator=None, quality=2):
 # Shadow Volume LODs
 # ---------------------------------------------------------------------------
 
-def create_shadow_volumes():
+def _edge_face_counts(mesh):
+    """Faces using each edge of mesh, as an array indexed by edge."""
+    edge_index = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("edge_index", edge_index)
+    return np.bincount(edge_index, minlength=len(mesh.edges))
+
+
+def _build_shadow_mesh(source, name, scale_factor, max_tris=0):
+    """
+    One bmesh pass from the source mesh to a shadow volume mesh: scaled by
+    the object scale times scale_factor (same result as transform_apply on a
+    shrunk copy), triangulated, optionally simplified to max_tris, with all
+    edges sharp. Returns the new mesh.
+    """
+    bm = bmesh.new()
+    bm.from_mesh(source.data)
+    scale = source.scale * scale_factor
+    bmesh.ops.scale(bm, vec=scale, verts=bm.verts)
+    if scale.x * scale.y * scale.z < 0.0:
+        # Negative scale mirrors the mesh — keep normals pointing out
+        bmesh.ops.reverse_faces(bm, faces=bm.faces)
+    bmesh.ops.triangulate(bm, faces=bm.faces, quad_method='BEAUTY', ngon_method='BEAUTY')
+
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    if max_tris and len(mesh.polygons) > max_tris:
+        mesh_data, info = _mesh_to_arrays(mesh)
+        level = mesh_simplify.simplify_levels(mesh_data, [max_tris])[0]
+        holder = bpy.data.objects.new("__DGM_TMP__", mesh)
+        for group in source.vertex_groups:
+            holder.vertex_groups.new(name=group.name)
+        _arrays_to_mesh(holder, level, info)
+        bpy.data.objects.remove(holder, do_unlink=True)
+
+    # Wiki requirement: all edges sharp
+    mesh.edges.foreach_set("use_edge_sharp", np.ones(len(mesh.edges), dtype=bool))
+    mesh.update()
+    return mesh
+
+
+def create_shadow_volumes(far_max_tris=0):
     """
     Shadow Volume LODs: cast shadows on ground and objects.
     Wiki: must be closed, triangulated, all edges sharp.
     Two are needed: close-range (detailed) and far (simple).
     Shadow Volume is slightly shrunk from res LOD to avoid self-shadowing.
+
+    Copy, scale, triangulation and sharp edges happen in one bmesh pass per
+    LOD — no edit mode or transform_apply. far_max_tris > 0 simplifies the
+    far shadow (Shadow Volume 2) to that many triangles.
+    Returns [(obj, open_edges, non_manifold_edges)] so callers can warn when
+    a shadow volume isn't closed.
     """
     original_obj = bpy.context.scene.dgm_target_object
     if not original_obj or original_obj.type != 'MESH':
-        return
+        return []
 
     ensure_object_mode()
+    col = get_or_create_collection("Shadow")
 
-    for i, (lod_val, suffix, scale_factor) in enumerate([
-        (LOD_VALUES["Shadow Volume"],  "Shadow Volume",    0.99),
-        (LOD_VALUES["Shadow Volume 2"], "Shadow Volume 2",  0.97),
-    ]):
+    results = []
+    for lod_val, suffix, scale_factor, max_tris in [
+        (LOD_VALUES["Shadow Volume"],   "Shadow Volume",   0.99, 0),
+        (LOD_VALUES["Shadow Volume 2"], "Shadow Volume 2", 0.97, far_max_tris),
+    ]:
         sv_obj = original_obj.copy()
-        sv_obj.data = original_obj.data.copy()
+        sv_obj.data = _build_shadow_mesh(original_obj, suffix, scale_factor, max_tris)
+        sv_obj.scale = (1.0, 1.0, 1.0)
         sv_obj.name = suffix
 
-        col = get_or_create_collection("Shadow")
         for c in list(sv_obj.users_collection):
             c.objects.unlink(sv_obj)
         col.objects.link(sv_obj)
 
-        bpy.context.view_layer.objects.active = sv_obj
-        sv_obj.select_set(True)
-
-        # Slightly shrink to prevent self-shadowing artifacts
-        sv_obj.scale = (sv_obj.scale.x * scale_factor,
-                        sv_obj.scale.y * scale_factor,
-                        sv_obj.scale.z * scale_factor)
-        bpy.ops.object.transform_apply(scale=True)
-
-        # Wiki requirements: triangulated + all edges sharp
-        triangulate_object(sv_obj)
-        mark_all_sharp(sv_obj)
-
         set_dgm_props(sv_obj, lod_val)
         assign_default_material(sv_obj)
 
-        bpy.ops.object.select_all(action='DESELECT')
+        counts = _edge_face_counts(sv_obj.data)
+        open_edges = int(np.count_nonzero(counts < 2))
+        non_manifold = int(np.count_nonzero(counts > 2))
+        if open_edges or non_manifold:
+            print("[DGM] {}: not closed — {} open edge(s), {} non-manifold edge(s)".format(
+                sv_obj.name, open_edges, non_manifold))
+        results.append((sv_obj, open_edges, non_manifold))
+
+    return results
 
 
 # ---------------------------------------------------------------------------
 # Memory LOD
 # ---------------------------------------------------------------------------
 
+# Cached name -> vertex indices index of the Memory LOD. Rebuilt lazily when
+# the memory object changes: a depsgraph handler bumps the generation for
+# any update to the Memory object or its mesh, and our own edits invalidate
+# directly. The key also carries vertex / group counts as a cheap hash.
+_memory_cache = {"obj": None, "key": None, "groups": {}}
+_memory_generation = 0
+
+
+def invalidate_memory_index():
+    global _memory_generation
+    _memory_generation += 1
+
+
 def get_memory_object():
     """Find the existing Memory LOD object, or return None."""
+    cached = _memory_cache["obj"]
+    if cached is not None:
+        try:
+            if cached.name in bpy.data.objects and any(
+                    c.name == "Memory" for c in cached.users_collection):
+                return cached
+        except ReferenceError:
+            pass
+        _memory_cache["obj"] = None
     col = bpy.data.collections.get("Memory")
     if col:
         for o in col.objects:
             if o.type == 'MESH' and o.dgm_props.is_dayz_object:
+                _memory_cache["obj"] = o
                 return o
     return None
 
 
-def memory_point_exists(point_names):
-    """Return True if ALL named vertex groups exist on the Memory object."""
+def memory_index():
+    """{group name: [vertex indices]} for the Memory LOD, or {} if there is none."""
     mem = get_memory_object()
     if not mem:
-        return False
-    existing = {vg.name for vg in mem.vertex_groups}
+        return {}
+    key = (mem.as_pointer(), mem.data.as_pointer(), len(mem.data.vertices),
+           len(mem.vertex_groups), _memory_generation)
+    if _memory_cache["key"] == key:
+        return _memory_cache["groups"]
+
+    names = [vg.name for vg in mem.vertex_groups]
+    groups = {name: [] for name in names}
+    for v in mem.data.vertices:
+        for g in v.groups:
+            if g.group < len(names):
+                groups[names[g.group]].append(v.index)
+    _memory_cache["key"] = key
+    _memory_cache["groups"] = groups
+    return groups
+
+
+def memory_index_key():
+    """Changes whenever memory_index() would return something different."""
+    memory_index()
+    return (_memory_cache["key"], _memory_generation)
+
+
+def memory_point_vertices(name):
+    """Vertex indices of a named memory point (empty if it doesn't exist)."""
+    return memory_index().get(name, [])
+
+
+def memory_point_exists(point_names):
+    """Return True if ALL named vertex groups exist on the Memory object."""
+    existing = memory_index()
     if isinstance(point_names, str):
         return point_names in existing
     return all(n in existing for n in point_names)
 
 
+@bpy.app.handlers.persistent
+def _memory_depsgraph_update(scene, depsgraph):
+    mem = _memory_cache["obj"]
+    if mem is None:
+        return
+    try:
+        watched = {mem.as_pointer(), mem.data.as_pointer()}
+    except ReferenceError:
+        _memory_cache["obj"] = None
+        return
+    for update in depsgraph.updates:
+        if update.id.original.as_pointer() in watched:
+            invalidate_memory_index()
+            return
+
+
+@bpy.app.handlers.persistent
+def _component_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object) and any(
+                c.name == "Geometry" for c in id_data.users_collection):
+            invalidate_component_registry()
+            return
+
+
+@bpy.app.handlers.persistent
+def _memory_load_post(*_args):
+    _memory_cache["obj"] = None
+    invalidate_memory_index()
+    invalidate_component_registry()
+
+
+def register_handlers():
+    if _memory_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_memory_depsgraph_update)
+    if _component_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_component_depsgraph_update)
+    if _memory_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_memory_load_post)
+    if _lod_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_lod_load_post)
+
+
+def unregister_handlers():
+    if _memory_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_memory_depsgraph_update)
+    if _component_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_component_depsgraph_update)
+    if _memory_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_memory_load_post)
+    if _lod_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_lod_load_post)
+    _memory_load_post()
+
+
 def _get_or_create_memory_object():
     """Return the Memory LOD object, creating it if needed."""
     mem = get_memory_object()
@@ -496,36 +843,128 @@ def _get_or_create_memory_object():
     return mem
 
 
-def _remove_memory_groups(mem_obj, names):
-    """Remove vertex groups (and their verts) from the memory object by name."""
-    ensure_object_mode()
-    groups_to_remove = [vg for vg in mem_obj.vertex_groups if vg.name in names]
-    if not groups_to_remove:
-        return
+def _memory_groups(mem_obj):
+    """{group name: [vertex indices]} for any memory-style object."""
+    if mem_obj == get_memory_object():
+        return memory_index()
+    names = [vg.name for vg in mem_obj.vertex_groups]
+    groups = {name: [] for name in names}
+    for v in mem_obj.data.vertices:
+        for g in v.groups:
+            groups[names[g.group]].append(v.index)
+    return groups
 
-    keep_names = {vg.name for vg in mem_obj.vertex_groups} - set(names)
-    keep_verts = set()
-    remove_verts = set()
 
-    for v in mem_obj.data.vertices:
-        v_groups = {mem_obj.vertex_groups[g.group].name for g in v.groups}
-        if v_groups & keep_names:
-            keep_verts.add(v.index)
-        elif v_groups & set(names):
-            remove_verts.add(v.index)
+def _flatten_points(points):
+    """(names, coords, group ranges) from (group_name, co | [co, ...]) items."""
+    cos = []
+    assignments = []
+    for name, co_data in points:
+        if isinstance(co_data[0], (list, tuple)):
+            assignments.append((name, range(len(cos), len(cos) + len(co_data))))
+            cos.extend(co_data)
+        else:
+            assignments.append((name, range(len(cos), len(cos) + 1)))
+            cos.append(co_data)
+    return np.array(cos, dtype=np.float64).reshape(-1, 3), assignments
+
+
+def replace_memory_points(mem_obj, remove_names=(), points=(), shared=None):
+    """
+    Bulk edit of a memory object in one mesh rebuild: drop the vertex groups
+    in remove_names (and their verts, unless another group still uses them),
+    then add points — a list of (group_name, co) or (group_name, [co, ...]).
+    shared is an optional (coords, {group_name: [index, ...]}) block whose
+    verts can belong to several groups, as in an imported P3D.
+    Coordinates go through foreach_get / foreach_set, so hundreds of points
+    cost about the same as one. Memory point weights are 1.0.
+    """
+    ensure_object_mode()
+    mesh = mem_obj.data
+    remove_names = set(remove_names)
+    new_co, assignments = _flatten_points(points)
+    if shared is not None:
+        shared_co, shared_groups = shared
+        offset = len(new_co)
+        new_co = np.concatenate([new_co, np.asarray(shared_co, dtype=np.float64).reshape(-1, 3)])
+        assignments += [(name, [offset + i for i in idx]) for name, idx in shared_groups.items()]
+
+    groups = _memory_groups(mem_obj)
+    removed = [name for name in groups if name in remove_names]
+    if not removed and not len(new_co):
+        return
 
-    for vg in groups_to_remove:
-        mem_obj.vertex_groups.remove(vg)
+    n = len(mesh.vertices)
+    drop = np.zeros(n, dtype=bool)
+    keep_used = np.zeros(n, dtype=bool)
+    for name, verts in groups.items():
+        if name in remove_names:
+            drop[verts] = True
+        else:
+            keep_used[verts] = True
+    # Shared verts stay as long as any remaining group still uses them
+    drop &= ~keep_used
 
-    if remove_verts:
+    rebuild = bool(drop.any()) and not len(mesh.polygons)
+    if drop.any() and not rebuild:
+        # Faces on a memory LOD are rare — let bmesh delete around them
         bm = bmesh.new()
-        bm.from_mesh(mem_obj.data)
+        bm.from_mesh(mesh)
         bm.verts.ensure_lookup_table()
-        to_del = [v for v in bm.verts if v.index in remove_verts]
-        bmesh.ops.delete(bm, geom=to_del, context='VERTS')
-        bm.to_mesh(mem_obj.data)
+        bmesh.ops.delete(bm, geom=[bm.verts[i] for i in np.nonzero(drop)[0]], context='VERTS')
+        bm.to_mesh(mesh)
         bm.free()
-        mem_obj.data.update()
+
+    n = len(mesh.vertices)
+    co = np.empty(n * 3)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+
+    if rebuild:
+        keep = ~drop
+        remap = np.cumsum(keep) - 1
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+        mesh.edges.foreach_get("vertices", edges)
+        edges = edges.reshape(-1, 2)
+        edges = remap[edges[keep[edges].all(axis=1)]]
+        kept_groups = {}
+        for name, verts in groups.items():
+            verts = np.asarray(verts, dtype=np.int64)
+            if name not in remove_names and len(verts):
+                kept_groups[name] = remap[verts[keep[verts]]]
+
+    for vg in list(mem_obj.vertex_groups):
+        if vg.name in remove_names:
+            mem_obj.vertex_groups.remove(vg)
+
+    if rebuild:
+        co = co[keep]
+        mesh.clear_geometry()
+        mesh.vertices.add(len(co) + len(new_co))
+        mesh.vertices.foreach_set("co", np.concatenate([co, new_co]).ravel())
+        if len(edges):
+            mesh.edges.add(len(edges))
+            mesh.edges.foreach_set("vertices", edges.ravel())
+        mesh.update()
+        # Group names live on the mesh — don't count on them surviving the clear
+        for name, verts in kept_groups.items():
+            vg = mem_obj.vertex_groups.get(name) or mem_obj.vertex_groups.new(name=name)
+            vg.add(verts.tolist(), 1.0, 'REPLACE')
+    elif len(new_co):
+        mesh.vertices.add(len(new_co))
+        mesh.vertices.foreach_set("co", np.concatenate([co, new_co]).ravel())
+        mesh.update()
+
+    base = len(co)
+    for name, rng in assignments:
+        vg = mem_obj.vertex_groups.get(name) or mem_obj.vertex_groups.new(name=name)
+        vg.add([base + i for i in rng], 1.0, 'REPLACE')
+    invalidate_memory_index()
+
+
+def _remove_memory_groups(mem_obj, names):
+    """Remove vertex groups (and their verts) from the memory object by name."""
+    replace_memory_points(mem_obj, remove_names=names)
 
 
 def _add_memory_verts(mem_obj, points):
@@ -533,33 +972,7 @@ def _add_memory_verts(mem_obj, points):
     Add vertices and vertex groups to the memory object.
     points: list of (group_name, co) or (group_name, [co, co, ...]) for multi-vert groups.
     """
-    ensure_object_mode()
-    base = len(mem_obj.data.vertices)
-
-    all_cos = []
-    group_assignments = []
-
-    for item in points:
-        name, co_data = item
-        if isinstance(co_data[0], (list, tuple)):
-            indices = list(range(base + len(all_cos), base + len(all_cos) + len(co_data)))
-            all_cos.extend(co_data)
-        else:
-            indices = [base + len(all_cos)]
-            all_cos.append(co_data)
-        group_assignments.append((name, indices))
-
-    if not all_cos:
-        return
-
-    mem_obj.data.vertices.add(len(all_cos))
-    for i, co in enumerate(all_cos):
-        mem_obj.data.vertices[base + i].co = co
-    mem_obj.data.update()
-
-    for name, indices in group_assignments:
-        vg = mem_obj.vertex_groups.get(name) or mem_obj.vertex_groups.new(name=name)
-        vg.add(indices, 1.0, 'REPLACE')
+    replace_memory_points(mem_obj, points=points)
 
 
 def _bbox_data():
@@ -588,6 +1001,21 @@ def _bbox_data():
     }
 
 
+def _bounding_sphere():
+    """
+    ((cx, cy, cz), radius) of the exact minimum sphere around the target's
+    world space vertices. Non-mesh targets use the sphere around the bbox.
+    """
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj:
+        return None
+    if original_obj.type == 'MESH' and len(original_obj.data.vertices):
+        c, r = object_bounds(original_obj, "sphere")
+        return tuple(c.tolist()), r
+    b = _bbox_data()
+    return (b['cx'], b['cy'], b['cz']), b['sphere_r']
+
+
 def add_memory_bbox():
     b = _bbox_data()
     if not b:
@@ -601,35 +1029,37 @@ def add_memory_bbox():
 
 
 def add_memory_invview():
-    b = _bbox_data()
-    if not b:
+    sphere = _bounding_sphere()
+    if not sphere:
         return
+    (cx, _cy, cz), r = sphere
+    # Same offset as before the exact sphere: in front of the bbox's -Y face
+    min_y = _bbox_data()['min_y']
     mem = _get_or_create_memory_object()
-    _remove_memory_groups(mem, ['invview'])
-    _add_memory_verts(mem, [
-        ('invview', (b['cx'], b['min_y'] - b['sphere_r'] * 1.75, b['cz'])),
+    replace_memory_points(mem, ['invview'], [
+        ('invview', (cx, min_y - r * 1.75, cz)),
     ])
 
 
 def add_memory_center():
-    b = _bbox_data()
-    if not b:
+    sphere = _bounding_sphere()
+    if not sphere:
         return
+    center, _r = sphere
     mem = _get_or_create_memory_object()
-    _remove_memory_groups(mem, ['ce_center'])
-    _add_memory_verts(mem, [
-        ('ce_center', (b['cx'], b['cy'], b['cz'])),
+    replace_memory_points(mem, ['ce_center'], [
+        ('ce_center', center),
     ])
 
 
 def add_memory_radius():
-    b = _bbox_data()
-    if not b:
+    sphere = _bounding_sphere()
+    if not sphere:
         return
+    (cx, cy, cz), r = sphere
     mem = _get_or_create_memory_object()
-    _remove_memory_groups(mem, ['ce_radius'])
-    _add_memory_verts(mem, [
-        ('ce_radius', (b['cx'] - b['sphere_r'], b['cy'], b['cz'])),
+    replace_memory_points(mem, ['ce_radius'], [
+        ('ce_radius', (cx - r, cy, cz)),
     ])
 
 
@@ -684,82 +1114,6 @@ def add_memory_magazine():
     ])
 
 
-def _parse_p3d_lod(filepath):
-    """
-    Parse a single-LOD MLOD P3D file.
-    Returns (verts, faces, named_selections, resolution) where:
-      verts            : list of (x, y, z) in Blender space (Arma XZY -> Blender XYZ)
-      faces            : list of vertex-index lists (quads or tris)
-      named_selections : dict  name -> {'verts': [...], 'faces': [...]}
-      resolution       : float LOD resolution value
-    """
-    import struct, os
-
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Bundled P3D not found: {filepath}")
-
-    data = open(filepath, "rb").read()
-    pos = 0
-
-    assert data[pos:pos+4] == b'MLOD', "Not a valid MLOD P3D"
-    pos += 12  # sig(4) + version(4) + nlods(4)
-
-    assert data[pos:pos+4] == b'P3DM', "Expected P3DM LOD"
-    pos += 4 + 8  # sig + version_major + version_minor
-
-    npoints, nnormals, nfaces = struct.unpack_from('<III', data, pos)
-    pos += 16  # 3 counts + flags
-
-    # Vertices stored as (x, z, y, flags) — swap z/y for Blender
-    verts = []
-    for _ in range(npoints):
-        x, z, y, _flag = struct.unpack_from('<fffI', data, pos); pos += 16
-        verts.append((x, y, z))
-
-    pos += nnormals * 12  # skip normals
-
-    faces = []
-    for _ in range(nfaces):
-        count_sides = struct.unpack_from('<I', data, pos)[0]; pos += 4
-        fv = []
-        for _ in range(count_sides):
-            vi, _ni, _u, _v = struct.unpack_from('<IIff', data, pos); pos += 16
-            fv.append(vi)
-        if count_sides < 4:
-            pos += 16  # triangle padding slot
-        pos += 4  # face flags
-        pos = data.index(b'\x00', pos) + 1  # texture string
-        pos = data.index(b'\x00', pos) + 1  # material string
-        faces.append(fv)
-
-    named_selections = {}
-    while pos < len(data):
-        active = data[pos]; pos += 1
-        if active == 0:
-            break
-        end = data.index(b'\x00', pos)
-        name = data[pos:end].decode('ascii', errors='replace'); pos = end + 1
-        length = struct.unpack_from('<I', data, pos)[0]; pos += 4
-        tagg_data = data[pos:pos+length]; pos += length
-        if name == '#EndOfFile#':
-            break
-        if name.startswith('#'):
-            continue
-        named_selections[name] = {
-            'verts': [i for i, w in enumerate(tagg_data[:npoints]) if w > 0],
-            'faces': [i for i, s in enumerate(tagg_data[npoints:npoints+nfaces]) if s > 0],
-        }
-
-    resolution = struct.unpack_from('<f', data, pos)[0]
-    return verts, faces, named_selections, resolution
-
-
-def _assets_path(filename):
-    import os
-    return os.path.join(os.path.dirname(__file__), "assets", filename)
-
-
-
 # ---------------------------------------------------------------------------
 # Ladder Collision Geometry
 # ---------------------------------------------------------------------------
@@ -800,15 +1154,54 @@ BOX_FACES = [
 ]
 
 
+def _ladder_col_ranges(geo, bm, comps):
+    """
+    {comp_name: (start, end)} vertex ranges of one ladder's collision boxes in
+    the shared Geometry mesh, from its dgm_ladder_col_map entry. Entries
+    written before ranges were stored (plain name lists) or ranges that no
+    longer match the mesh are recovered by scanning the vertex groups.
+    """
+    dl = bm.verts.layers.deform.active
+    n_verts = len(bm.verts)
+    ranges = {}
+    if isinstance(comps, dict):
+        for name, span in comps.items():
+            vg = geo.vertex_groups.get(name)
+            if vg is None or not span or dl is None:
+                continue
+            v_start, v_end = span
+            if 0 <= v_start < v_end <= n_verts and all(
+                    vg.index in bm.verts[i][dl] for i in range(v_start, v_end)):
+                ranges[name] = (v_start, v_end)
+    missing = [c for c in comps if c not in ranges and geo.vertex_groups.get(c)]
+    if not missing or dl is None:
+        return ranges
+
+    # Slow path: the group's verts that belong to no other group
+    group_names = {vg.index: vg.name for vg in geo.vertex_groups}
+    by_comp = {c: [] for c in missing}
+    for v in bm.verts:
+        names = {group_names.get(g) for g in v[dl].keys()}
+        if len(names) == 1:
+            name = names.pop()
+            if name in by_comp:
+                by_comp[name].append(v.index)
+    for name, idx in by_comp.items():
+        if idx:
+            ranges[name] = (min(idx), max(idx) + 1)
+    return ranges
+
+
 def create_ladder_collision(ladder_obj, mass_per_stringer=20.0):
     """
     Create Geometry LOD collision for a ladder — two box components (left+right stringer)
-    added into the shared Geometry object.
-
-    Tracking which ComponentXX belongs to which ladder is done via a custom property
-    'dgm_ladder_col_map' on the Geometry object — a dict {ladder_name: [comp_name, ...]}
-    No extra vertex groups are created beyond the required ComponentXX groups.
+    added into the shared Geometry object. See create_ladders_collision.
     """
+    return create_ladders_collision([ladder_obj], mass_per_stringer)
+
+
+def _ladder_stringers(ladder_obj):
+    """(left, right) world stringer centres, half tube size, half height and base Z of a ladder."""
     width        = ladder_obj.get('dgm_p_width',         0.440)
     tube_d       = ladder_obj.get('dgm_p_tube_diameter', 0.042)
     total_height = ladder_obj.get('dgm_ladder_height',   6.0)
@@ -819,153 +1212,183 @@ def create_ladder_collision(ladder_obj, mass_per_stringer=20.0):
     # This handles translation, rotation and scale correctly.
     mw = ladder_obj.matrix_world
     # Left and right stringer world positions (local X=±sx, Y=0, Z=0)
-    origin_world  = mw @ mathutils.Vector((0.0,        0.0, 0.0))
     right_stringer = mw @ mathutils.Vector(( sx_local,  0.0, 0.0))
     left_stringer  = mw @ mathutils.Vector((-sx_local,  0.0, 0.0))
 
     wc       = [mw @ mathutils.Vector(c) for c in ladder_obj.bound_box]
     base_z   = min(c.z for c in wc)
-    cx_world = origin_world.x   # X centre of ladder (at origin)
-    cy_world = origin_world.y   # Y = stringer plane, not bbox centre
+    return left_stringer, right_stringer, tube_d / 2.0, total_height / 2.0, base_z
+
 
+def create_ladders_collision(ladder_objs, mass_per_stringer=20.0):
+    """
+    Geometry LOD collision for several ladders in one Geometry mesh write —
+    two box components (left+right stringer) per ladder, added into the
+    shared Geometry object.
+
+    Tracking which ComponentXX belongs to which ladder is done via a custom property
+    'dgm_ladder_col_map' on the Geometry object — a dict
+    {ladder_name: {comp_name: [vert_start, vert_end]}}. The vertex ranges let a
+    rebuild delete and re-add only this ladder's boxes; other ladders' ranges are
+    shifted down by the number of verts removed before them.
+    No extra vertex groups are created beyond the required ComponentXX groups.
+    Old groups are only removed once the bmesh is written back, so the group
+    indices in the bmesh stay valid throughout.
+    """
     geo = _get_or_create_geometry_object()
 
-    # Remove previously generated components for this ladder using the map
-    import json
     col_map_raw = geo.get('dgm_ladder_col_map', '{}')
     try:
         col_map = json.loads(col_map_raw)
     except Exception:
         col_map = {}
 
-    ladder_name = ladder_obj.name
-    old_comps = col_map.get(ladder_name, [])
-    if old_comps:
-        old_vg_names = set(old_comps)
-        keep_names   = {vg.name for vg in geo.vertex_groups} - old_vg_names
-        remove_verts = set()
-        for v in geo.data.vertices:
-            v_grp_names = {geo.vertex_groups[g.group].name for g in v.groups}
-            if v_grp_names & old_vg_names and not v_grp_names & keep_names:
-                remove_verts.add(v.index)
-        for vg_name in old_comps:
-            vg = geo.vertex_groups.get(vg_name)
-            if vg:
-                geo.vertex_groups.remove(vg)
-        if remove_verts:
-            bm_del = bmesh.new()
-            bm_del.from_mesh(geo.data)
-            bm_del.verts.ensure_lookup_table()
-            del_v = [bm_del.verts[i] for i in remove_verts if i < len(bm_del.verts)]
-            bmesh.ops.delete(bm_del, geom=del_v, context='VERTS')
-            bm_del.to_mesh(geo.data)
-            bm_del.free()
-            geo.data.update()
-
-    # Build both stringer boxes
     bm = bmesh.new()
     bm.from_mesh(geo.data)
     bm.verts.ensure_lookup_table()
+    dl = bm.verts.layers.deform.verify()
+    wl = bm.verts.layers.float.get('FHQWeights') or bm.verts.layers.float.new('FHQWeights')
+
+    removed_mass = 0.0
+    stale_groups = set()
+    new_faces = []
+    for ladder_obj in ladder_objs:
+        left_stringer, right_stringer, hl, hh, base_z = _ladder_stringers(ladder_obj)
+        cz = base_z + hh
+
+        # Remove previously generated components for this ladder using the map
+        ladder_name = ladder_obj.name
+        old_comps = col_map.pop(ladder_name, [])
+        if old_comps:
+            removed = sorted(_ladder_col_ranges(geo, bm, old_comps).values())
+            removed_mass += sum(bm.verts[i][wl] for a, b in removed for i in range(a, b))
+            if removed:
+                bmesh.ops.delete(bm, geom=[bm.verts[i] for a, b in removed for i in range(a, b)],
+                                 context='VERTS')
+                bm.verts.ensure_lookup_table()
+
+                def shift(index):
+                    return index - sum(min(b, index) - a for a, b in removed if a < index)
+
+                for comps in col_map.values():
+                    if isinstance(comps, dict):
+                        for name, span in comps.items():
+                            if span:
+                                comps[name] = [shift(span[0]), shift(span[1])]
+            stale_groups.update(name for name in old_comps if geo.vertex_groups.get(name))
+            free_components(old_comps)
+
+        # Reserve both component indices up front so they are sequential (01+02, 03+04, etc.)
+        comp_names = ["Component{:02d}".format(i) for i in allocate_components(2)]
+
+        # Write the boxes, their ComponentXX group and FHQWeights straight into the
+        # bmesh layers so only the new verts are touched. A freed name may come
+        # straight back — its (now empty) group is reused instead of removed.
+        new_comps = {}
+        for comp_name, stringer_world_pos in zip(comp_names, (left_stringer, right_stringer)):
+            stale_groups.discard(comp_name)
+            vg = geo.vertex_groups.get(comp_name) or geo.vertex_groups.new(name=comp_name)
+            base_idx = len(bm.verts)
+            new_verts = [bm.verts.new(co)
+                         for co in _make_box_verts(stringer_world_pos.x, stringer_world_pos.y,
+                                                   cz, hl, hl, hh)]
+            for v in new_verts:
+                v[dl][vg.index] = 1.0
+                v[wl] = mass_per_stringer / 8.0
+            new_faces.extend(bm.faces.new([new_verts[i] for i in fi]) for fi in BOX_FACES)
+            new_comps[comp_name] = [base_idx, base_idx + 8]
+        bm.verts.ensure_lookup_table()
 
-    hl = tube_d / 2.0
-    hh = total_height / 2.0
-    cz = base_z + hh
-
-    # Reserve both component indices up front so they are sequential (01+02, 03+04, etc.)
-    # _next_geometry_component_index scans existing vertex groups — calling it twice in a
-    # loop would return the same index both times because the first group isn't written yet.
-    idx_a = _next_geometry_component_index()
-    # Temporarily mark idx_a as used by inserting a placeholder group
-    _placeholder = geo.vertex_groups.new(name="Component{:02d}".format(idx_a))
-    idx_b = _next_geometry_component_index()
-    geo.vertex_groups.remove(_placeholder)   # remove placeholder — real group added later
-
-    comp_names = ["Component{:02d}".format(idx_a), "Component{:02d}".format(idx_b)]
-
-    new_comps   = []
-    vert_ranges = []
-    for comp_name, stringer_world_pos in zip(comp_names, (left_stringer, right_stringer)):
-        cx = stringer_world_pos.x
-        cy = stringer_world_pos.y
-
-        base_idx  = len(bm.verts)
-        new_verts = [bm.verts.new(mathutils.Vector(co))
-                     for co in _make_box_verts(cx, cy, cz, hl, hl, hh)]
-        for fi in BOX_FACES:
-            bm.faces.new([new_verts[i] for i in fi])
-
-        new_comps.append(comp_name)
-        vert_ranges.append((comp_name, base_idx, base_idx + 8))
-
-    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        # Save the map so we can find these components later
+        col_map[ladder_name] = new_comps
+
+    bmesh.ops.recalc_face_normals(bm, faces=new_faces)
     bm.to_mesh(geo.data)
     bm.free()
+    for name in stale_groups:
+        vg = geo.vertex_groups.get(name)
+        if vg:
+            geo.vertex_groups.remove(vg)
     geo.data.update()
-
-    # Assign ComponentXX vertex groups only — no tag groups
-    total_verts = len(geo.data.vertices)
-    for comp_name, v_start, v_end in vert_ranges:
-        vert_indices = list(range(v_start, min(v_end, total_verts)))
-        vg = geo.vertex_groups.new(name=comp_name)
-        vg.add(vert_indices, 1.0, 'REPLACE')
-        w = mass_per_stringer / max(len(vert_indices), 1)
-        add_fhq_weights(geo, weight=w)
-
-    # Save the map so we can find these components later
-    col_map[ladder_name] = new_comps
     geo['dgm_ladder_col_map'] = json.dumps(col_map)
 
-    existing_mass = geo.get("dgm_mass", 0.0)
+    # Replace, not add, these ladders' share of the mass on a rebuild
+    existing_mass = max(geo.dgm_props.mass - removed_mass, 0.0)
     set_dgm_props(geo, LOD_VALUES["Geometry"],
-                  mass=existing_mass + mass_per_stringer * 2)
+                  mass=existing_mass + mass_per_stringer * 2 * len(ladder_objs))
 
     return geo
 
-def add_memory_ladder(ladder_idx=1):
+LADDER_POINT_SUFFIXES = ('', '_bottom_front', '_con', '_con_dir', '_dir', '_top_front')
+
+
+def ladder_point_names(ladder_idx):
+    """Memory point names of a ladder slot: ladderN, ladderN_bottom_front, ..."""
+    prefix = "ladder{}".format(ladder_idx)
+    return [prefix + suffix for suffix in LADDER_POINT_SUFFIXES]
+
+
+def scene_ladders():
     """
-    Import ladder Memory and View Geometry LODs from bundled P3D assets.
-    ladder_idx (1-3) controls which prefix is used: ladder1, ladder2, ladder3.
-    Named selections from the P3D (always 'ladder1' prefix) are renamed to match
-    the requested index.
+    Generated ladders in the scene as ([(N, DZ_Ladder_N object)], skipped),
+    sorted by N, for any N >= 1. Names that aren't DZ_Ladder_N (e.g. a
+    DZ_Ladder_1.001 duplicate), N < 1 and second claims on a slot go to
+    skipped as object names. Resolution LOD copies are ignored.
     """
-    ensure_object_mode()
+    slots, skipped = {}, []
+    for o in sorted(bpy.context.scene.objects, key=lambda o: o.name):
+        if not o.name.startswith("DZ_Ladder_") or not o.get('dgm_ladder') or '.LOD' in o.name:
+            continue
+        try:
+            idx = int(o.name[10:])
+        except ValueError:
+            skipped.append(o.name)
+            continue
+        if idx < 1 or idx in slots:
+            skipped.append(o.name)
+            continue
+        slots[idx] = o
+    return sorted(slots.items(), key=lambda item: item[0]), skipped
+
+
+def _ladder_frame(ladder_obj):
+    """
+    Where a ladder's memory points and View Geometry go, from the target
+    (usually the DZ_Ladder object): X = world bounding box centre, Y =
+    stringer plane (local Y=0, the cage shifts the bbox centre), Z = world
+    min. Rung layout comes from the ladder's stored parameters.
+    """
+    if ladder_obj is not None:
+        mw = ladder_obj.matrix_world
+        world_corners = [mw @ mathutils.Vector(c) for c in ladder_obj.bound_box]
+        cx    = sum(c.x for c in world_corners) / 8.0
+        cy    = (mw @ mathutils.Vector((0.0, 0.0, 0.0))).y
+        min_z = min(c.z for c in world_corners)
+    else:
+        cx, cy, min_z = 0.0, 0.0, 0.0
+
+    if ladder_obj is not None and ladder_obj.get('dgm_ladder'):
+        rungs   = int(ladder_obj.get('dgm_ladder_rungs',   15))
+        spacing = float(ladder_obj.get('dgm_p_rung_spacing',  0.320))
+        ground  = float(ladder_obj.get('dgm_p_ground_offset', 0.340))
+        top_ext = float(ladder_obj.get('dgm_p_top_extension', 0.700))
+        height  = ground + (rungs - 1) * spacing + top_ext
+    else:
+        rungs, spacing, ground, height = 15, 0.320, 0.340, None
+    return {"cx": cx, "cy": cy, "min_z": min_z, "first_rung": ground,
+            "last_rung": ground + (rungs - 1) * spacing, "height": height}
 
-    prefix = "ladder{}".format(ladder_idx)
-    point_names = [
-        prefix,
-        prefix + '_bottom_front',
-        prefix + '_con',
-        prefix + '_con_dir',
-        prefix + '_dir',
-        prefix + '_top_front',
-    ]
 
-    # --- Memory LOD ---
+def _ladder_memory_block(frame, ladder_idx):
+    """
+    (coords, {group name: [index]}) for one ladder slot's memory points, from
+    the bundled ladder Memory P3D. None if the asset can't be read.
+    """
     try:
-        verts, faces, named_selections, _ = _parse_p3d_lod(_assets_path("ladder_memory.p3d"))
+        asset = assets.get("ladder_memory")
     except Exception as e:
         print(f"[DGM] Failed to load ladder Memory P3D: {e}")
-        return
-
-    mem = _get_or_create_memory_object()
-
-    # Remove any existing selections for this ladder slot
-    _remove_memory_groups(mem, point_names)
-
-    import mathutils
-
-    # Align spawn to target object:
-    #   X/Y = world bounding box centre
-    #   Z   = target min Z + 0.340 m (first rung height) — same for all ladder slots
-    target_obj = bpy.context.scene.dgm_target_object
-    if target_obj is not None:
-        world_corners = [target_obj.matrix_world @ mathutils.Vector(c)
-                         for c in target_obj.bound_box]
-        target_cx    = sum(c.x for c in world_corners) / 8.0
-        target_cy    = sum(c.y for c in world_corners) / 8.0
-        target_min_z = min(c.z for c in world_corners)
-    else:
-        target_cx, target_cy, target_min_z = 0.0, 0.0, 0.0
+        return None
 
     # Place memory points at fixed offsets from first_rung and last_rung.
     # NO scaling — each point has a fixed semantic position:
@@ -979,80 +1402,91 @@ def add_memory_ladder(ladder_idx=1):
     #    vert[5]: last_rung_z  + 0.004  (con_dir top)
     #
     # X and Z (depth) offsets from the P3D are kept as-is.
+    src = asset["co"]
+    first, last = frame["first_rung"], frame["last_rung"]
+    z_offsets = np.full(len(src), last)
+    fixed = [first - 0.021, first, first + 0.912, last + 0.306, last, last + 0.004]
+    z_offsets[:min(len(src), len(fixed))] = fixed[:len(src)]
 
-    # Get actual ladder dimensions from target object
-    target_ladder = bpy.context.scene.dgm_target_object
-    if target_ladder is not None and target_ladder.get('dgm_ladder'):
-        rung_count    = int(target_ladder.get('dgm_ladder_rungs',   15))
-        rung_spacing  = float(target_ladder.get('dgm_p_rung_spacing',  0.320))
-        ground_offset = float(target_ladder.get('dgm_p_ground_offset', 0.340))
-    else:
-        rung_count, rung_spacing, ground_offset = 15, 0.320, 0.340
-
-    actual_first_rung = ground_offset
-    actual_last_rung  = ground_offset + (rung_count - 1) * rung_spacing
-
-    # Fixed Z offsets per vertex index (from P3D asset analysis)
-    # Y position = stringer plane (local Y=0), not bbox centre
-    _tgt = bpy.context.scene.dgm_target_object
-    _stringer_cy = (_tgt.matrix_world @ mathutils.Vector((0.0, 0.0, 0.0))).y \
-                   if _tgt is not None else 0.0
-
-    VERT_Z_OFFSETS = [
-        actual_first_rung - 0.021,   # 0
-        actual_first_rung + 0.000,   # 1
-        actual_first_rung + 0.912,   # 2
-        actual_last_rung  + 0.306,   # 3
-        actual_last_rung  + 0.000,   # 4
-        actual_last_rung  + 0.004,   # 5
-    ]
-
-    base = len(mem.data.vertices)
-    mem.data.vertices.add(len(verts))
-    for i, co in enumerate(verts):
-        z = target_min_z + VERT_Z_OFFSETS[i] if i < len(VERT_Z_OFFSETS)             else target_min_z + actual_last_rung
-        # Rotate 180° around Z so memory faces the ladder front (cage is behind)
-        mem.data.vertices[base + i].co = mathutils.Vector((
-            -co[0] + target_cx,
-            -co[1] + _stringer_cy,
-            z,
-        ))
-    mem.data.update()
+    # Rotate 180° around Z so memory faces the ladder front (cage is behind)
+    cos = np.column_stack([frame["cx"] - src[:, 0], frame["cy"] - src[:, 1],
+                           frame["min_z"] + z_offsets])
 
     # The P3D always uses 'ladder1' prefix — remap to the requested index
-    for sel_name, sel_data in named_selections.items():
-        # Skip any corrupted/internal selection names (e.g. "AGG\x01...")
-        if not sel_name.isascii() or '\x01' in sel_name:
-            continue
-        remapped = sel_name.replace("ladder1", prefix, 1)
-        shifted = [i + base for i in sel_data['verts']]
-        vg = mem.vertex_groups.get(remapped) or mem.vertex_groups.new(name=remapped)
-        if shifted:
-            vg.add(shifted, 1.0, 'REPLACE')
-
-    # --- View Geometry LOD ---
-    create_view_geometry_ladder(ladder_idx=ladder_idx)
-
+    prefix = "ladder{}".format(ladder_idx)
+    groups = {sel_name.replace("ladder1", prefix, 1): indices.tolist()
+              for sel_name, indices in asset["selections"].items()}
+    return cos, groups
 
-def remove_memory_ladder(ladder_idx=1):
-    """Remove all memory points and View Geometry for a ladder group by index.
 
-    If the Memory object ends up with no vertex groups after removal, the object
-    itself and its collection are also deleted.
+def add_memory_ladder(ladder_idx=1, ladder_obj=None):
+    """
+    Import ladder Memory and View Geometry LODs from bundled P3D assets.
+    ladder_idx (1-3) controls which prefix is used: ladder1, ladder2, ladder3.
+    Named selections from the P3D (always 'ladder1' prefix) are renamed to match
+    the requested index. Placement follows ladder_obj, or the target object.
+    """
+    ensure_object_mode()
+    if ladder_obj is None:
+        ladder_obj = bpy.context.scene.dgm_target_object
+
+    block = _ladder_memory_block(_ladder_frame(ladder_obj), ladder_idx)
+    if block is None:
+        return
+
+    # Replace any existing selections for this ladder slot
+    mem = _get_or_create_memory_object()
+    replace_memory_points(mem, ladder_point_names(ladder_idx), shared=block)
+
+    # --- View Geometry LOD ---
+    create_view_geometry_ladder(ladder_idx=ladder_idx, ladder_obj=ladder_obj)
+
+
+def add_all_ladders(collision=True, mass_per_stringer=20.0):
+    """
+    Memory points, View Geometry and (optionally) collision for every
+    DZ_Ladder_N in the scene in one pass: ladder N fills memory slot N. All
+    memory points go in with a single mesh rebuild, all collision boxes with
+    a single Geometry write, and the P3D assets are parsed once. Returns (number of ladders processed, skipped object names)
+    — see scene_ladders.
+    """
+    ladders, skipped = scene_ladders()
+    if not ladders:
+        return 0, skipped
+    ensure_object_mode()
+
+    remove, blocks, groups = [], [], {}
+    offset = 0
+    for idx, obj in ladders:
+        block = _ladder_memory_block(_ladder_frame(obj), idx)
+        if block is None:
+            return 0, skipped
+        cos, block_groups = block
+        remove.extend(ladder_point_names(idx))
+        blocks.append(cos)
+        groups.update({name: [offset + i for i in verts] for name, verts in block_groups.items()})
+        offset += len(cos)
+
+    mem = _get_or_create_memory_object()
+    replace_memory_points(mem, remove, shared=(np.concatenate(blocks), groups))
+
+    for idx, obj in ladders:
+        create_view_geometry_ladder(ladder_idx=idx, ladder_obj=obj)
+    if collision:
+        create_ladders_collision([obj for _idx, obj in ladders], mass_per_stringer)
+    return len(ladders), skipped
+
+
+def remove_memory_ladder(ladder_idx=1):
+    """Remove all memory points and View Geometry for a ladder group by index.
+
+    If the Memory object ends up with no vertex groups after removal, the object
+    itself and its collection are also deleted.
     """
     ensure_object_mode()
-    prefix = "ladder{}".format(ladder_idx)
-    point_names = [
-        prefix,
-        prefix + '_bottom_front',
-        prefix + '_con',
-        prefix + '_con_dir',
-        prefix + '_dir',
-        prefix + '_top_front',
-    ]
     mem = get_memory_object()
     if mem:
-        _remove_memory_groups(mem, point_names)
+        _remove_memory_groups(mem, ladder_point_names(ladder_idx))
         # If Memory object now has no vertex groups, remove it and the collection
         if len(mem.vertex_groups) == 0:
             bpy.data.objects.remove(mem, do_unlink=True)
@@ -1060,32 +1494,51 @@ def remove_memory_ladder(ladder_idx=1):
     remove_view_geometry_ladder(ladder_idx=ladder_idx)
 
 
-def _create_lod_from_p3d(filepath, obj_name, collection_name, lod_key):
+def _create_lod_from_p3d(asset_name, obj_name, collection_name, lod_key,
+                         scale=None, rename=None):
     """
-    Parse a P3D and create a Blender mesh object registered as a DayZ LOD.
-    Named selections are recreated as vertex groups.
+    Create a Blender mesh object from a registry P3D asset and register it
+    as a DayZ LOD. Named selections are recreated as vertex groups, renamed
+    through the optional rename dict. scale (x, y, z) is baked into the vertices.
     """
-    verts, faces, named_selections, _ = _parse_p3d_lod(filepath)
+    obj = _asset_object(assets.get(asset_name), obj_name, scale=scale, rename=rename)
+    set_dgm_props(obj, LOD_VALUES[lod_key])
+    assign_default_material(obj)
+    set_active(obj)
+    move_to_collection(obj, collection_name)
+    return obj
 
+
+def _asset_object(asset, obj_name, scale=None, rename=None):
+    """New object (linked to the scene) holding a copy of a registry asset's mesh."""
     mesh = bpy.data.meshes.new(obj_name)
-    mesh.from_pydata(verts, [], faces)
-    mesh.update()
+    assets.write_mesh(mesh, asset, scale=scale)
 
     obj = bpy.data.objects.new(obj_name, mesh)
     bpy.context.scene.collection.objects.link(obj)
+    add_selection_groups(obj, asset["selections"], rename)
+    return obj
 
-    for sel_name, sel_data in named_selections.items():
-        if not sel_name.isascii() or '\x01' in sel_name:
-            continue
-        vg = obj.vertex_groups.new(name=sel_name)
-        if sel_data['verts']:
-            vg.add(sel_data['verts'], 1.0, 'REPLACE')
 
-    set_dgm_props(obj, LOD_VALUES[lod_key])
-    assign_default_material(obj)
-    set_active(obj)
-    move_to_collection(obj, collection_name)
-    return obj
+def add_selection_groups(obj, selections, rename=None):
+    """Vertex groups on obj from decoded selections {name: vertex indices}."""
+    rename = rename or {}
+    for sel_name, indices in selections.items():
+        vg = obj.vertex_groups.new(name=rename.get(sel_name, sel_name))
+        if len(indices):
+            vg.add(indices.tolist(), 1.0, 'REPLACE')
+
+
+def lod_from_resolution(resolution):
+    """
+    (dgm_props.lod, lod_distance) for a P3D LOD resolution. Special LODs map
+    to their preset; visual LODs become Custom with the resolution as distance.
+    """
+    res = np.float32(resolution)
+    for value, _name, _desc in LOD_PRESETS:
+        if value != '-1.0' and np.float32(float(value)) == res:
+            return value, 1.0
+    return '-1.0', float(resolution)
 
 def _ladder_vg_obj_name(ladder_idx):
     """Canonical object name for a ladder View Geometry object."""
@@ -1110,77 +1563,50 @@ def _cleanup_empty_collection(col_name):
         bpy.data.collections.remove(col)
 
 
-def create_view_geometry_ladder(ladder_idx=1):
+def create_view_geometry_ladder(ladder_idx=1, ladder_obj=None):
     """Import the bundled ladder View Geometry P3D as a DayZ LOD object.
 
     The created object is named 'View Geometry.ladderN' so it can be found
     and deleted when the corresponding memory group is removed.
-    Each index is offset upward on Z to match the memory point placement.
-    The named selection 'Component01' is renamed to 'ladderN' to match the index.
+    It is placed on ladder_obj (default: the target object), like the memory points.
+    The named selections 'ladder1' / 'Component01' are renamed to match the index.
     """
     obj_name = _ladder_vg_obj_name(ladder_idx)
+    if ladder_obj is None:
+        ladder_obj = bpy.context.scene.dgm_target_object
+    frame = _ladder_frame(ladder_obj)
 
     # Remove any existing object for this slot first
     existing = bpy.data.objects.get(obj_name)
     if existing:
         bpy.data.objects.remove(existing, do_unlink=True)
 
+    # Scale view geometry Z to match actual last_rung_z.
+    # Asset view geometry height = 5.584 m (= 15 rungs * 0.320 + 0.340 + 0.700 - 0.320)
+    # We scale so the top of the view geometry aligns with actual total_height.
+    ASSET_VG_HEIGHT = 5.584   # view geometry P3D total height (Y range)
+    actual_height = frame["height"] or ASSET_VG_HEIGHT
+    vg_scale = actual_height / ASSET_VG_HEIGHT
+
     try:
         obj = _create_lod_from_p3d(
-            _assets_path("ladder_view_geometry.p3d"),
+            "ladder_view_geometry",
             obj_name=obj_name,
             collection_name="View Geometry",
             lod_key="View Geometry",
+            scale=(1.0, 1.0, vg_scale),
+            # P3D asset always uses 'ladder1' and 'Component01' — remap both.
+            rename={"ladder1": "ladder{}".format(ladder_idx),
+                    "Component01": "Component{:02d}".format(ladder_idx)},
         )
     except Exception as e:
         print(f"[DGM] Failed to load ladder View Geometry P3D: {e}")
         return None
 
-    if obj is not None:
-        # Align view geometry:
-        #   X/Y = target world bounding box centre
-        #   Z   = target min Z (no first-rung offset, no per-index offset)
-        import mathutils
-        target_obj = bpy.context.scene.dgm_target_object
-        if target_obj is not None:
-            world_corners = [target_obj.matrix_world @ mathutils.Vector(c)
-                             for c in target_obj.bound_box]
-            target_cx    = sum(c.x for c in world_corners) / 8.0
-            target_min_z = min(c.z for c in world_corners)
-            # Use stringer Y (local Y=0) — cage shifts the bounding box centre
-            target_cy    = (target_obj.matrix_world @ mathutils.Vector((0.0, 0.0, 0.0))).y
-        else:
-            target_cx, target_cy, target_min_z = 0.0, 0.0, 0.0
-        # Scale view geometry Z to match actual last_rung_z.
-        # Asset view geometry height = 5.584 m (= 15 rungs * 0.320 + 0.340 + 0.700 - 0.320)
-        # We scale so the top of the view geometry aligns with actual total_height.
-        ASSET_VG_HEIGHT = 5.584   # view geometry P3D total height (Y range)
-        if target_obj is not None and target_obj.get('dgm_ladder'):
-            rung_count2    = int(target_obj.get('dgm_ladder_rungs',   15))
-            rung_spacing2  = float(target_obj.get('dgm_p_rung_spacing',  0.320))
-            ground_offset2 = float(target_obj.get('dgm_p_ground_offset', 0.340))
-            top_ext2       = float(target_obj.get('dgm_p_top_extension', 0.700))
-            actual_height  = ground_offset2 + (rung_count2 - 1) * rung_spacing2 + top_ext2
-        else:
-            actual_height = ASSET_VG_HEIGHT
-        vg_scale = actual_height / ASSET_VG_HEIGHT if ASSET_VG_HEIGHT > 0 else 1.0
-        obj.scale = (1.0, 1.0, vg_scale)
-        bpy.ops.object.transform_apply(scale=True)
-
-        obj.location.x = target_cx
-        obj.location.y = target_cy
-        obj.location.z = target_min_z
-
-        # Rename vertex groups to match the requested ladder index.
-        # P3D asset always uses 'ladder1' and 'Component01' — remap both.
-        vg_ladder = obj.vertex_groups.get("ladder1")
-        if vg_ladder:
-            vg_ladder.name = "ladder{}".format(ladder_idx)
-
-        vg_comp = obj.vertex_groups.get("Component01")
-        if vg_comp:
-            vg_comp.name = "Component{:02d}".format(ladder_idx)
-
+    # Align view geometry:
+    #   X/Y = target world bounding box centre / stringer plane
+    #   Z   = target min Z (no first-rung offset, no per-index offset)
+    obj.location = (frame["cx"], frame["cy"], frame["min_z"])
     return obj
 
 
@@ -1194,23 +1620,17 @@ def remove_view_geometry_ladder(ladder_idx=1):
 
 
 def add_memory_lights(count=1):
-    import math
     b = _bbox_data()
     if not b:
         return
     mem = _get_or_create_memory_object()
     names = ['light_{}'.format(i) for i in range(1, count + 1)]
-    _remove_memory_groups(mem, names)
-    points = []
     r = (b['max_x'] - b['min_x']) * 0.35
-    for i, name in enumerate(names):
-        angle = (2 * math.pi / max(count, 1)) * i
-        points.append((name, (
-            b['cx'] + r * math.cos(angle),
-            b['cy'] + r * math.sin(angle),
-            b['max_z'],
-        )))
-    _add_memory_verts(mem, points)
+    angles = np.arange(count) * (2 * np.pi / max(count, 1))
+    cos = np.column_stack([b['cx'] + r * np.cos(angles),
+                           b['cy'] + r * np.sin(angles),
+                           np.full(count, b['max_z'])])
+    replace_memory_points(mem, names, list(zip(names, cos.tolist())))
 
 
 def add_memory_damage():
@@ -1224,20 +1644,223 @@ def add_memory_damage():
     ])
 
 
+# Door slots (door_N_axis_1/2) the panel and detectors handle
+MAX_DOORS = 8
+
+
 def add_memory_doors(count=1):
     b = _bbox_data()
     if not b:
         return
     mem = _get_or_create_memory_object()
     names = ['door_{}_axis_{}'.format(i, p) for i in range(1, count + 1) for p in (1, 2)]
-    _remove_memory_groups(mem, names)
     points = []
     for i in range(1, count + 1):
         points.extend([
             ('door_{}_axis_1'.format(i), (b['cx'], b['cy'], b['max_z'])),
             ('door_{}_axis_2'.format(i), (b['cx'], b['cy'], b['min_z'])),
         ])
-    _add_memory_verts(mem, points)
+    replace_memory_points(mem, names, points)
+
+
+# ---------------------------------------------------------------------------
+# Memory points from mesh features
+# ---------------------------------------------------------------------------
+
+# Vertex groups whose name starts with one of these are light selections
+LIGHT_GROUP_PREFIXES = ("light", "lamp", "svetlo")
+
+
+def _group_vertices(obj, group_indices):
+    """
+    {group index: vertex index array} for the requested vertex groups.
+    One pass over the bmesh deform layer collects (vertex, group) pairs with
+    a weight; the split per group is done in NumPy.
+    """
+    wanted = set(group_indices)
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    dl = bm.verts.layers.deform.active
+    pairs = []
+    if dl is not None:
+        pairs = [(v.index, gi) for v in bm.verts
+                 for gi, w in v[dl].items() if w > 0.0 and gi in wanted]
+    bm.free()
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    return {gi: pairs[pairs[:, 1] == gi, 0] for gi in wanted}
+
+
+def _material_is_emissive(mat):
+    """True if the material's node tree emits light."""
+    if mat is None or not mat.use_nodes or mat.node_tree is None:
+        return False
+    for node in mat.node_tree.nodes:
+        if node.type == 'EMISSION':
+            color, strength = node.inputs.get("Color"), node.inputs.get("Strength")
+        elif node.type == 'BSDF_PRINCIPLED':
+            color = node.inputs.get("Emission Color") or node.inputs.get("Emission")
+            strength = node.inputs.get("Emission Strength")
+        else:
+            continue
+        if color is None or strength is None:
+            continue
+        lit = color.is_linked or any(c > 0.0 for c in tuple(color.default_value)[:3])
+        if lit and (strength.is_linked or strength.default_value > 0.0):
+            return True
+    return False
+
+
+def _emissive_light_points(obj):
+    """
+    One point per connected patch of emissive faces: the area-weighted
+    centre of the patch in world space.
+    """
+    mesh = obj.data
+    emissive = [i for i, slot in enumerate(obj.material_slots)
+                if _material_is_emissive(slot.material)]
+    if not emissive or not len(mesh.polygons):
+        return []
+
+    n_polys = len(mesh.polygons)
+    mat_idx = np.empty(n_polys, dtype=np.int64)
+    mesh.polygons.foreach_get("material_index", mat_idx)
+    lit = np.isin(mat_idx, emissive)
+    if not lit.any():
+        return []
+
+    loop_start = np.empty(n_polys, dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(n_polys, dtype=np.int64)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+
+    # Edges of the lit faces: each loop to the next loop of its face
+    faces = np.nonzero(lit)[0]
+    face_of_loop = np.repeat(faces, loop_total[faces])
+    offsets = np.arange(len(face_of_loop)) - np.repeat(np.cumsum(loop_total[faces]) - loop_total[faces],
+                                                       loop_total[faces])
+    loops = loop_start[face_of_loop] + offsets
+    nxt = loop_start[face_of_loop] + (offsets + 1) % loop_total[face_of_loop]
+    a, b = loop_verts[loops], loop_verts[nxt]
+
+    # Connected components by min-label propagation with pointer jumping
+    labels = np.arange(len(mesh.vertices))
+    while True:
+        m = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, m)
+        np.minimum.at(new, b, m)
+        new = new[new]
+        if np.array_equal(new, labels):
+            break
+        labels = new
+
+    centers = np.empty(n_polys * 3)
+    mesh.polygons.foreach_get("center", centers)
+    areas = np.empty(n_polys)
+    mesh.polygons.foreach_get("area", areas)
+    centers = centers.reshape(-1, 3)[faces]
+    areas = np.maximum(areas[faces], 1e-12)
+
+    _, island = np.unique(labels[loop_verts[loop_start[faces]]], return_inverse=True)
+    weight = np.bincount(island, weights=areas)
+    local = np.stack([np.bincount(island, weights=centers[:, k] * areas) / weight
+                      for k in range(3)], axis=1)
+    wm = np.array(obj.matrix_world)
+    return (local @ wm[:3, :3].T + wm[:3, 3]).tolist()
+
+
+def detect_light_points(obj):
+    """
+    Light positions from the mesh: the centre of every light named selection
+    (vertex groups starting with LIGHT_GROUP_PREFIXES) or, if there are none,
+    of every patch of emissive faces.
+    """
+    groups = [vg for vg in obj.vertex_groups
+              if vg.name.lower().startswith(LIGHT_GROUP_PREFIXES)]
+    if groups:
+        co = _world_vertices(obj)
+        members = _group_vertices(obj, [vg.index for vg in groups])
+        return [co[members[vg.index]].mean(axis=0).tolist()
+                for vg in groups if len(members[vg.index])]
+    return _emissive_light_points(obj)
+
+
+def _door_hinge_axis(co):
+    """
+    (top, bottom) hinge axis points for the world space verts of one door
+    leaf. The leaf width runs along the main horizontal axis of its verts;
+    the hinge is taken on the end with more geometry (hinges, frame side).
+    """
+    if len(co) < 3:
+        return None
+    xy = co[:, :2]
+    mid = xy.mean(axis=0)
+    rel = xy - mid
+    _vals, vecs = np.linalg.eigh(rel.T @ rel)
+    u, w = vecs[:, 1], vecs[:, 0]
+    t = rel @ u
+    s = rel @ w
+    width = float(t.max() - t.min())
+    if width <= 1e-6:
+        return None
+    band = width * 0.1
+    near_lo = np.count_nonzero(t <= t.min() + band)
+    near_hi = np.count_nonzero(t >= t.max() - band)
+    t_hinge = t.min() if near_lo >= near_hi else t.max()
+    base = mid + u * t_hinge + w * (s.min() + s.max()) * 0.5
+    return ((float(base[0]), float(base[1]), float(co[:, 2].max())),
+            (float(base[0]), float(base[1]), float(co[:, 2].min())))
+
+
+def detect_door_axes(obj, group_names):
+    """Hinge axis (top, bottom) per door vertex group name; None where it can't be found."""
+    groups = [obj.vertex_groups.get(name) for name in group_names]
+    members = _group_vertices(obj, [vg.index for vg in groups if vg])
+    co = _world_vertices(obj)
+    return [_door_hinge_axis(co[members[vg.index]]) if vg else None for vg in groups]
+
+
+def add_memory_lights_from_mesh():
+    """Place light_N points on detected lights. Returns how many were placed."""
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj or original_obj.type != 'MESH':
+        return 0
+    points = detect_light_points(original_obj)
+    if not points:
+        return 0
+    mem = _get_or_create_memory_object()
+    stale = [name for name in memory_index() if name.startswith("light_")]
+    names = ['light_{}'.format(i) for i in range(1, len(points) + 1)]
+    replace_memory_points(mem, stale + names, list(zip(names, points)))
+    return len(points)
+
+
+def add_memory_doors_from_mesh(group_names):
+    """
+    Place door_N_axis_1/2 on the hinge edge of each door vertex group
+    (group_names[i] is door i + 1; empty names are skipped).
+    Returns the door numbers placed.
+    """
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj or original_obj.type != 'MESH':
+        return []
+    axes = detect_door_axes(original_obj, [n for n in group_names if n])
+    axes = iter(axes)
+    names, points, placed = [], [], []
+    for i, group_name in enumerate(group_names, 1):
+        if not group_name:
+            continue
+        axis = next(axes)
+        if axis is None:
+            continue
+        names += ['door_{}_axis_1'.format(i), 'door_{}_axis_2'.format(i)]
+        points += [('door_{}_axis_1'.format(i), axis[0]), ('door_{}_axis_2'.format(i), axis[1])]
+        placed.append(i)
+    if points:
+        replace_memory_points(_get_or_create_memory_object(), names, points)
+    return placed
 
 
 # ---------------------------------------------------------------------------
@@ -1266,6 +1889,50 @@ DECIMATE_RATIOS = {
 }
 
 
+def _lod_settings(scene):
+    """(enabled, lod_num, distance) for Resolution LODs 1-6."""
+    return [
+        (getattr(scene, "dgm_lod{}".format(i)), i,
+         getattr(scene, "dgm_lod{}_dist".format(i)))
+        for i in range(1, 7)
+    ]
+
+
+def _new_lod_object(original_obj, col, lod_num, distance):
+    """
+    Fresh copy of the source object as Resolution LOD lod_num, replacing any
+    previous one, with its own LOD-prefixed material copies.
+    """
+    # Name includes the source object name so multiple objects can each have
+    # their own LOD set without overwriting each other.
+    existing_name = "{}.LOD{}".format(original_obj.name, lod_num)
+
+    # Remove any existing LOD with this exact name (regenerate), and its
+    # mesh once nothing else uses it
+    old = bpy.data.objects.get(existing_name)
+    if old is not None:
+        old_mesh = old.data
+        bpy.data.objects.remove(old, do_unlink=True)
+        if old_mesh is not None and old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+
+    lod_obj = original_obj.copy()
+    lod_obj.data = original_obj.data.copy()
+    lod_obj.name = existing_name
+    col.objects.link(lod_obj)
+
+    set_dgm_props(lod_obj, "-1.0", lod_distance=float(distance))
+    clear_named_props(lod_obj)
+
+    if lod_num == 1:
+        add_named_prop(lod_obj, "forcenotalpha", "1")
+        add_named_prop(lod_obj, "LodNoShadow", "1")
+
+    _lod_materials(lod_obj, "LOD{}".format(lod_num))
+
+    return lod_obj
+
+
 def create_lod_meshes():
     """
     Resolution LODs: visible model at various view distances.
@@ -1281,49 +1948,15 @@ def create_lod_meshes():
     set_active(original_obj)
     scene = bpy.context.scene
 
-    lod_settings = [
-        (scene.dgm_lod1, 1, scene.dgm_lod1_dist),
-        (scene.dgm_lod2, 2, scene.dgm_lod2_dist),
-        (scene.dgm_lod3, 3, scene.dgm_lod3_dist),
-        (scene.dgm_lod4, 4, scene.dgm_lod4_dist),
-        (scene.dgm_lod5, 5, scene.dgm_lod5_dist),
-        (scene.dgm_lod6, 6, scene.dgm_lod6_dist),
-    ]
-
     col = get_or_create_collection("Resolution LODs")
 
-    for enabled, lod_num, distance in lod_settings:
+    for enabled, lod_num, distance in _lod_settings(scene):
         if not enabled:
             continue
 
         ensure_object_mode()
 
-        # Name includes the source object name so multiple objects can each have
-        # their own LOD set without overwriting each other.
-        existing_name = "{}.LOD{}".format(original_obj.name, lod_num)
-
-        # Remove any existing LOD with this exact name (regenerate)
-        if existing_name in bpy.data.objects:
-            bpy.data.objects.remove(bpy.data.objects[existing_name], do_unlink=True)
-
-        lod_obj = original_obj.copy()
-        lod_obj.data = original_obj.data.copy()
-        lod_obj.name = existing_name
-        col.objects.link(lod_obj)
-
-        set_dgm_props(lod_obj, "-1.0", lod_distance=float(distance))
-        clear_named_props(lod_obj)
-
-        if lod_num == 1:
-            add_named_prop(lod_obj, "forcenotalpha", "1")
-            add_named_prop(lod_obj, "LodNoShadow", "1")
-
-        # Copy and isolate materials per LOD
-        for slot in lod_obj.material_slots:
-            if slot.material:
-                new_mat = slot.material.copy()
-                new_mat.name = "LOD{}_{}".format(lod_num, slot.material.name)
-                slot.material = new_mat
+        lod_obj = _new_lod_object(original_obj, col, lod_num, distance)
 
         if lod_num == 1:
             # LOD1 is the full-detail copy — no decimation
@@ -1355,6 +1988,471 @@ def create_lod_meshes():
         bpy.ops.object.select_all(action='DESELECT')
 
 
+# ---------------------------------------------------------------------------
+# Resolution LOD chain (quadric error, triangle budgets)
+# ---------------------------------------------------------------------------
+
+# Auto budget for the last enabled LOD when no explicit budget is set
+LOD_CHAIN_LAST_TRIS = 500
+
+# Never simplify below a cube (12 tris)
+LOD_CHAIN_MIN_TRIS = 12
+
+
+def _mesh_to_arrays(mesh):
+    """
+    Flatten a mesh into the arrays mesh_simplify works on.
+    Returns (mesh_data, info): mesh_data holds the Simplifier keyword
+    arguments; info holds what write-back needs (UV layer names and vertex
+    group weights).
+
+    Named selections are vertex groups; every distinct combination of groups
+    becomes one vertex set, so selection boundaries survive decimation.
+    """
+    mesh.calc_loop_triangles()
+    n_tris = len(mesh.loop_triangles)
+    n_verts = len(mesh.vertices)
+    n_loops = len(mesh.loops)
+
+    co = np.empty(n_verts * 3)
+    mesh.vertices.foreach_get("co", co)
+
+    tris = np.empty(n_tris * 3, dtype=np.int64)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    tri_loops = np.empty(n_tris * 3, dtype=np.int64)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    tri_poly = np.empty(n_tris, dtype=np.int64)
+    mesh.loop_triangles.foreach_get("polygon_index", tri_poly)
+
+    uv_names = [layer.name for layer in mesh.uv_layers]
+    corner = np.zeros((n_tris * 3, 2 * len(uv_names)))
+    for i, layer in enumerate(mesh.uv_layers):
+        uv = np.empty(n_loops * 2)
+        layer.data.foreach_get("uv", uv)
+        corner[:, 2 * i:2 * i + 2] = uv.reshape(-1, 2)[tri_loops]
+
+    n_polys = len(mesh.polygons)
+    mat_idx = np.empty(n_polys, dtype=np.int64)
+    mesh.polygons.foreach_get("material_index", mat_idx)
+    smooth = np.empty(n_polys, dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+    face_attrs = np.stack([mat_idx[tri_poly], smooth[tri_poly].astype(np.int64)], axis=1)
+
+    n_edges = len(mesh.edges)
+    edge_verts = np.empty(n_edges * 2, dtype=np.int64)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    edge_verts = edge_verts.reshape(-1, 2)
+    sharp = np.empty(n_edges, dtype=bool)
+    mesh.edges.foreach_get("use_edge_sharp", sharp)
+    seam = np.empty(n_edges, dtype=bool)
+    mesh.edges.foreach_get("use_seam", seam)
+
+    set_ids = {}
+    vertex_sets = np.empty(n_verts, dtype=np.int64)
+    weights = {}
+    for v in mesh.vertices:
+        groups = tuple(sorted(g.group for g in v.groups))
+        vertex_sets[v.index] = set_ids.setdefault(groups, len(set_ids))
+        for g in v.groups:
+            weights.setdefault(g.group, []).append((v.index, g.weight))
+
+    mesh_data = {
+        "co": co.reshape(-1, 3),
+        "tris": tris.reshape(-1, 3),
+        "corner_attrs": corner.reshape(n_tris, 3, -1),
+        "face_attrs": face_attrs,
+        "vertex_sets": vertex_sets,
+        "feature_edges": edge_verts[sharp | seam],
+        "edge_sets": {"sharp": edge_verts[sharp], "seam": edge_verts[seam]},
+    }
+    info = {"uv_names": uv_names, "weights": weights}
+    return mesh_data, info
+
+
+def _arrays_to_mesh(obj, level, info):
+    """
+    Replace obj's mesh geometry with a simplified level (triangles only).
+    Materials stay on the mesh; vertex group weights, UVs, smooth flags,
+    sharp edges and seams are carried over from the source.
+    """
+    mesh = obj.data
+    # Group names live on the mesh, so note them before clearing it
+    group_names = [vg.name for vg in obj.vertex_groups]
+    mesh.clear_geometry()
+
+    co = level["co"]
+    tris = level["tris"]
+    n_tris = len(tris)
+
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(n_tris * 3)
+    mesh.loops.foreach_set("vertex_index", tris.ravel())
+    mesh.polygons.add(n_tris)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, n_tris * 3, 3))
+    mesh.polygons.foreach_set("material_index", level["face_attrs"][:, 0])
+    mesh.polygons.foreach_set("use_smooth", level["face_attrs"][:, 1].astype(bool))
+
+    corner = level["corner_attrs"].reshape(n_tris * 3, -1)
+    for i, name in enumerate(info["uv_names"]):
+        layer = mesh.uv_layers.new(name=name)
+        layer.data.foreach_set("uv", corner[:, 2 * i:2 * i + 2].ravel())
+
+    mesh.update(calc_edges=True)
+
+    # Edge flags: look each carried edge up by its sorted vertex pair
+    n_verts = len(co)
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    edge_verts = np.sort(edge_verts.reshape(-1, 2), axis=1)
+    edge_keys = edge_verts[:, 0] * n_verts + edge_verts[:, 1]
+    order = np.argsort(edge_keys)
+    for attr, name in (("use_edge_sharp", "sharp"), ("use_seam", "seam")):
+        pairs = np.sort(level["edge_sets"][name], axis=1)
+        flags = np.zeros(len(mesh.edges), dtype=bool)
+        if len(pairs) and len(order):
+            keys = pairs[:, 0] * n_verts + pairs[:, 1]
+            at = np.clip(np.searchsorted(edge_keys, keys, sorter=order), 0, len(order) - 1)
+            hit = order[at]
+            flags[hit[edge_keys[hit] == keys]] = True
+        mesh.edges.foreach_set(attr, flags)
+
+    # Vertex group weights, mapped through the surviving source vertices
+    new_index = np.full(int(level["vertex_source"].max(initial=-1)) + 1, -1, dtype=np.int64)
+    new_index[level["vertex_source"]] = np.arange(len(level["vertex_source"]))
+    for group_idx, entries in info["weights"].items():
+        if group_idx >= len(group_names):
+            continue
+        name = group_names[group_idx]
+        vg = obj.vertex_groups.get(name) or obj.vertex_groups.new(name=name)
+        by_weight = {}
+        for src, weight in entries:
+            if src < len(new_index) and new_index[src] >= 0:
+                by_weight.setdefault(weight, []).append(int(new_index[src]))
+        for weight, verts in by_weight.items():
+            vg.add(verts, weight, 'REPLACE')
+
+    mesh.update()
+
+
+def _lod_chain_budgets(scene, lod_nums, source_tris):
+    """
+    Triangle budget per decimated LOD. Explicit dgm_lod{n}_tris values win;
+    the rest follow a geometric curve from the source down to
+    LOD_CHAIN_LAST_TRIS at the last LOD. Budgets never increase along the
+    chain and never drop below a cube.
+    """
+    last = max(min(LOD_CHAIN_LAST_TRIS, source_tris), LOD_CHAIN_MIN_TRIS)
+    budgets = []
+    prev = source_tris
+    for step, lod_num in enumerate(lod_nums, 1):
+        budget = getattr(scene, "dgm_lod{}_tris".format(lod_num), 0)
+        if budget <= 0:
+            budget = int(round(source_tris * (last / max(source_tris, 1)) ** (step / len(lod_nums))))
+        budget = max(min(budget, prev), LOD_CHAIN_MIN_TRIS)
+        budgets.append(budget)
+        prev = budget
+    return budgets
+
+
+def _store_lod_metrics(obj, tris, budget, error_max, error_mean, source_tris):
+    obj["dgm_lod_tris"] = int(tris)
+    obj["dgm_lod_budget"] = int(budget)
+    obj["dgm_lod_error_max"] = float(error_max)
+    obj["dgm_lod_error_mean"] = float(error_mean)
+    obj["dgm_lod_source_tris"] = int(source_tris)
+
+
+def create_lod_chain():
+    """
+    Resolution LODs built as one progressive chain: every LOD is simplified
+    from the previous one (quadric error edge collapse, see mesh_simplify)
+    down to a triangle budget. UV seams, sharp edges, material borders and
+    named-selection boundaries are kept. LOD objects get their triangle
+    count, budget and error (model units, max / mean) as custom properties.
+    Returns the LOD objects created.
+    """
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj:
+        return []
+
+    ensure_object_mode()
+    set_active(original_obj)
+    scene = bpy.context.scene
+
+    enabled = [(lod_num, distance) for on, lod_num, distance in _lod_settings(scene) if on]
+    if not enabled:
+        return []
+
+    mesh_data, info = _mesh_to_arrays(original_obj.data)
+    source_tris = len(mesh_data["tris"])
+    decimated = [lod_num for lod_num, _ in enabled if lod_num > 1]
+    budgets = _lod_chain_budgets(scene, decimated, source_tris)
+    levels = dict(zip(decimated, mesh_simplify.simplify_levels(mesh_data, budgets)))
+    budgets = dict(zip(decimated, budgets))
+
+    col = get_or_create_collection("Resolution LODs")
+    created = []
+    for lod_num, distance in enabled:
+        lod_obj = _new_lod_object(original_obj, col, lod_num, distance)
+        created.append(lod_obj)
+
+        if lod_num == 1:
+            # LOD1 is the full-detail copy — no decimation
+            _store_lod_metrics(lod_obj, source_tris, source_tris, 0.0, 0.0, source_tris)
+            continue
+
+        _finish_lod_level(lod_obj, lod_num, levels[lod_num], info,
+                          budgets[lod_num], source_tris)
+
+    return created
+
+
+def create_ladder_lods():
+    """
+    Resolution LODs for a generated ladder (the target is a confirmed
+    DZ_Ladder_N). Each enabled LOD is rebuilt from the stored ladder
+    parameters at lower detail instead of being decimated: fewer tube
+    segments, coarser and fewer cage hoops, box rungs on the last LOD (see
+    ladder_generator.ladder_lod_params). All levels are built first and then
+    written in one pass. Returns the LOD objects created.
+    """
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj:
+        return []
+
+    ensure_object_mode()
+    scene = bpy.context.scene
+
+    enabled = [(lod_num, distance) for on, lod_num, distance in _lod_settings(scene) if on]
+    if not enabled:
+        return []
+
+    params = ladder_generator.stored_ladder_params(original_obj)
+    levels = ladder_generator.build_ladder_lods(params, len(enabled))
+    source_tris = ladder_generator.mesh_tris(levels[0][0])
+    source_segs = max(4, int(params['resolution']))
+    radius = float(params['tube_diameter']) / 2.0
+
+    col = get_or_create_collection("Resolution LODs")
+    created = []
+    for (lod_num, distance), (data, lod_params) in zip(enabled, levels):
+        lod_obj = _new_lod_object(original_obj, col, lod_num, distance)
+        ladder_generator.write_ladder_mesh(lod_obj.data, data)
+        lod_obj['dgm_ladder_layout'] = json.dumps(data['layout'])
+
+        # Deviation from LOD 1 = growth of the tube polygon's sagitta
+        segs = max(4, int(lod_params['resolution']))
+        error = radius * (np.cos(np.pi / source_segs) - np.cos(np.pi / segs))
+        tris = ladder_generator.mesh_tris(data)
+        _store_lod_metrics(lod_obj, tris, tris, error, error, source_tris)
+        created.append(lod_obj)
+
+    return created
+
+
+# ---------------------------------------------------------------------------
+# Resolution LODs in background worker processes
+# ---------------------------------------------------------------------------
+
+# Running LOD builds, keyed by source object name:
+#   {"workdir", "info", "source_tris", "source_state", "queue": [job], "running": [job]}
+# job = {"lod_num", "distance", "budget", "result", "log", "proc"}
+_lod_builds = {}
+
+# How often the main thread checks on the workers (seconds)
+_LOD_POLL_INTERVAL = 0.25
+
+
+def _lod_worker_count():
+    """Worker processes to run at once — leave one core for Blender."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def lod_builds_pending():
+    """Number of LOD levels still queued or building in the background."""
+    return sum(len(b["queue"]) + len(b["running"]) for b in _lod_builds.values())
+
+
+def cancel_lod_build(source_name):
+    """
+    Stop a running background build for source_name and clean up. The poll
+    timer stops on its own once no builds are left.
+    """
+    build = _lod_builds.pop(source_name, None)
+    if build is None:
+        return
+    for job in build["running"]:
+        if job["proc"].poll() is None:
+            job["proc"].kill()
+            job["proc"].wait()
+    shutil.rmtree(build["workdir"], ignore_errors=True)
+
+
+def cancel_all_lod_builds():
+    """Stop every background build and the poll timer (unregister, file load)."""
+    for source_name in list(_lod_builds):
+        cancel_lod_build(source_name)
+    if bpy.app.timers.is_registered(_poll_lod_builds):
+        bpy.app.timers.unregister(_poll_lod_builds)
+
+
+@bpy.app.handlers.persistent
+def _lod_load_post(*_args):
+    # Workers from the previous file must not write into the new one
+    cancel_all_lod_builds()
+
+
+def _lod_source_state(obj):
+    """
+    What a background build's arrays were extracted from: the object and
+    mesh pointers, world matrix, face count and a hash of the vertices.
+    Results are only written back while this is unchanged.
+    """
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", co)
+    return (obj.as_pointer(), mesh.as_pointer(),
+            tuple(v for row in obj.matrix_world for v in row),
+            len(mesh.polygons), bounds.points_hash(co))
+
+
+def _finish_lod_level(lod_obj, lod_num, level, info, budget, source_tris):
+    """Write a simplified level into lod_obj and record its metrics."""
+    _arrays_to_mesh(lod_obj, level, info)
+    _store_lod_metrics(lod_obj, level["tris_count"], budget,
+                       level["error_max"], level["error_mean"], source_tris)
+    print("[DGM] {}: {} tris (budget {}), error max {:.4f} mean {:.4f}".format(
+        lod_obj.name, level["tris_count"], budget,
+        level["error_max"], level["error_mean"]))
+
+    if lod_num >= 4 and len(lod_obj.data.materials) > 1:
+        assign_default_material(lod_obj)
+
+
+def _start_lod_job(build, job):
+    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+    with open(job["log"], "wb") as log:
+        job["proc"] = subprocess.Popen(
+            [sys.executable, mesh_simplify.__file__,
+             os.path.join(build["workdir"], "source.npz"), job["result"], str(job["budget"])],
+            stdout=subprocess.DEVNULL, stderr=log, creationflags=flags,
+        )
+    build["running"].append(job)
+
+
+def _poll_lod_builds():
+    """Timer: collect finished workers, write their LODs, start queued ones."""
+    for source_name in list(_lod_builds):
+        build = _lod_builds[source_name]
+        original_obj = bpy.data.objects.get(source_name)
+        if original_obj is None:
+            cancel_lod_build(source_name)
+            continue
+
+        for job in list(build["running"]):
+            rc = job["proc"].poll()
+            if rc is None:
+                continue
+            build["running"].remove(job)
+            if _lod_source_state(original_obj) != build["source_state"]:
+                print("[DGM] {} changed during its LOD build — results discarded".format(source_name))
+                cancel_lod_build(source_name)
+                break
+            if rc != 0 or not os.path.exists(job["result"]):
+                with open(job["log"], "rb") as log:
+                    err = log.read().decode(errors="replace").strip()
+                print("[DGM] LOD{} build failed for {}: {}".format(
+                    job["lod_num"], source_name, err or "exit code {}".format(rc)))
+                continue
+            level = mesh_simplify.load_levels(job["result"])[0]
+            col = get_or_create_collection("Resolution LODs")
+            lod_obj = _new_lod_object(original_obj, col, job["lod_num"], job["distance"])
+            _finish_lod_level(lod_obj, job["lod_num"], level, build["info"],
+                              job["budget"], build["source_tris"])
+
+        if source_name not in _lod_builds:
+            continue
+        while build["queue"] and len(build["running"]) < _lod_worker_count():
+            _start_lod_job(build, build["queue"].pop(0))
+
+        if not build["running"]:
+            _lod_builds.pop(source_name)
+            shutil.rmtree(build["workdir"], ignore_errors=True)
+
+    _redraw_view3d()
+    return _LOD_POLL_INTERVAL if _lod_builds else None
+
+
+def _redraw_view3d():
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    except Exception:
+        pass
+
+
+def create_lod_parallel():
+    """
+    Resolution LODs built concurrently: mesh arrays are extracted once, then
+    every LOD level is simplified from the source to its triangle budget in
+    its own worker process (mesh_simplify run as a script) while Blender
+    stays responsive. Finished levels are written back with foreach_set as
+    they come in. LOD1 is created immediately.
+    Returns the number of levels queued.
+    """
+    original_obj = bpy.context.scene.dgm_target_object
+    if not original_obj:
+        return 0
+
+    ensure_object_mode()
+    set_active(original_obj)
+    scene = bpy.context.scene
+
+    enabled = [(lod_num, distance) for on, lod_num, distance in _lod_settings(scene) if on]
+    if not enabled:
+        return 0
+
+    cancel_lod_build(original_obj.name)
+
+    mesh_data, info = _mesh_to_arrays(original_obj.data)
+    source_tris = len(mesh_data["tris"])
+    decimated = [(lod_num, distance) for lod_num, distance in enabled if lod_num > 1]
+    budgets = _lod_chain_budgets(scene, [lod_num for lod_num, _ in decimated], source_tris)
+
+    col = get_or_create_collection("Resolution LODs")
+    if enabled[0][0] == 1:
+        lod_obj = _new_lod_object(original_obj, col, 1, enabled[0][1])
+        _store_lod_metrics(lod_obj, source_tris, source_tris, 0.0, 0.0, source_tris)
+    if not decimated:
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix="dgm_lod_")
+    mesh_simplify.save_source(os.path.join(workdir, "source.npz"), mesh_data)
+    build = {
+        "workdir": workdir,
+        "info": info,
+        "source_tris": source_tris,
+        "source_state": _lod_source_state(original_obj),
+        "running": [],
+        "queue": [
+            {"lod_num": lod_num, "distance": distance, "budget": budget, "proc": None,
+             "result": os.path.join(workdir, "lod{}.npz".format(lod_num)),
+             "log": os.path.join(workdir, "lod{}.log".format(lod_num))}
+            for (lod_num, distance), budget in zip(decimated, budgets)
+        ],
+    }
+    _lod_builds[original_obj.name] = build
+    while build["queue"] and len(build["running"]) < _lod_worker_count():
+        _start_lod_job(build, build["queue"].pop(0))
+
+    if not bpy.app.timers.is_registered(_poll_lod_builds):
+        bpy.app.timers.register(_poll_lod_builds, first_interval=_LOD_POLL_INTERVAL)
+    return len(decimated)
+
+
 # ---------------------------------------------------------------------------
 # View Pilot / Gunner / Cargo
 # ---------------------------------------------------------------------------
@@ -1379,11 +2477,7 @@ def create_view_interior(lod_type="View Pilot"):
     lod_val = LOD_VALUES.get(lod_type, "1.100e+3")
     set_dgm_props(interior, lod_val)
 
-    for slot in interior.material_slots:
-        if slot.material:
-            new_mat = slot.material.copy()
-            new_mat.name = "{}_{}".format(lod_type.replace(" ", ""), slot.material.name)
-            slot.material = new_mat
+    _lod_materials(interior, lod_type.replace(" ", ""))
 
     move_to_collection(interior, lod_type)
     return interior
@@ -1393,29 +2487,59 @@ def create_view_interior(lod_type="View Pilot"):
 # Land Contact LOD
 # ---------------------------------------------------------------------------
 
-def create_land_contact():
+def _world_vertices(obj):
+    """(N,3) world space vertex positions of a mesh object."""
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    wm = np.array(obj.matrix_world)
+    return co @ wm[:3, :3].T + wm[:3, 3]
+
+
+def object_bounds(obj, kind, count=None):
+    """
+    Bounding volume of a mesh object's world space vertices — kind is one of
+    bounds.cached_fit's fits ("obb", "obb_upright", "sphere", "boxes" with
+    count, ...). Cached per vertex hash, so unchanged meshes are only fitted
+    once.
+    """
+    return bounds.cached_fit(_world_vertices(obj), kind, count=count)
+
+
+def create_land_contact(count=4, tolerance=0.05):
     """
     Land Contact LOD: single vertex per ground contact point.
     Wiki: defines where the object touches the ground.
+
+    The mesh's lowest vertices (within `tolerance` of the lowest point) are
+    projected onto the ground plane and `count` corners of their 2D convex
+    hull spanning the largest support polygon become the contact points.
+    Falls back to the four base corners of the bounding box for non-mesh
+    targets.
     """
     original_obj = bpy.context.scene.dgm_target_object
     if not original_obj:
         return
 
-    min_x, max_x, min_y, max_y, min_z, max_z = get_bbox(original_obj)
-    cx = (max_x + min_x) / 2
-    cy = (max_y + min_y) / 2
+    contact_points = []
+    if original_obj.type == 'MESH' and len(original_obj.data.vertices):
+        contact_points = bounds.land_contact_points(
+            _world_vertices(original_obj), count, tolerance).tolist()
+
+    if not contact_points:
+        min_x, max_x, min_y, max_y, min_z, max_z = get_bbox(original_obj)
+        # Four ground contact points at corners of base
+        contact_points = [
+            (min_x, min_y, min_z),
+            (max_x, min_y, min_z),
+            (max_x, max_y, min_z),
+            (min_x, max_y, min_z),
+        ]
 
     mesh = bpy.data.meshes.new("Land Contact")
     lc_obj = bpy.data.objects.new("Land Contact", mesh)
 
-    # Four ground contact points at corners of base
-    contact_points = [
-        (min_x, min_y, min_z),
-        (max_x, min_y, min_z),
-        (max_x, max_y, min_z),
-        (min_x, max_y, min_z),
-    ]
     mesh.vertices.add(len(contact_points))
     mesh.vertices.foreach_set("co", [c for v in contact_points for c in v])
     mesh.update()
@@ -1520,3 +2644,251 @@ def create_roadway():
     assign_default_material(rw_obj)
     move_to_collection(rw_obj, "Roadway")
     return rw_obj
+
+
+# ---------------------------------------------------------------------------
+# Cabin asset — every LOD from the cabin generator's layout
+# ---------------------------------------------------------------------------
+
+def _cabin_world(cabin_obj, co):
+    """Object space points of cabin_obj in world space."""
+    m = np.array(cabin_obj.matrix_world)
+    return np.asarray(co, dtype=np.float64) @ m[:3, :3].T + m[:3, 3]
+
+
+def _cabin_parts(cabin_obj, role):
+    """Objects previously generated for cabin_obj with the given role."""
+    return [o for o in bpy.data.objects
+            if o.get('dgm_cabin_part') == cabin_obj.name and o.get('dgm_cabin_role') == role]
+
+
+def _remove_cabin_parts(cabin_obj, role):
+    """Delete cabin_obj's generated objects of one role, freeing their components."""
+    for o in _cabin_parts(cabin_obj, role):
+        if role == "geometry":
+            free_components([vg.name for vg in o.vertex_groups if vg.name.startswith("Component")])
+        mesh = o.data
+        bpy.data.objects.remove(o, do_unlink=True)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def _finish_cabin_part(obj, cabin_obj, role, lod_key, col_name, mass=0.0):
+    set_dgm_props(obj, LOD_VALUES[lod_key], mass=mass)
+    assign_default_material(obj)
+    move_to_collection(obj, col_name)
+    obj['dgm_cabin_part'] = cabin_obj.name
+    obj['dgm_cabin_role'] = role
+
+
+def _next_collection_component(col_name):
+    """First ComponentXX index above every one used in a collection."""
+    col = bpy.data.collections.get(col_name)
+    top = 0
+    for o in (col.objects if col else ()):
+        for vg in o.vertex_groups:
+            if vg.name.startswith("Component"):
+                try:
+                    top = max(top, int(vg.name[9:]))
+                except ValueError:
+                    pass
+    return top + 1
+
+
+def create_cabin_geometry(cabin_obj, mass=1000.0):
+    """
+    Geometry LOD for a generated cabin: one convex ComponentXX object per
+    wall segment, plus the floor and roof, straight from the cabin layout.
+    Mass is split by part volume. Replaces the cabin's previous components.
+    Returns the created objects.
+    """
+    _remove_cabin_parts(cabin_obj, "geometry")
+    layout = cabin_generator.cabin_layout(cabin_generator.stored_cabin_params(cabin_obj))
+    parts = cabin_generator.cabin_convex_parts(layout)
+    volumes = np.array([max(cabin_generator.part_volume(co, faces), 1e-9)
+                        for _role, co, faces in parts])
+    masses = mass * volumes / volumes.sum()
+
+    created = []
+    for (_role, co, faces), part_mass, idx in zip(parts, masses, allocate_components(len(parts))):
+        comp_name = "Component{:02d}".format(idx)
+        obj = _parts_object("Geometry_{}".format(comp_name),
+                            [(_cabin_world(cabin_obj, co), faces)], [comp_name])
+        add_fhq_weights(obj, weight=part_mass / max(len(obj.data.vertices), 1))
+        _finish_cabin_part(obj, cabin_obj, "geometry", "Geometry", "Geometry", float(part_mass))
+        clear_named_props(obj)
+        add_named_prop(obj, "autocenter", "0")
+        add_named_prop(obj, "canbeoccluded", "1")
+        add_named_prop(obj, "canocclude", "0")
+        created.append(obj)
+    return created
+
+
+def create_cabin_view_geometry(cabin_obj):
+    """
+    View Geometry for a generated cabin: the same convex parts as its
+    Geometry in one object, so AI can see through the door and windows.
+    """
+    _remove_cabin_parts(cabin_obj, "view")
+    layout = cabin_generator.cabin_layout(cabin_generator.stored_cabin_params(cabin_obj))
+    parts = cabin_generator.cabin_convex_parts(layout)
+    first = _next_collection_component("View Geometry")
+    obj = _parts_object("View Geometry_{}".format(cabin_obj.name),
+                        [(_cabin_world(cabin_obj, co), faces) for _role, co, faces in parts],
+                        ["Component{:02d}".format(first + i) for i in range(len(parts))],
+                        origin=cabin_obj.matrix_world.translation)
+    _finish_cabin_part(obj, cabin_obj, "view", "View Geometry", "View Geometry")
+    return obj
+
+
+def create_cabin_roadway(cabin_obj):
+    """Roadway for a generated cabin: the floor inside the walls and the door threshold."""
+    _remove_cabin_parts(cabin_obj, "roadway")
+    layout = cabin_generator.cabin_layout(cabin_generator.stored_cabin_params(cabin_obj))
+    co, faces = cabin_generator.cabin_roadway(layout)
+    obj = _parts_object("Roadway_{}".format(cabin_obj.name),
+                        [(_cabin_world(cabin_obj, co), faces)], [],
+                        origin=cabin_obj.matrix_world.translation)
+    _finish_cabin_part(obj, cabin_obj, "roadway", "Roadway", "Roadway")
+    return obj
+
+
+def add_memory_cabin_door(cabin_obj):
+    """
+    door_N_axis_1 / door_N_axis_2 on the hinge of the cabin's front door.
+    The cabin keeps its door number (dgm_cabin_door); a new cabin takes the
+    first free one. Returns the door number, or None when all MAX_DOORS are taken.
+    """
+    mem = _get_or_create_memory_object()
+    door = cabin_obj.get('dgm_cabin_door')
+    if not door:
+        used = memory_index()
+        door = next((i for i in range(1, MAX_DOORS + 1)
+                     if 'door_{}_axis_1'.format(i) not in used), None)
+        if door is None:
+            return None
+
+    layout = cabin_generator.cabin_layout(cabin_generator.stored_cabin_params(cabin_obj))
+    top, bottom = _cabin_world(cabin_obj, cabin_generator.cabin_door_axis(layout)).tolist()
+    names = ['door_{}_axis_1'.format(door), 'door_{}_axis_2'.format(door)]
+    replace_memory_points(mem, names, list(zip(names, (top, bottom))))
+    cabin_obj['dgm_cabin_door'] = door
+    return door
+
+
+def create_cabin_lods(cabin_obj=None, enabled=None):
+    """
+    Resolution LODs for a generated cabin (the LOD target by default),
+    rebuilt from its stored parameters: windows are filled in from the
+    second enabled LOD, the door from the third. enabled overrides the
+    scene's LOD settings as [(lod_num, distance)]. Returns the LOD objects.
+    """
+    cabin_obj = cabin_obj or bpy.context.scene.dgm_target_object
+    if not cabin_obj:
+        return []
+
+    ensure_object_mode()
+    scene = bpy.context.scene
+    if enabled is None:
+        enabled = [(lod_num, distance) for on, lod_num, distance in _lod_settings(scene) if on]
+    if not enabled:
+        return []
+
+    # LODs from an earlier run that the current settings no longer enable go too
+    _remove_cabin_parts(cabin_obj, "lod")
+
+    params = cabin_generator.stored_cabin_params(cabin_obj)
+    levels = [cabin_generator.build_cabin_arrays(params, lod=step) for step in range(len(enabled))]
+    source_tris = cabin_generator.mesh_tris(levels[0][0])
+
+    col = get_or_create_collection("Resolution LODs")
+    created = []
+    for (lod_num, distance), result in zip(enabled, levels):
+        lod_obj = _new_lod_object(cabin_obj, col, lod_num, distance)
+        cabin_generator.write_cabin_mesh(lod_obj.data, result)
+        tris = cabin_generator.mesh_tris(result[0])
+        _store_lod_metrics(lod_obj, tris, tris, 0.0, 0.0, source_tris)
+        lod_obj['dgm_cabin_part'] = cabin_obj.name
+        lod_obj['dgm_cabin_role'] = "lod"
+        created.append(lod_obj)
+    return created
+
+
+def create_cabin_asset(cabin_obj, mass=1000.0, lods=True, geometry=True,
+                       view=True, roadway=True, door=True):
+    """
+    Every LOD of a generated cabin from one parameter set: Resolution LODs,
+    Geometry, View Geometry, Roadway and the door axis memory points.
+    Earlier generated parts of the same cabin are replaced.
+    Returns {"lods", "geometry", "view", "roadway", "door"}.
+    """
+    ensure_object_mode()
+    result = {"lods": [], "geometry": [], "view": None, "roadway": None, "door": None}
+    if lods:
+        result["lods"] = create_cabin_lods(cabin_obj)
+    if geometry:
+        result["geometry"] = create_cabin_geometry(cabin_obj, mass)
+    if view:
+        result["view"] = create_cabin_view_geometry(cabin_obj)
+    if roadway:
+        result["roadway"] = create_cabin_roadway(cabin_obj)
+    if door:
+        result["door"] = add_memory_cabin_door(cabin_obj)
+    set_active(cabin_obj)
+    return result
+
+
+def refresh_cabin_asset(cabin_obj):
+    """
+    Regenerate the parts a cabin already has (after its parameters changed).
+    Geometry keeps its total mass. Resolution LODs are left to Create LODs.
+    """
+    roles = {o.get('dgm_cabin_role') for o in bpy.data.objects
+             if o.get('dgm_cabin_part') == cabin_obj.name}
+    door = bool(cabin_obj.get('dgm_cabin_door'))
+    if not roles and not door:
+        return None
+    mass = sum(o.dgm_props.mass for o in _cabin_parts(cabin_obj, "geometry")) or 1000.0
+    return create_cabin_asset(cabin_obj, mass=mass, lods=False,
+                              geometry="geometry" in roles, view="view" in roles,
+                              roadway="roadway" in roles, door=door)
+
+
+def _cabin_memory_object(cabin_obj):
+    """
+    Standalone Memory LOD with the cabin's door axis as door_1_axis_1/2,
+    for exporting the cabin on its own (kept out of the Memory collection).
+    """
+    _remove_cabin_parts(cabin_obj, "memory")
+    layout = cabin_generator.cabin_layout(cabin_generator.stored_cabin_params(cabin_obj))
+    top, bottom = _cabin_world(cabin_obj, cabin_generator.cabin_door_axis(layout)).tolist()
+    name = "Memory_{}".format(cabin_obj.name)
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([top, bottom], [], [])
+    mesh.update()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.vertex_groups.new(name="door_1_axis_1").add([0], 1.0, 'REPLACE')
+    obj.vertex_groups.new(name="door_1_axis_2").add([1], 1.0, 'REPLACE')
+    set_dgm_props(obj, LOD_VALUES["Memory"])
+    obj['dgm_cabin_part'] = cabin_obj.name
+    obj['dgm_cabin_role'] = "memory"
+    return obj
+
+
+def cabin_export_objects(cabin_obj, mass=1000.0):
+    """
+    Every LOD object of one cabin for a P3D of its own: Resolution LODs (the
+    enabled LOD settings, or LOD 1 alone), Geometry, View Geometry, Roadway
+    and a Memory LOD with the door axis. Remove them with remove_cabin_asset().
+    """
+    lods = create_cabin_lods(cabin_obj) or create_cabin_lods(cabin_obj, enabled=[(1, 1.0)])
+    return (lods + create_cabin_geometry(cabin_obj, mass)
+            + [create_cabin_view_geometry(cabin_obj), create_cabin_roadway(cabin_obj),
+               _cabin_memory_object(cabin_obj)])
+
+
+def remove_cabin_asset(cabin_obj):
+    """Delete everything generated for a cabin (LODs, helper LODs, export memory)."""
+    for role in ("lod", "geometry", "view", "roadway", "memory"):
+        _remove_cabin_parts(cabin_obj, role)
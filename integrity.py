@@ -0,0 +1,180 @@
+"""
+DayZ Geometry Maker - Generator Integrity
+Cheap checks that a generated ladder or cabin still matches what was built.
+
+When a generator commits a mesh it stores a signature on the object: vertex /
+face counts, the local bounding box, a hash of the vertex coordinates and face
+loops, and a hash of the build parameters. check() compares the object
+against it with foreach_get reads only (no mesh is rebuilt) and tells which
+of scale, topology, shape or parameters diverged. Results are cached per
+object until its geometry changes, so panel redraws cost a dict lookup.
+"""
+
+import hashlib
+import json
+
+import bpy
+import numpy as np
+
+from . import preview
+
+
+# Custom property holding the signature (JSON)
+SIGNATURE_PROP = "dgm_integrity"
+
+# Bounding box tolerance (m)
+_BBOX_TOL = 0.0005
+
+_results = {}   # object pointer -> (cache key, result)
+
+
+# ---------------------------------------------------------------------------
+# Signatures
+# ---------------------------------------------------------------------------
+
+def params_hash(params):
+    """Short hash of a build parameter dict (floats rounded like the preview cache)."""
+    return hashlib.blake2b(repr(preview.params_key(params)).encode(), digest_size=8).hexdigest()
+
+
+def _mesh_arrays(mesh):
+    """(co (N, 3) float32, loop vertex indices, loop totals) through foreach_get."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops)
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", totals)
+    return co.reshape(-1, 3), loops, totals
+
+
+def _bbox(co):
+    if not len(co):
+        return [0.0] * 3, [0.0] * 3
+    return co.min(axis=0).tolist(), co.max(axis=0).tolist()
+
+
+def mesh_signature(mesh):
+    """Signature dict of a mesh: counts, local bounding box and geometry hash."""
+    co, loops, totals = _mesh_arrays(mesh)
+    h = hashlib.blake2b(digest_size=16)
+    for array in (co, loops, totals):
+        h.update(array.tobytes())
+    lo, hi = _bbox(co)
+    return {"verts": len(co), "faces": len(totals), "loops": len(loops),
+            "min": lo, "max": hi, "hash": h.hexdigest()}
+
+
+def store(obj, params, signature=None):
+    """
+    Record what the generator just wrote into obj. signature can be passed
+    in when several objects share one mesh (cabin batch).
+    """
+    sig = dict(signature or mesh_signature(obj.data), params=params_hash(params))
+    obj[SIGNATURE_PROP] = json.dumps(sig)
+    _results.pop(obj.as_pointer(), None)
+
+
+def stored(obj):
+    """The object's signature dict, or None (never committed, or an older file)."""
+    try:
+        return json.loads(obj.get(SIGNATURE_PROP, "")) or None
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Check
+# ---------------------------------------------------------------------------
+
+def check(obj, params):
+    """
+    Compare obj against its stored signature. Returns None when there is no
+    signature, else a dict:
+        ok        everything matches
+        scale     object scale is 1, 1, 1
+        topology  vertex / face / loop counts match
+        shape     geometry hash matches (only tested when topology matches)
+        params    the stored build parameters are the ones the mesh was built from
+        issues    human-readable lines for whatever diverged
+    The mesh is only read again after its geometry changed.
+    """
+    sig = stored(obj)
+    if sig is None:
+        return None
+
+    mesh = obj.data
+    ptr = obj.as_pointer()
+    key = (mesh.as_pointer(), len(mesh.vertices), len(mesh.polygons),
+           obj.get(SIGNATURE_PROP))
+    cached = _results.get(ptr)
+    if cached is not None and cached[0] == key:
+        geo = cached[1]
+    else:
+        geo = _check_geometry(mesh, sig)
+        _results[ptr] = (key, geo)
+
+    sx, sy, sz = obj.scale
+    scale_ok = all(abs(s - 1.0) < 1e-4 for s in (sx, sy, sz))
+    params_ok = params_hash(params) == sig.get("params")
+
+    issues = []
+    if not scale_ok:
+        issues.append("Scale: X={:.3f} Y={:.3f} Z={:.3f}  (must be 1,1,1)".format(sx, sy, sz))
+    issues.extend(geo["issues"])
+    if not params_ok:
+        issues.append("Stored parameters changed since the mesh was built")
+
+    return {"ok": scale_ok and geo["topology"] and geo["shape"] and params_ok,
+            "scale": scale_ok, "topology": geo["topology"], "shape": geo["shape"],
+            "params": params_ok, "issues": issues}
+
+
+def _check_geometry(mesh, sig):
+    """Topology / shape part of check(): counts first, hash only if they match."""
+    counts = (len(mesh.vertices), len(mesh.polygons), len(mesh.loops))
+    built = (sig["verts"], sig["faces"], sig["loops"])
+    issues = []
+    if counts != built:
+        issues.append("Topology: {} verts / {} faces  (built {} / {})".format(
+            counts[0], counts[1], built[0], built[1]))
+        return {"topology": False, "shape": False, "issues": issues}
+
+    cur = mesh_signature(mesh)
+    if cur["hash"] == sig["hash"]:
+        return {"topology": True, "shape": True, "issues": issues}
+
+    size = np.subtract(cur["max"], cur["min"])
+    built_size = np.subtract(sig["max"], sig["min"])
+    if np.abs(size - built_size).max() > _BBOX_TOL:
+        issues.append("Size: {:.3f} x {:.3f} x {:.3f} m  (built {:.3f} x {:.3f} x {:.3f} m)".format(
+            *size.tolist(), *built_size.tolist()))
+    else:
+        issues.append("Vertices were moved (same count and size)")
+    return {"topology": True, "shape": False, "issues": issues}
+
+
+def forget(obj):
+    """Drop the cached result for obj (its mesh was rewritten)."""
+    if obj is not None:
+        _results.pop(obj.as_pointer(), None)
+
+
+@bpy.app.handlers.persistent
+def _integrity_depsgraph_update(scene, depsgraph):
+    if not _results:
+        return
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            _results.pop(update.id.original.as_pointer(), None)
+
+
+def register_handlers():
+    if _integrity_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_integrity_depsgraph_update)
+
+
+def unregister_handlers():
+    if _integrity_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_integrity_depsgraph_update)
+    _results.clear()
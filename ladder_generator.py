@@ -13,10 +13,13 @@ DayZ standard reference values (checkmark in UI if matched, warning if not):
 All values are editable. Checkmark = DayZ standard, exclamation = deviation.
 """
 
+import json
+
 import bpy
 import bmesh
-import math
-from mathutils import Vector
+import numpy as np
+
+from . import integrity, preview
 
 
 # ---------------------------------------------------------------------------
@@ -37,59 +40,206 @@ def _std_icon(value, reference):
 
 
 # ---------------------------------------------------------------------------
-#  Geometry primitive — closed manifold tube
+#  Geometry primitive — closed manifold tubes as arrays
 # ---------------------------------------------------------------------------
 
-def _make_tube(bm, p0, p1, radius, segs):
+# (cos, sin) of the ring angles, one entry per tube resolution
+_RING_TEMPLATES = {}
+
+
+def _ring_template(segs):
+    tpl = _RING_TEMPLATES.get(segs)
+    if tpl is None:
+        a = 2.0 * np.pi * np.arange(segs) / segs
+        tpl = _RING_TEMPLATES[segs] = (np.cos(a), np.sin(a))
+    return tpl
+
+
+def _unit(v):
+    n = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.maximum(n, 1e-12)
+
+
+def _tube_batch(paths, radius, segs):
     """
-    Build a closed (manifold) cylinder from p0 to p1 with the given radius.
-    Geometry is added directly into bm.
+    Closed (manifold) tubes along centreline paths, all in one go.
+
+    paths : (T, n, 3) array — T tubes with n centreline points each
+    Returns (co, quads, tris) with vertex indices local to the batch.
+    Every tube gets one ring per path point (junctions share their ring, so
+    bends need no welding) and a cap fan at its two ends only. Rings run
+    counter-clockwise around the tangent, so all faces point outward.
     """
-    p0 = Vector(p0)
-    p1 = Vector(p1)
-    axis = p1 - p0
-    if axis.length < 1e-6:
-        return
-
-    axis_n = axis.normalized()
-    ref = Vector((0.0, 0.0, 1.0))
-    if abs(axis_n.dot(ref)) > 0.99:
-        ref = Vector((1.0, 0.0, 0.0))
-    tang = axis_n.cross(ref).normalized()
-    btan = axis_n.cross(tang).normalized()
-
-    def ring(c):
-        verts = []
-        for i in range(segs):
-            a = 2.0 * math.pi * i / segs
-            verts.append(bm.verts.new(
-                c + tang * math.cos(a) * radius + btan * math.sin(a) * radius))
-        return verts
-
-    ra = ring(p0)
-    rb = ring(p1)
-
-    for i in range(segs):
-        j = (i + 1) % segs
-        bm.faces.new([ra[i], ra[j], rb[j], rb[i]])
-
-    ca = bm.verts.new(p0)
-    cb = bm.verts.new(p1)
-    for i in range(segs):
-        j = (i + 1) % segs
-        bm.faces.new([ca, ra[j], ra[i]])
-        bm.faces.new([cb, rb[i], rb[j]])
+    paths = np.asarray(paths, dtype=np.float64)
+    n_tubes, n_pts = paths.shape[:2]
+    if n_tubes == 0 or n_pts < 2:
+        return np.empty((0, 3)), np.empty((0, 4), np.int64), np.empty((0, 3), np.int64)
+
+    # Local tangent: one-sided at the ends, central in between
+    tang = np.empty_like(paths)
+    tang[:, 0] = paths[:, 1] - paths[:, 0]
+    tang[:, -1] = paths[:, -1] - paths[:, -2]
+    tang[:, 1:-1] = paths[:, 2:] - paths[:, :-2]
+    tang = _unit(tang)
+
+    # Stable frame: Z as reference, X when the tangent is near Z, Y when near both
+    ref = np.zeros_like(tang)
+    ref[..., 2] = 1.0
+    near = np.abs(tang[..., 2]) > 0.99
+    ref[near] = (1.0, 0.0, 0.0)
+    near &= np.abs(tang[..., 0]) > 0.99
+    ref[near] = (0.0, 1.0, 0.0)
+    t2 = _unit(np.cross(tang, ref))
+    b2 = _unit(np.cross(tang, t2))
+
+    cos, sin = _ring_template(segs)
+    rings = (paths[:, :, None, :]
+             + radius * (cos[:, None] * t2[:, :, None, :] + sin[:, None] * b2[:, :, None, :]))
+
+    per_tube = n_pts * segs + 2
+    co = np.concatenate([rings.reshape(n_tubes, n_pts * segs, 3),
+                         paths[:, 0:1], paths[:, -1:]], axis=1).reshape(-1, 3)
+
+    k = np.arange(segs)
+    j = (k + 1) % segs
+    ring0 = np.arange(n_pts - 1)[:, None] * segs
+    quads = np.stack([ring0 + k, ring0 + j, ring0 + segs + j, ring0 + segs + k],
+                     axis=-1).reshape(-1, 4)
+    last = (n_pts - 1) * segs
+    ca = np.full(segs, n_pts * segs)
+    tris = np.concatenate([np.stack([ca, j, k], axis=-1),
+                           np.stack([ca + 1, last + k, last + j], axis=-1)])
+
+    base = (np.arange(n_tubes) * per_tube)[:, None, None]
+    quads = (quads[None] + base).reshape(-1, 4)
+    tris = (tris[None] + base).reshape(-1, 3)
+    return co, quads, tris
+
+
+def _merge_parts(parts):
+    """Concatenate (co, quads, tris) parts into one mesh, offsetting indices."""
+    co, quads, tris = [], [], []
+    offset = 0
+    for p_co, p_quads, p_tris in parts:
+        co.append(p_co)
+        quads.append(p_quads + offset)
+        tris.append(p_tris + offset)
+        offset += len(p_co)
+    if not co:
+        return {"co": np.empty((0, 3)), "quads": np.empty((0, 4), np.int64),
+                "tris": np.empty((0, 3), np.int64)}
+    return {"co": np.concatenate(co), "quads": np.concatenate(quads),
+            "tris": np.concatenate(tris)}
+
+
+def _instance(template, offsets):
+    """Copies of a (co, quads, tris) template, one per row of offsets (translation only)."""
+    co, quads, tris = template
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 3)
+    shift = (np.arange(len(offsets)) * len(co))[:, None, None]
+    return ((co[None] + offsets[:, None]).reshape(-1, 3),
+            (quads[None] + shift).reshape(-1, 4),
+            (tris[None] + shift).reshape(-1, 3))
+
+
+# Box corner order matches bounds.box_corners; quads wind outward
+_BOX_QUADS = np.array([(0, 1, 2, 3), (4, 7, 6, 5), (0, 4, 5, 1),
+                       (3, 2, 6, 7), (0, 3, 7, 4), (1, 5, 6, 2)], dtype=np.int64)
+_BOX_SIGNS = np.array([[-1, -1, -1], [-1, -1, 1], [-1, 1, 1], [-1, 1, -1],
+                       [1, -1, -1], [1, -1, 1], [1, 1, 1], [1, 1, -1]], dtype=np.float64)
+
+
+def _box_template(half):
+    """Axis-aligned box centred on the origin as a (co, quads, tris) template."""
+    return _BOX_SIGNS * np.asarray(half, dtype=np.float64), _BOX_QUADS, np.empty((0, 3), np.int64)
+
+
+def write_ladder_mesh(mesh, data):
+    """Replace mesh's geometry with built ladder arrays through foreach_set."""
+    co, quads, tris = data["co"], data["quads"], data["tris"]
+    mesh.clear_geometry()
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(quads.size + tris.size)
+    mesh.loops.foreach_set("vertex_index", np.concatenate([quads.ravel(), tris.ravel()]))
+    mesh.polygons.add(len(quads) + len(tris))
+    mesh.polygons.foreach_set("loop_start", np.concatenate([
+        np.arange(0, quads.size, 4), quads.size + np.arange(0, tris.size, 3)]))
+    mesh.update(calc_edges=True)
 
 
 # ---------------------------------------------------------------------------
 #  Type 1 ladder builder
 # ---------------------------------------------------------------------------
 
+def ladder_dimensions(params):
+    """(rung_count, total_height) of a ladder without building it."""
+    rung_count = max(1, int(params['rung_count']))
+    last_rung_z = float(params['ground_offset']) + (rung_count - 1) * float(params['rung_spacing'])
+    return rung_count, last_rung_z + float(params['top_extension'])
+
+
+def build_ladder_parts(params):
+    """
+    A Type 1 ladder as tube templates plus placements: every rung is the same
+    tube at a different height, every hoop the same outline, every cage bar
+    the same vertical tube at a different spot on the hoop. Each template is
+    built once and instanced by translation.
+
+    Returns (instances, layout, rung_count, total_height):
+        instances : list of (kind, template, offsets) — kind is "stringer",
+                    "rung", "hoop" or "bar"; template is (co, quads, tris);
+                    offsets is (count, 3)
+        layout    : analytical description (counts, spacings, expected vertex
+                    count) stored on the object so dimensions and manual edits
+                    can be checked without scanning the mesh
+    """
+    segs   = max(4, int(params['resolution']))
+    r      = float(params['tube_diameter']) / 2.0
+    width  = float(params['width'])
+    sx     = width / 2.0
+
+    rung_count, total_height = ladder_dimensions(params)
+    rung_spacing  = float(params['rung_spacing'])
+    ground_offset = float(params['ground_offset'])
+
+    instances = []
+
+    # Stringers — vertical along Z
+    if total_height > 1e-6:
+        instances.append(("stringer", _tube_batch([[(0.0, 0.0, 0.0), (0.0, 0.0, total_height)]], r, segs),
+                          [(-sx, 0.0, 0.0), (sx, 0.0, 0.0)]))
+
+    # Rungs — horizontal along X (boxes on the lowest Resolution LOD)
+    if sx > 1e-6:
+        z = ground_offset + np.arange(rung_count) * rung_spacing
+        if params.get('rung_boxes', False):
+            rung = _box_template((sx, r, r))
+        else:
+            rung = _tube_batch([[(-sx, 0.0, 0.0), (sx, 0.0, 0.0)]], r, segs)
+        instances.append(("rung", rung,
+                          np.column_stack([np.zeros(rung_count), np.zeros(rung_count), z])))
+
+    # Optional safety cage
+    cage = {"hoop_count": 0, "hoop_spacing": 0.0, "hoop_start_z": 0.0, "bar_count": 0}
+    if params.get('cage_enabled', False):
+        cage_instances, cage = _build_cage(params, sx, total_height)
+        instances.extend(cage_instances)
+
+    layout = dict(cage,
+                  rung_count=rung_count, rung_spacing=rung_spacing,
+                  first_rung_z=ground_offset, total_height=total_height,
+                  verts=sum(len(t[0]) * len(o) for _kind, t, o in instances))
+    return instances, layout, rung_count, total_height
+
+
 def build_ladder_type1(params):
     """
-    Build a Type 1 (straight) ladder bmesh.
-    Returns (bm, rung_count, total_height).
-    Caller must call bm.free() after use.
+    Build a Type 1 (straight) ladder as mesh arrays.
+    Returns (data, rung_count, total_height) where data is
+    {"co": (N, 3), "quads": (Q, 4), "tris": (T, 3), "layout": {...}} — write
+    it with write_ladder_mesh(). Every tube is closed on its own, so no
+    remove_doubles / recalc_face_normals pass is needed.
 
     Z = up. Ladder base at Z=0, extends upward.
     Stringers run along Z. Rungs are horizontal along X.
@@ -103,109 +253,135 @@ def build_ladder_type1(params):
         top_extension   float  - stringer length above last rung (m)
         resolution      int    - tube cross-section segment count
     """
-    bm = bmesh.new()
+    instances, layout, rung_count, total_height = build_ladder_parts(params)
+    data = _merge_parts([_instance(t, o) for _kind, t, o in instances])
+    data["layout"] = layout
+    return data, rung_count, total_height
 
-    segs   = max(4, int(params['resolution']))
-    r      = float(params['tube_diameter']) / 2.0
-    width  = float(params['width'])
-    sx     = width / 2.0
 
-    rung_count    = max(1, int(params['rung_count']))
-    rung_spacing  = float(params['rung_spacing'])
-    ground_offset = float(params['ground_offset'])
-    top_ext       = float(params['top_extension'])
+# ---------------------------------------------------------------------------
+#  Live preview — cached builds, debounced dialog rebuilds
+# ---------------------------------------------------------------------------
 
-    last_rung_z  = ground_offset + (rung_count - 1) * rung_spacing
-    total_height = last_rung_z + top_ext
+def _write_ladder_result(mesh, result):
+    write_ladder_mesh(mesh, result[0])
 
-    # Stringers — vertical along Z
-    _make_tube(bm, (-sx, 0.0, 0.0), (-sx, 0.0, total_height), r, segs)
-    _make_tube(bm,  (sx, 0.0, 0.0),  (sx, 0.0, total_height), r, segs)
 
-    # Rungs — horizontal along X
-    for i in range(rung_count):
-        z = ground_offset + i * rung_spacing
-        _make_tube(bm, (-sx, 0.0, z), (sx, 0.0, z), r, segs)
+def apply_ladder(obj, params, ladder_type=1):
+    """
+    Write a ladder into obj's mesh through the preview build cache and update
+    its display counters. Returns (rung_count, total_height).
+    """
+    clear_instanced_preview(obj)
+    builder = build_ladder_type2 if ladder_type == 2 else build_ladder_type1
+    _data, rung_count, total_height = preview.apply(
+        obj, "ladder{}".format(ladder_type), builder, _write_ladder_result, params)
+    # Write display counters — but NOT dgm_p_* or confirmed flag
+    # so integrity check doesn't trigger during live preview
+    obj['dgm_ladder_rungs']  = rung_count
+    obj['dgm_ladder_height'] = round(total_height, 4)
+    return rung_count, total_height
 
-    # Optional safety cage
-    if params.get('cage_enabled', False):
-        _build_cage(bm, params, sx, total_height)
 
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=5e-4)
-    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+def ladder_layout(params):
+    """Analytical layout (counts, spacings, vertex count) of a Type 1 ladder, from the cache."""
+    data, _rung_count, _total_height = preview.build("ladder1", build_ladder_type1, params)
+    return data["layout"]
+
+
+def show_instanced_preview(obj, params):
+    """
+    Viewport-only preview: obj's mesh holds the stringers, and every rung, hoop
+    and cage bar is a linked duplicate of one template mesh, parented to obj.
+    A tall ladder then costs a handful of template verts to update. The real
+    mesh is written by apply_ladder(), which also removes the duplicates.
+    """
+    instances, _layout, rung_count, total_height = preview.build(
+        "ladder1_parts", build_ladder_parts, params)
+
+    write_ladder_mesh(obj.data, _merge_parts(
+        [_instance(t, o) for kind, t, o in instances if kind == "stringer"]))
+    preview.forget(obj)
+
+    children = {}
+    for child in obj.children:
+        kind = child.get('dgm_preview_instance')
+        if kind:
+            children.setdefault(kind, []).append(child)
+
+    collection = obj.users_collection[0] if obj.users_collection else bpy.context.collection
+    for kind, template, offsets in instances:
+        if kind == "stringer":
+            continue
+        mesh_name = "{}.{}".format(obj.name, kind)
+        mesh = bpy.data.meshes.get(mesh_name) or bpy.data.meshes.new(mesh_name)
+        write_ladder_mesh(mesh, _merge_parts([template]))
+        mesh.materials.clear()
+        for mat in obj.data.materials:
+            mesh.materials.append(mat)
+
+        existing = children.pop(kind, [])
+        while len(existing) > len(offsets):
+            bpy.data.objects.remove(existing.pop(), do_unlink=True)
+        while len(existing) < len(offsets):
+            child = bpy.data.objects.new(mesh_name, mesh)
+            collection.objects.link(child)
+            child.parent = obj
+            child.hide_select = True
+            child['dgm_preview_instance'] = kind
+            existing.append(child)
+        for child, offset in zip(existing, offsets):
+            child.location = offset.tolist()
+
+    # Kinds that are gone (cage switched off)
+    for leftover in children.values():
+        for child in leftover:
+            bpy.data.objects.remove(child, do_unlink=True)
+
+    obj['dgm_ladder_rungs']  = rung_count
+    obj['dgm_ladder_height'] = round(total_height, 4)
+    return rung_count, total_height
+
+
+def clear_instanced_preview(obj):
+    """Remove the linked-duplicate preview objects (and their template meshes) of obj."""
+    meshes = set()
+    for child in list(obj.children):
+        if child.get('dgm_preview_instance'):
+            meshes.add(child.data)
+            bpy.data.objects.remove(child, do_unlink=True)
+    for mesh in meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def schedule_ladder_preview(obj, params, ladder_type=1, instanced=False):
+    """
+    Debounced apply_ladder — rapid dialog edits only build the last value.
+    instanced previews with linked duplicates (Type 1 only).
+    """
+    name = obj.name
+
+    def rebuild():
+        target = bpy.data.objects.get(name)
+        if target is None:
+            return
+        if instanced and ladder_type == 1:
+            show_instanced_preview(target, params)
+        else:
+            apply_ladder(target, params, ladder_type)
 
-    return bm, rung_count, total_height
+    preview.schedule(("ladder", name), rebuild)
 
 
 # ---------------------------------------------------------------------------
 #  Cage builder — D-arc safety cage
 # ---------------------------------------------------------------------------
 
-def _make_arc_tube(bm, arc_pts, radius, segs):
+def _build_cage(params, sx, total_height):
     """
-    Build a single continuous tube along a list of centreline points.
-    Each junction between segments shares its ring of vertices — no gaps,
-    no overlapping end-caps, clean manifold result.
-
-    arc_pts : list of Vector, path of tube centreline
-    radius  : tube cross-section radius
-    segs    : sides of tube cross-section
-    """
-    if len(arc_pts) < 2:
-        return
-
-    def _tangent(i):
-        """Local tangent at point i."""
-        if i == 0:
-            return (arc_pts[1] - arc_pts[0]).normalized()
-        if i == len(arc_pts) - 1:
-            return (arc_pts[-1] - arc_pts[-2]).normalized()
-        return (arc_pts[i + 1] - arc_pts[i - 1]).normalized()
-
-    def _frame(tang):
-        """Stable tangent frame perpendicular to tang.
-        Uses Z as primary reference; falls back to X when axis is near Z,
-        and to Y when axis is near both Z and X."""
-        ref = Vector((0.0, 0.0, 1.0))
-        if abs(tang.dot(ref)) > 0.99:
-            ref = Vector((1.0, 0.0, 0.0))
-            if abs(tang.dot(ref)) > 0.99:
-                ref = Vector((0.0, 1.0, 0.0))
-        t2 = tang.cross(ref).normalized()
-        b2 = tang.cross(t2).normalized()
-        return t2, b2
-
-    def _ring(centre, tang):
-        verts = []
-        t2, b2 = _frame(tang)
-        for k in range(segs):
-            a = 2.0 * math.pi * k / segs
-            verts.append(bm.verts.new(
-                centre + t2 * math.cos(a) * radius + b2 * math.sin(a) * radius))
-        return verts
-
-    rings = [_ring(arc_pts[i], _tangent(i)) for i in range(len(arc_pts))]
-
-    # Side quads between adjacent rings
-    for i in range(len(rings) - 1):
-        ra, rb = rings[i], rings[i + 1]
-        for k in range(segs):
-            j = (k + 1) % segs
-            bm.faces.new([ra[k], ra[j], rb[j], rb[k]])
-
-    # End caps only at the two actual ends
-    ca = bm.verts.new(arc_pts[0])
-    cb = bm.verts.new(arc_pts[-1])
-    ra, rb = rings[0], rings[-1]
-    for k in range(segs):
-        j = (k + 1) % segs
-        bm.faces.new([ca, ra[j], ra[k]])
-        bm.faces.new([cb, rb[k], rb[j]])
-
-
-def _build_cage(bm, params, sx, total_height):
-    """
-    Add a safety cage hoop to an existing bmesh.
+    Safety cage hoops and bars as build_ladder_parts instances.
+    Returns (instances, cage layout).
 
     Shape per hoop (top view):
       - Two straight arms extending perpendicular to the ladder plane (-Y direction),
@@ -230,54 +406,21 @@ def _build_cage(bm, params, sx, total_height):
         cage_start_z    float  - Z where cage begins, default 2.200
         cage_tube_d     float  - cage tube diameter, default 0.025
         resolution      int    - tube cross-section segments
+
+    Resolution LODs (see ladder_lod_params) may also set:
+        cage_arc_segs   int    - hoop arc segments, default max(10, resolution * 2)
+        cage_arm_steps  int    - straight arm subdivisions, default one per 5 cm
+        cage_hoop_stride int   - keep every Nth hoop (the top hoop is always kept)
     """
     arm_len      = max(0.010, float(params.get('cage_depth',    0.350)))
     # User sets visible bar count. Internally add 2 for the stringer positions
-    # (index 0 and last_idx) which land on stringers and are not drawn separately.
+    # (index 0 and last_idx) which land on stringers.
     bar_count    = int(params.get('cage_bar_count', 5)) + 2
     hoop_spacing = float(params.get('hoop_spacing',  0.900))
     cage_start_z = float(params.get('cage_start_z',  2.200))
     cage_tube_r  = float(params.get('cage_tube_d',   0.025)) / 2.0
     segs         = max(4, int(params.get('resolution', 8)))
-    arc_segs     = max(10, segs * 2)
-
-    # Arc: semicircle of radius sx, centred at (0, -arm_len)
-    # Connects (-sx, -arm_len) through (0, -arm_len - sx) to (+sx, -arm_len)
-    arc_cx, arc_cy = 0.0, -arm_len
-    arc_r = sx  # arc radius = half ladder width
-
-    def hoop_points(z):
-        """
-        Return ordered list of centreline points for one complete hoop at height z.
-        Path: right stringer (sx,0) -> straight arm to (sx,-arm_len)
-              -> semicircle to (-sx,-arm_len) -> straight arm back to (-sx,0)
-        """
-        pts = []
-        arm_steps = max(2, int(arm_len / 0.05))
-        arc_steps = arc_segs
-
-        # Right straight arm: from (sx, 0) to (sx, -arm_len)
-        for i in range(arm_steps + 1):
-            t = i / arm_steps
-            pts.append(Vector((sx, -t * arm_len, z)))
-
-        # Semicircle: from (sx, -arm_len) clockwise to (-sx, -arm_len)
-        # Circle centre at (0, -arm_len), radius sx
-        # Right end: angle = 0  (cos0=1, sin0=0 -> x=sx, y=arc_cy)
-        # Left end:  angle = pi (cos pi=-1 -> x=-sx, y=arc_cy)
-        # Go clockwise = decreasing angle (0 -> -pi)
-        for i in range(1, arc_steps + 1):
-            a = -math.pi * i / arc_steps   # 0 to -pi
-            x = arc_cx + arc_r * math.cos(a)
-            y = arc_cy + arc_r * math.sin(a)
-            pts.append(Vector((x, y, z)))
-
-        # Left straight arm: from (-sx, -arm_len) back to (-sx, 0)
-        for i in range(1, arm_steps + 1):
-            t = i / arm_steps
-            pts.append(Vector((-sx, -(1.0 - t) * arm_len, z)))
-
-        return pts
+    arc_segs     = max(2, int(params.get('cage_arc_segs', max(10, segs * 2))))
 
     # Hoop heights
     hoop_zs = []
@@ -285,53 +428,58 @@ def _build_cage(bm, params, sx, total_height):
     while hz <= total_height + 1e-5:
         hoop_zs.append(hz)
         hz += hoop_spacing
+    stride = max(1, int(params.get('cage_hoop_stride', 1)))
+    if stride > 1 and hoop_zs:
+        hoop_zs = hoop_zs[:-1:stride] + hoop_zs[-1:]
     if not hoop_zs:
-        return
-
-    # Build hoops
-    for hz in hoop_zs:
-        pts = hoop_points(hz)
-        _make_arc_tube(bm, pts, cage_tube_r, segs)
+        return [], {"hoop_count": 0, "hoop_spacing": hoop_spacing,
+                    "hoop_start_z": cage_start_z, "bar_count": 0}
+    hoop_zs = np.array(hoop_zs)
+
+    # Hoop centreline (XY): right stringer (sx,0) -> straight arm to (sx,-arm_len)
+    # -> semicircle (centre (0,-arm_len), radius sx, clockwise 0 -> -pi)
+    # -> straight arm back to (-sx,0)
+    arm_steps = max(1, int(params.get('cage_arm_steps', max(2, int(arm_len / 0.05)))))
+    t_arm = np.arange(arm_steps + 1) / arm_steps
+    a = -np.pi * np.arange(1, arc_segs + 1) / arc_segs
+    hoop_xy = np.concatenate([
+        np.column_stack([np.full(arm_steps + 1, sx), -t_arm * arm_len]),
+        np.column_stack([sx * np.cos(a), -arm_len + sx * np.sin(a)]),
+        np.column_stack([np.full(arm_steps, -sx), -(1.0 - t_arm[1:]) * arm_len]),
+    ])
+
+    # One hoop template at Z=0, placed at every hoop height
+    hoop = np.zeros((1, len(hoop_xy), 3))
+    hoop[0, :, :2] = hoop_xy
+    zeros = np.zeros(len(hoop_zs))
+    instances = [("hoop", _tube_batch(hoop, cage_tube_r, segs),
+                  np.column_stack([zeros, zeros, hoop_zs]))]
 
     # Vertical bars — evenly distributed across the ENTIRE hoop perimeter
     # (both straight arms + arc). Index 0 = right stringer, last = left stringer.
-    # Example: 3 bars -> right stringer, arc midpoint, left stringer.
+    # Each bar is one continuous tube through every hoop height, so the joins
+    # between hoop gaps share a ring instead of being welded afterwards.
     if len(hoop_zs) > 1 and bar_count > 0:
-        # Compute bar XY positions geometrically — independent of arc_segs/resolution.
-        # Path: right arm (sx,0)->(sx,-arm_len), arc, left arm (-sx,-arm_len)->(-sx,0)
-        # Total arc length (approximate): 2*arm_len + pi*sx
-        # Parameterise t in [0,1] over the full path, compute XY directly.
-        arm_l   = arm_len
-        arc_len = math.pi * sx
-        total_l = 2.0 * arm_l + arc_len
-
-        def bar_xy(t):
-            """Return (x, y) for parameter t in [0,1] along the hoop centreline."""
-            dist = t * total_l
-            if dist <= arm_l:
-                # Right arm: x=sx, y goes from 0 to -arm_len
-                frac = dist / arm_l if arm_l > 1e-6 else 0.0
-                return (sx, -frac * arm_l)
-            dist -= arm_l
-            if dist <= arc_len:
-                # Arc: from (sx, -arm_len) clockwise to (-sx, -arm_len)
-                a = -(math.pi * dist / arc_len)  # 0 to -pi
-                x = arc_cx + sx * math.cos(a)
-                y = arc_cy + sx * math.sin(a)
-                return (x, y)
-            dist -= arc_len
-            # Left arm: x=-sx, y goes from -arm_len to 0
-            frac = dist / arm_l if arm_l > 1e-6 else 1.0
-            return (-sx, -(1.0 - frac) * arm_l)
-
-        bar_positions = [bar_xy(b / (bar_count - 1)) if bar_count > 1 else bar_xy(0.5)
-                         for b in range(bar_count)]
-
-        for (bx, by) in bar_positions:
-            for k in range(len(hoop_zs) - 1):
-                p0 = Vector((bx, by, hoop_zs[k]))
-                p1 = Vector((bx, by, hoop_zs[k + 1]))
-                _make_tube(bm, p0, p1, cage_tube_r, segs)
+        arc_len = np.pi * sx
+        total_l = 2.0 * arm_len + arc_len
+        ts = np.arange(bar_count) / (bar_count - 1) if bar_count > 1 else np.array([0.5])
+        dist = ts * total_l
+        on_arc = (dist > arm_len) & (dist <= arm_len + arc_len)
+        on_left = dist > arm_len + arc_len
+        ang = -np.pi * np.clip(dist - arm_len, 0.0, arc_len) / max(arc_len, 1e-12)
+        bx = np.where(on_arc, sx * np.cos(ang), np.where(on_left, -sx, sx))
+        by = np.where(on_arc, -arm_len + sx * np.sin(ang),
+                      np.where(on_left, -(1.0 - (dist - arm_len - arc_len) / arm_len) * arm_len,
+                               -dist))
+
+        bar = np.zeros((1, len(hoop_zs), 3))
+        bar[0, :, 2] = hoop_zs
+        instances.append(("bar", _tube_batch(bar, cage_tube_r, segs),
+                          np.column_stack([bx, by, np.zeros(bar_count)])))
+    else:
+        bar_count = 0
+    return instances, {"hoop_count": len(hoop_zs), "hoop_spacing": hoop_spacing,
+                       "hoop_start_z": cage_start_z, "bar_count": bar_count}
 
 
 def _calc_expected_depth(params):
@@ -355,6 +503,74 @@ def _calc_expected_depth(params):
     return round(td, 4)
 
 
+def stored_ladder_params(obj):
+    """Type 1 build params from the dgm_p_* values stored on a confirmed ladder."""
+    return dict(
+        width         = obj.get('dgm_p_width',         0.440),
+        tube_diameter = obj.get('dgm_p_tube_diameter', TUBE_DIAMETER_STD),
+        rung_count    = obj.get('dgm_p_rung_count',    16),
+        rung_spacing  = obj.get('dgm_p_rung_spacing',  RUNG_SPACING_STD),
+        ground_offset = obj.get('dgm_p_ground_offset', GROUND_OFFSET_STD),
+        top_extension = obj.get('dgm_p_top_extension', TOP_EXT_STD),
+        resolution    = obj.get('dgm_p_resolution',    10),
+        cage_enabled  = obj.get('dgm_p_cage_enabled',  False),
+        cage_start_z  = obj.get('dgm_p_cage_start_z',  2.200),
+        cage_depth    = obj.get('dgm_p_cage_depth',    0.350),
+        hoop_spacing  = obj.get('dgm_p_hoop_spacing',  0.900),
+        cage_bar_count= obj.get('dgm_p_cage_bar_count',5),
+        cage_tube_d   = obj.get('dgm_p_tube_diameter', TUBE_DIAMETER_STD),
+    )
+
+
+# ---------------------------------------------------------------------------
+#  Resolution LODs — the same ladder rebuilt at lower detail
+# ---------------------------------------------------------------------------
+
+def ladder_lod_params(params, step, last):
+    """
+    Build params for Resolution LOD `step` of `last` (0 = full detail).
+      - tube segments halve every step (4 minimum)
+      - from step 2 hoops lose their arc detail and arm subdivisions,
+        from step 3 every other hoop is dropped
+      - the last LOD keeps only the bottom and top hoop and turns every
+        rung into a box
+    """
+    lod = dict(params)
+    if step <= 0:
+        return lod
+    lod['resolution'] = max(4, int(params['resolution']) >> step)
+    if step >= 2:
+        lod['cage_arc_segs'] = 6
+        lod['cage_arm_steps'] = 1
+    if step >= 3:
+        lod['cage_hoop_stride'] = 2 ** (step - 2)
+    if step >= last:
+        lod['cage_arc_segs'] = 4
+        lod['cage_hoop_stride'] = 1 << 30
+        lod['rung_boxes'] = True
+    return lod
+
+
+def mesh_tris(data):
+    """Triangle count of built ladder arrays."""
+    return 2 * len(data["quads"]) + len(data["tris"])
+
+
+def build_ladder_lods(params, count):
+    """
+    Ladder arrays for `count` Resolution LODs, highest detail first — one
+    parametric rebuild per level instead of decimating the full mesh, so
+    every level keeps clean closed tubes. Returns a list of
+    (data, lod_params); write data with write_ladder_mesh().
+    """
+    levels = []
+    for step in range(count):
+        lod = ladder_lod_params(params, step, count - 1)
+        data, _rung_count, _total_height = build_ladder_type1(lod)
+        levels.append((data, lod))
+    return levels
+
+
 def _count_scene_ladders():
     """Count DZ_Ladder objects in the current scene, excluding Resolution LOD copies."""
     return sum(1 for o in bpy.data.objects
@@ -369,6 +585,11 @@ def _is_active_ladder(obj):
             and obj.get('dgm_ladder') is True
             and '.LOD' not in obj.name)
 
+def is_confirmed_ladder(obj):
+    """True for a tracked ladder whose build params are stored (OK pressed at least once)."""
+    return (_is_active_ladder(obj)
+            and (obj.get('dgm_ladder_confirmed', False) or obj.get('dgm_p_width') is not None))
+
 # ---------------------------------------------------------------------------
 #  Main operator — Type 1
 # ---------------------------------------------------------------------------
@@ -486,6 +707,15 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         description="Number of vertical bars along the cage arc connecting hoops.",
         default=5, min=0, max=12,
     )
+    instanced_preview: bpy.props.BoolProperty(
+        name="Instanced Preview",
+        description=(
+            "Preview rungs and cage hoops as linked duplicates of one template.\n"
+            "Keeps the dialog light for very tall or caged ladders.\n"
+            "The full mesh is written when you press OK."
+        ),
+        default=False,
+    )
 
 
     def _get_params(self):
@@ -505,19 +735,15 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
             cage_tube_d=self.tube_diameter,  # cage uses same tube diameter as ladder
         )
 
-    def _rebuild(self, context):
+    def _rebuild(self, context, debounce=False):
         obj = context.active_object
         if obj is None or obj.type != 'MESH' or not obj.get('dgm_ladder'):
             return
-        params = self._get_params()
-        bm, rung_count, total_height = build_ladder_type1(params)
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
-        # Write display counters — but NOT dgm_p_* or confirmed flag
-        # so integrity check doesn't trigger during live preview
-        obj['dgm_ladder_rungs']  = rung_count
-        obj['dgm_ladder_height'] = round(total_height, 4)
+        if debounce:
+            schedule_ladder_preview(obj, self._get_params(), instanced=self.instanced_preview)
+        else:
+            preview.cancel(("ladder", obj.name))
+            apply_ladder(obj, self._get_params())
 
     def _commit(self, context):
         """Write all stored params and expected dimensions — called only from execute()."""
@@ -525,7 +751,7 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         if obj is None or not obj.get('dgm_ladder'):
             return
         params = self._get_params()
-        _, rung_count, total_height = build_ladder_type1(params)
+        rung_count, total_height = ladder_dimensions(params)
         obj['dgm_ladder_rungs']           = rung_count
         obj['dgm_ladder_height']          = round(total_height, 4)
         obj['dgm_ladder_expected_height'] = round(total_height, 4)
@@ -543,7 +769,9 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         obj['dgm_p_ground_offset'] = params['ground_offset']
         obj['dgm_p_top_extension'] = params['top_extension']
         obj['dgm_p_resolution']    = params['resolution']
+        obj['dgm_ladder_layout']   = json.dumps(ladder_layout(params))
         obj['dgm_ladder_confirmed'] = True
+        integrity.store(obj, stored_ladder_params(obj))
 
     @classmethod
     def poll(cls, context):
@@ -572,8 +800,10 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
 
     def cancel(self, context):
         """User pressed Escape or Cancel — delete the preview object."""
+        preview.cancel(("ladder", self._created_obj_name))
         obj = bpy.data.objects.get(self._created_obj_name)
         if obj is not None:
+            clear_instanced_preview(obj)
             mesh = obj.data
             bpy.data.objects.remove(obj, do_unlink=True)
             if mesh.users == 0:
@@ -581,7 +811,7 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         self._created_obj_name = ""
 
     def check(self, context):
-        self._rebuild(context)
+        self._rebuild(context, debounce=True)
         return True
 
     def draw(self, context):
@@ -614,8 +844,7 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         col.prop(self, 'rung_count')
 
         # Info
-        bm_info, rung_count, total_height = build_ladder_type1(params)
-        bm_info.free()
+        rung_count, total_height = ladder_dimensions(params)
         last_rung_z = params['ground_offset'] + (rung_count - 1) * params['rung_spacing']
 
         info_box = layout.box()
@@ -652,6 +881,7 @@ class DGM_OT_ladder_type1(bpy.types.Operator):
         q_row = layout.row(align=True)
         q_row.label(text="Tube Segments:", icon='MESH_CIRCLE')
         q_row.prop(self, 'resolution', text="")
+        layout.prop(self, 'instanced_preview')
 
     def execute(self, context):
         self._rebuild(context)
@@ -748,6 +978,14 @@ class DGM_OT_ladder_edit(bpy.types.Operator):
         name="Vertical Bars",
         description="Number of vertical bars along the cage.",
         default=5, min=0, max=12)
+    instanced_preview: bpy.props.BoolProperty(
+        name="Instanced Preview",
+        description=(
+            "Preview rungs and cage hoops as linked duplicates of one template.\n"
+            "Keeps the dialog light for very tall or caged ladders.\n"
+            "The full mesh is written when you press OK."
+        ),
+        default=False)
 
     @classmethod
     def poll(cls, context):
@@ -786,33 +1024,31 @@ class DGM_OT_ladder_edit(bpy.types.Operator):
             return
         params = self._get_params()
         ladder_type = obj.get('dgm_ladder_type', 1)
-        if ladder_type == 2:
-            bm, rung_count, total_height = build_ladder_type2(params)
-        else:
-            bm, rung_count, total_height = build_ladder_type1(params)
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
-        # Always update display counters (these are cosmetic, not validated)
-        obj['dgm_ladder_rungs']  = rung_count
-        obj['dgm_ladder_height'] = round(total_height, 4)
-        if commit:
-            # Only write expected_* and dgm_p_* on confirmed OK
-            obj['dgm_ladder_expected_height'] = round(total_height, 4)
-            obj['dgm_ladder_expected_width']  = round(params['width'] + params['tube_diameter'], 4)
-            obj['dgm_ladder_expected_depth']  = _calc_expected_depth(params)
-            obj['dgm_p_width']         = self.width
-            obj['dgm_p_tube_diameter'] = self.tube_diameter
-            obj['dgm_p_rung_count']    = self.rung_count
-            obj['dgm_p_rung_spacing']  = self.rung_spacing
-            obj['dgm_p_ground_offset'] = self.ground_offset
-            obj['dgm_p_top_extension'] = self.top_extension
-            obj['dgm_p_resolution']    = self.resolution
-            obj['dgm_p_cage_enabled']  = self.cage_enabled
-            obj['dgm_p_cage_start_z']  = self.cage_start_z
-            obj['dgm_p_cage_depth']    = self.cage_depth
-            obj['dgm_p_hoop_spacing']  = self.hoop_spacing
-            obj['dgm_p_cage_bar_count']= self.cage_bar_count
+        if not commit:
+            # Live preview: coalesce rapid edits, display counters follow the build
+            schedule_ladder_preview(obj, params, ladder_type, instanced=self.instanced_preview)
+            return
+        preview.cancel(("ladder", obj.name))
+        rung_count, total_height = apply_ladder(obj, params, ladder_type)
+        # Only write expected_* and dgm_p_* on confirmed OK
+        obj['dgm_ladder_expected_height'] = round(total_height, 4)
+        obj['dgm_ladder_expected_width']  = round(params['width'] + params['tube_diameter'], 4)
+        obj['dgm_ladder_expected_depth']  = _calc_expected_depth(params)
+        obj['dgm_p_width']         = self.width
+        obj['dgm_p_tube_diameter'] = self.tube_diameter
+        obj['dgm_p_rung_count']    = self.rung_count
+        obj['dgm_p_rung_spacing']  = self.rung_spacing
+        obj['dgm_p_ground_offset'] = self.ground_offset
+        obj['dgm_p_top_extension'] = self.top_extension
+        obj['dgm_p_resolution']    = self.resolution
+        obj['dgm_p_cage_enabled']  = self.cage_enabled
+        obj['dgm_p_cage_start_z']  = self.cage_start_z
+        obj['dgm_p_cage_depth']    = self.cage_depth
+        obj['dgm_p_hoop_spacing']  = self.hoop_spacing
+        obj['dgm_p_cage_bar_count']= self.cage_bar_count
+        if ladder_type == 1:
+            obj['dgm_ladder_layout'] = json.dumps(ladder_layout(params))
+            integrity.store(obj, stored_ladder_params(obj))
 
 
     def _snapshot(self, obj):
@@ -892,12 +1128,19 @@ class DGM_OT_ladder_edit(bpy.types.Operator):
         self.cage_bar_count  = obj.get('dgm_p_cage_bar_count', 5)
         # Take snapshot BEFORE opening dialog so cancel can restore
         self._snapshot(obj)
+        # The mesh may have been edited by hand since the last preview
+        preview.forget(obj)
         # Do NOT call _rebuild here — mesh stays untouched until user edits something
         return context.window_manager.invoke_props_dialog(self, width=400)
 
     def cancel(self, context):
         """Called when user presses Escape or Cancel — restore original mesh."""
+        obj = context.active_object
+        if obj is not None:
+            preview.cancel(("ladder", obj.name))
+            clear_instanced_preview(obj)
         self._restore_snapshot(context)
+        preview.forget(obj)
 
     def check(self, context):
         self._rebuild(context, commit=False)
@@ -934,8 +1177,7 @@ class DGM_OT_ladder_edit(bpy.types.Operator):
         col.separator()
         col.prop(self, 'rung_count')
 
-        bm_info, rung_count, total_height = build_ladder_type1(params)
-        bm_info.free()
+        rung_count, total_height = ladder_dimensions(params)
         last_rung_z = params['ground_offset'] + (rung_count - 1) * params['rung_spacing']
 
         info_box = layout.box()
@@ -961,6 +1203,7 @@ class DGM_OT_ladder_edit(bpy.types.Operator):
         q_row = layout.row(align=True)
         q_row.label(text="Tube Segments:", icon='MESH_CIRCLE')
         q_row.prop(self, 'resolution', text="")
+        layout.prop(self, 'instanced_preview')
 
     def execute(self, context):
         self._rebuild(context, commit=True)
@@ -1053,27 +1296,12 @@ class DGM_OT_ladder_restore(bpy.types.Operator):
         obj.scale = (1.0, 1.0, 1.0)
 
         # Rebuild mesh from stored params — including cage if it was enabled
-        cage_enabled = obj.get('dgm_p_cage_enabled', False)
-        params = dict(
-            width         = obj.get('dgm_p_width',         0.440),
-            tube_diameter = obj.get('dgm_p_tube_diameter', TUBE_DIAMETER_STD),
-            rung_count    = obj.get('dgm_p_rung_count',    16),
-            rung_spacing  = obj.get('dgm_p_rung_spacing',  RUNG_SPACING_STD),
-            ground_offset = obj.get('dgm_p_ground_offset', GROUND_OFFSET_STD),
-            top_extension = obj.get('dgm_p_top_extension', TOP_EXT_STD),
-            resolution    = obj.get('dgm_p_resolution',    10),
-            cage_enabled  = cage_enabled,
-            cage_start_z  = obj.get('dgm_p_cage_start_z',  2.200),
-            cage_depth    = obj.get('dgm_p_cage_depth',    0.350),
-            hoop_spacing  = obj.get('dgm_p_hoop_spacing',  0.900),
-            cage_bar_count= obj.get('dgm_p_cage_bar_count',5),
-            cage_tube_d   = obj.get('dgm_p_tube_diameter', TUBE_DIAMETER_STD),
-        )
+        params = stored_ladder_params(obj)
 
-        bm, rung_count, total_height = build_ladder_type1(params)
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
+        clear_instanced_preview(obj)
+        data, rung_count, total_height = build_ladder_type1(params)
+        write_ladder_mesh(obj.data, data)
+        preview.forget(obj)
 
         # Restore position and rotation — only scale stays at 1,1,1
         obj.location       = saved_location
@@ -1085,6 +1313,8 @@ class DGM_OT_ladder_restore(bpy.types.Operator):
         obj['dgm_ladder_expected_height'] = round(total_height, 4)
         obj['dgm_ladder_expected_width']  = round(params['width'] + params['tube_diameter'], 4)
         obj['dgm_ladder_expected_depth']  = _calc_expected_depth(params)
+        obj['dgm_ladder_layout']          = json.dumps(data['layout'])
+        integrity.store(obj, params)
 
         self.report({'INFO'}, "Ladder restored to {:.3f} m".format(total_height))
         return {'FINISHED'}
@@ -1133,7 +1363,6 @@ def draw_ladder_generator_section(layout, context):
         box.operator("dgm.ladder_edit", text="Edit Selected Ladder", icon='PREFERENCES')
 
         # Collision button — check if collision already exists for this ladder
-        import json
         geo_obj = bpy.data.objects.get("Geometry")
         col_map = {}
         if geo_obj:
@@ -1165,76 +1394,107 @@ def draw_ladder_generator_section(layout, context):
         _is_confirmed = (obj.get('dgm_ladder_confirmed', False)
                          or obj.get('dgm_p_width') is not None)
         if _is_confirmed:
-            import mathutils as _mu
-
-            # Check 1: scale must be (1,1,1)
-            sx_scale, sy_scale, sz_scale = obj.scale
-            scale_ok = (abs(sx_scale - 1.0) < 1e-4
-                        and abs(sy_scale - 1.0) < 1e-4
-                        and abs(sz_scale - 1.0) < 1e-4)
-
-            # Check 2: recalculate expected from stored params and compare bounding box
-            _p = dict(
-                width         = obj.get('dgm_p_width',         0.440),
-                tube_diameter = obj.get('dgm_p_tube_diameter', 0.042),
-                rung_count    = obj.get('dgm_p_rung_count',    16),
-                rung_spacing  = obj.get('dgm_p_rung_spacing',  0.320),
-                ground_offset = obj.get('dgm_p_ground_offset', 0.340),
-                top_extension = obj.get('dgm_p_top_extension', 0.700),
-                resolution    = obj.get('dgm_p_resolution',    8),
-                cage_enabled  = obj.get('dgm_p_cage_enabled',  False),
-                cage_depth    = obj.get('dgm_p_cage_depth',    0.350),
-                cage_tube_d   = obj.get('dgm_p_tube_diameter', 0.042),
-            )
-            # Use local bounding box (no matrix_world) so scale is detected separately
-            local_corners = [_mu.Vector(c) for c in obj.bound_box]
-            lxs = [c.x for c in local_corners]
-            lys = [c.y for c in local_corners]
-            lzs = [c.z for c in local_corners]
-            actual_h = max(lzs) - min(lzs)
-            actual_w = max(lxs) - min(lxs)
-            actual_d = max(lys) - min(lys)
-
-            _, _, _total_h = build_ladder_type1(_p)
-            expected_h = round(_total_h, 4)
-            expected_w = round(_p['width'] + _p['tube_diameter'], 4)
-            expected_d = _calc_expected_depth(_p)
-
-            TOL = 0.005  # 5 mm tolerance
-            height_ok = abs(actual_h - expected_h) < TOL
-            width_ok  = abs(actual_w - expected_w) < TOL
-            depth_ok  = abs(actual_d - expected_d) < TOL
-
-            if not scale_ok or not (height_ok and width_ok and depth_ok):
-                warn = box.box()
-                warn.alert = True
-                wcol = warn.column(align=True)
-                wcol.label(text="Ladder geometry was modified!", icon='ERROR')
-                if not scale_ok:
-                    wcol.label(
-                        text="Scale: X={:.3f} Y={:.3f} Z={:.3f}  (must be 1,1,1)".format(
-                            sx_scale, sy_scale, sz_scale),
-                        icon='DOT')
-                if not height_ok:
-                    wcol.label(
-                        text="Height: {:.3f} m  (expected {:.3f} m)".format(
-                            actual_h, expected_h),
-                        icon='DOT')
-                if not width_ok:
-                    wcol.label(
-                        text="Width:  {:.3f} m  (expected {:.3f} m)".format(
-                            actual_w, expected_w),
-                        icon='DOT')
-                if not depth_ok:
-                    wcol.label(
-                        text="Depth:  {:.3f} m  (expected {:.3f} m)".format(
-                            actual_d, expected_d),
-                        icon='DOT')
-                wcol.separator()
-                wcol.label(text="Click to restore correct geometry:", icon='INFO')
-                wcol.operator("dgm.ladder_restore", text="Restore Ladder", icon='FILE_REFRESH')
-
-
+            # Signature stored at commit: counts, bounding box and mesh hash,
+            # read with foreach_get and cached until the mesh changes
+            result = integrity.check(obj, stored_ladder_params(obj))
+            if result is not None:
+                if not result["ok"]:
+                    warn = box.box()
+                    warn.alert = True
+                    wcol = warn.column(align=True)
+                    wcol.label(text="Ladder geometry was modified!", icon='ERROR')
+                    for issue in result["issues"]:
+                        wcol.label(text=issue, icon='DOT')
+                    wcol.separator()
+                    wcol.label(text="Click to restore correct geometry:", icon='INFO')
+                    wcol.operator("dgm.ladder_restore", text="Restore Ladder", icon='FILE_REFRESH')
+            else:
+                _draw_legacy_integrity(box, obj)
+
+
+def _draw_legacy_integrity(box, obj):
+    """Dimension-based check for ladders committed before mesh signatures were stored."""
+    import mathutils as _mu
+
+    # Check 1: scale must be (1,1,1)
+    sx_scale, sy_scale, sz_scale = obj.scale
+    scale_ok = (abs(sx_scale - 1.0) < 1e-4
+                and abs(sy_scale - 1.0) < 1e-4
+                and abs(sz_scale - 1.0) < 1e-4)
+
+    # Check 2: recalculate expected from stored params and compare bounding box
+    _p = dict(
+        width         = obj.get('dgm_p_width',         0.440),
+        tube_diameter = obj.get('dgm_p_tube_diameter', 0.042),
+        rung_count    = obj.get('dgm_p_rung_count',    16),
+        rung_spacing  = obj.get('dgm_p_rung_spacing',  0.320),
+        ground_offset = obj.get('dgm_p_ground_offset', 0.340),
+        top_extension = obj.get('dgm_p_top_extension', 0.700),
+        resolution    = obj.get('dgm_p_resolution',    8),
+        cage_enabled  = obj.get('dgm_p_cage_enabled',  False),
+        cage_depth    = obj.get('dgm_p_cage_depth',    0.350),
+        cage_tube_d   = obj.get('dgm_p_tube_diameter', 0.042),
+    )
+    # Use local bounding box (no matrix_world) so scale is detected separately
+    local_corners = [_mu.Vector(c) for c in obj.bound_box]
+    lxs = [c.x for c in local_corners]
+    lys = [c.y for c in local_corners]
+    lzs = [c.z for c in local_corners]
+    actual_h = max(lzs) - min(lzs)
+    actual_w = max(lxs) - min(lxs)
+    actual_d = max(lys) - min(lys)
+
+    _, _total_h = ladder_dimensions(_p)
+    expected_h = round(_total_h, 4)
+    expected_w = round(_p['width'] + _p['tube_diameter'], 4)
+    expected_d = _calc_expected_depth(_p)
+
+    TOL = 0.005  # 5 mm tolerance
+    height_ok = abs(actual_h - expected_h) < TOL
+    width_ok  = abs(actual_w - expected_w) < TOL
+    depth_ok  = abs(actual_d - expected_d) < TOL
+
+    # Check 3: vertex count against the stored analytical layout —
+    # catches added / deleted geometry that keeps the bounding box
+    try:
+        expected_v = json.loads(obj.get('dgm_ladder_layout', '{}')).get('verts')
+    except ValueError:
+        expected_v = None
+    actual_v = len(obj.data.vertices)
+    verts_ok = expected_v is None or actual_v == expected_v
+
+    if not scale_ok or not (height_ok and width_ok and depth_ok and verts_ok):
+        warn = box.box()
+        warn.alert = True
+        wcol = warn.column(align=True)
+        wcol.label(text="Ladder geometry was modified!", icon='ERROR')
+        if not scale_ok:
+            wcol.label(
+                text="Scale: X={:.3f} Y={:.3f} Z={:.3f}  (must be 1,1,1)".format(
+                    sx_scale, sy_scale, sz_scale),
+                icon='DOT')
+        if not height_ok:
+            wcol.label(
+                text="Height: {:.3f} m  (expected {:.3f} m)".format(
+                    actual_h, expected_h),
+                icon='DOT')
+        if not width_ok:
+            wcol.label(
+                text="Width:  {:.3f} m  (expected {:.3f} m)".format(
+                    actual_w, expected_w),
+                icon='DOT')
+        if not depth_ok:
+            wcol.label(
+                text="Depth:  {:.3f} m  (expected {:.3f} m)".format(
+                    actual_d, expected_d),
+                icon='DOT')
+        if not verts_ok:
+            wcol.label(
+                text="Vertices: {}  (expected {})".format(actual_v, expected_v),
+                icon='DOT')
+        wcol.separator()
+        wcol.label(text="Click to restore correct geometry:", icon='INFO')
+        wcol.operator("dgm.ladder_restore", text="Restore Ladder", icon='FILE_REFRESH')
 
 
 # ---------------------------------------------------------------------------
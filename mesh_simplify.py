@@ -0,0 +1,847 @@
+"""
+DayZ Geometry Maker - Mesh Simplifier
+Quadric-error edge-collapse simplification over plain NumPy arrays.
+
+No bpy in here on purpose: the simplifier only sees vertex / triangle arrays,
+so it can run anywhere (including worker processes). Blender-side extraction
+and write-back lives in geometry.py.
+
+Features that must survive decimation:
+  - UV seams, material boundaries and explicit feature edges (sharp edges)
+  - open borders
+  - named-selection boundaries — vertices of different vertex-group sets are
+    never merged, and the boundary between two sets is kept as a feature line
+Vertices on a feature line may only slide along that line; feature corners
+(1 or 3+ feature edges) never move.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Cosine limit for the normal of a face moved by a collapse.
+# Collapses that would tilt a face further than this are rejected.
+FLIP_LIMIT = 0.2
+
+# Weight of the constraint planes along feature edges, relative to face planes
+FEATURE_WEIGHT = 10.0
+
+# Corner attributes (UVs) closer than this are treated as equal
+ATTR_EPSILON = 1e-5
+
+MAX_PASSES = 512
+
+# Independent-set rounds per pass and rank buckets per halving of edge cost
+SELECT_ROUNDS = 3
+COST_BUCKETS = 2
+
+# Candidate collapses fold-tested per chunk
+FLIP_CHUNK = 65536
+
+
+# ---------------------------------------------------------------------------
+# Quadric helpers — a quadric is packed as 10 floats (symmetric 4x4)
+# ---------------------------------------------------------------------------
+
+def _pack_planes(n, d, w):
+    """Weighted plane quadrics for unit normals n (M,3) and offsets d (M,)."""
+    a, b, c = n[:, 0], n[:, 1], n[:, 2]
+    q = np.stack([a * a, a * b, a * c, a * d,
+                  b * b, b * c, b * d,
+                  c * c, c * d,
+                  d * d], axis=1)
+    return q * w[:, None]
+
+
+def _accumulate(q, index, size):
+    """Sum quadric rows q (M,10) into `size` slots by index (M,)."""
+    out = np.empty((size, 10))
+    for k in range(10):
+        out[:, k] = np.bincount(index, weights=q[:, k], minlength=size)
+    return out
+
+
+def quadric_error(q, p):
+    """Evaluate quadrics q (M,10) at points p (M,3)."""
+    x, y, z = p[:, 0], p[:, 1], p[:, 2]
+    return (q[:, 0] * x * x + 2 * q[:, 1] * x * y + 2 * q[:, 2] * x * z + 2 * q[:, 3] * x
+            + q[:, 4] * y * y + 2 * q[:, 5] * y * z + 2 * q[:, 6] * y
+            + q[:, 7] * z * z + 2 * q[:, 8] * z
+            + q[:, 9])
+
+
+def _optimal_points(q, p0, p1):
+    """
+    Position minimising each quadric (closed-form 3x3 solve). Falls back to
+    the best of the midpoint and the two endpoints where the system is
+    singular or the solution lands far away from the edge.
+    """
+    a00, a01, a02, b0 = q[:, 0], q[:, 1], q[:, 2], -q[:, 3]
+    a11, a12, b1 = q[:, 4], q[:, 5], -q[:, 6]
+    a22, b2 = q[:, 7], -q[:, 8]
+
+    c00 = a11 * a22 - a12 * a12
+    c01 = a02 * a12 - a01 * a22
+    c02 = a01 * a12 - a02 * a11
+    c11 = a00 * a22 - a02 * a02
+    c12 = a01 * a02 - a00 * a12
+    c22 = a00 * a11 - a01 * a01
+    det = a00 * c00 + a01 * c01 + a02 * c02
+
+    scale = np.maximum(np.maximum(np.abs(a00), np.abs(a11)), np.abs(a22))
+    ok = np.abs(det) > 1e-9 * np.maximum(scale, 1e-30) ** 3
+    inv = 1.0 / np.where(ok, det, 1.0)
+    out = np.stack([c00 * b0 + c01 * b1 + c02 * b2,
+                    c01 * b0 + c11 * b1 + c12 * b2,
+                    c02 * b0 + c12 * b1 + c22 * b2], axis=1) * inv[:, None]
+
+    mid = (p0 + p1) * 0.5
+    length = np.linalg.norm(p1 - p0, axis=1)
+    ok &= np.linalg.norm(out - mid, axis=1) <= 2.0 * length
+
+    bad = ~ok
+    if bad.any():
+        qb = q[bad]
+        cands = np.stack([mid[bad], p0[bad], p1[bad]])
+        errs = np.stack([quadric_error(qb, c) for c in cands])
+        out[bad] = cands[np.argmin(errs, axis=0), np.arange(bad.sum())]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Array helpers
+# ---------------------------------------------------------------------------
+
+def _scatter_min(index, values, size, fill):
+    """out[i] = min(values[index == i]), `fill` where nothing lands."""
+    out = np.full(size, fill, dtype=values.dtype)
+    np.minimum.at(out, index, values)
+    return out
+
+
+def _isin_sorted(a, sorted_b):
+    if not len(sorted_b):
+        return np.zeros(len(a), dtype=bool)
+    pos = np.searchsorted(sorted_b, a)
+    pos[pos == len(sorted_b)] = 0
+    return sorted_b[pos] == a
+
+
+def _cross(a, b):
+    """Row-wise cross product of (M,3) arrays."""
+    return np.stack([a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                     a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                     a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]], axis=1)
+
+
+def _gather_ranges(starts, ends):
+    """Owner and flat index for every element of the ranges [starts, ends)."""
+    lens = ends - starts
+    owner = np.repeat(np.arange(len(lens)), lens)
+    offs = np.cumsum(lens) - lens
+    idx = np.arange(lens.sum()) - np.repeat(offs, lens) + np.repeat(starts, lens)
+    return owner, idx
+
+
+# ---------------------------------------------------------------------------
+# Simplifier
+# ---------------------------------------------------------------------------
+
+class Simplifier:
+    """
+    Progressive simplifier. Call simplify() with decreasing triangle targets
+    and result() after each one to snapshot that level — every level is
+    built from the previous one, and its error is measured against the
+    original surface because quadrics keep accumulating.
+
+    co             (V,3) vertex positions
+    tris           (F,3) triangle vertex indices
+    corner_attrs   (F,3,C) per-corner floats (UV layers), optional
+    face_attrs     (F,A) per-face ints (material index, smooth flag), optional
+    vertex_sets    (V,) id of each vertex's named-selection set, optional
+    feature_edges  (M,2) extra edges to keep (sharp edges, marked seams)
+    edge_sets      {name: (M,2)} edge lists to carry through to the result
+    """
+
+    def __init__(self, co, tris, corner_attrs=None, face_attrs=None,
+                 vertex_sets=None, feature_edges=None, edge_sets=None):
+        self.co = np.array(co, dtype=np.float64).reshape(-1, 3)
+        self.tris = np.array(tris, dtype=np.int64).reshape(-1, 3)
+        self.n = n = len(self.co)
+        f = len(self.tris)
+
+        if corner_attrs is None:
+            self.corner = np.zeros((f, 3, 0))
+        else:
+            self.corner = np.array(corner_attrs, dtype=np.float64).reshape(f, 3, -1)
+        if face_attrs is None:
+            self.face_attrs = np.zeros((f, 0), dtype=np.int64)
+        else:
+            self.face_attrs = np.array(face_attrs, dtype=np.int64).reshape(f, -1)
+        if vertex_sets is None:
+            self.vsets = np.zeros(n, dtype=np.int64)
+        else:
+            self.vsets = np.asarray(vertex_sets, dtype=np.int64)
+
+        self.source_tris = f
+        self._keep_faces(self._non_degenerate(self.tris))
+
+        self.edge_sets = {
+            name: self._encode(pairs) for name, pairs in (edge_sets or {}).items()
+        }
+        self.locked = np.zeros(n, dtype=bool)
+        self.feature_keys = self._detect_features(feature_edges)
+        self.quadrics, self.area = self._initial_quadrics()
+        self._cache = None
+        self._dirty = None
+
+        # Collapse costs are area * distance^2; anything under a micron-scale
+        # deviation on this mesh is ranked as zero.
+        if n:
+            diag = float(np.linalg.norm(self.co.max(axis=0) - self.co.min(axis=0)))
+        else:
+            diag = 0.0
+        self.cost_floor = max(diag, 1e-6) ** 4 * 1e-12
+
+    # -- edge keys ---------------------------------------------------------
+
+    def _key(self, u, v):
+        return np.minimum(u, v) * self.n + np.maximum(u, v)
+
+    def _encode(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        return np.unique(self._key(pairs[:, 0], pairs[:, 1]))
+
+    def _remap_keys(self, keys, remap):
+        u = remap[keys // self.n]
+        v = remap[keys % self.n]
+        keep = u != v
+        return np.unique(self._key(u[keep], v[keep]))
+
+    @staticmethod
+    def _non_degenerate(t):
+        return (t[:, 0] != t[:, 1]) & (t[:, 1] != t[:, 2]) & (t[:, 0] != t[:, 2])
+
+    def _keep_faces(self, mask):
+        self.tris = self.tris[mask]
+        self.corner = self.corner[mask]
+        self.face_attrs = self.face_attrs[mask]
+
+    def _half_edges(self):
+        t = self.tris
+        u = t.ravel()
+        v = t[:, [1, 2, 0]].ravel()
+        return u, v
+
+    # -- setup -------------------------------------------------------------
+
+    def _detect_features(self, feature_edges):
+        t = self.tris
+        n = self.n
+        u, v = self._half_edges()
+        w = t[:, [2, 0, 1]].ravel()
+        keys = self._key(u, v)
+
+        order = np.argsort(keys, kind='stable')
+        ukeys, start, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+        # Open borders and non-manifold edges. Non-manifold vertices never move.
+        found = [ukeys[counts != 2]]
+        nm = ukeys[counts > 2]
+        self.locked[nm // n] = True
+        self.locked[nm % n] = True
+
+        two = counts == 2
+        h1 = order[start[two]]
+        h2 = order[start[two] + 1]
+        differs = np.zeros(len(h1), dtype=bool)
+
+        chans = self.corner.shape[2]
+        if chans:
+            corner = self.corner.reshape(-1, chans)
+
+            def ends(h):
+                nxt = (h // 3) * 3 + (h % 3 + 1) % 3
+                swap = (u[h] > v[h])[:, None]
+                a, b = corner[h], corner[nxt]
+                return np.where(swap, b, a), np.where(swap, a, b)
+
+            lo1, hi1 = ends(h1)
+            lo2, hi2 = ends(h2)
+            differs |= (np.abs(lo1 - lo2) > ATTR_EPSILON).any(axis=1)
+            differs |= (np.abs(hi1 - hi2) > ATTR_EPSILON).any(axis=1)
+
+        if self.face_attrs.shape[1]:
+            differs |= (self.face_attrs[h1 // 3] != self.face_attrs[h2 // 3]).any(axis=1)
+        found.append(ukeys[two][differs])
+
+        # Named-selection boundary: edge inside one set whose face reaches
+        # into another set.
+        s = self.vsets
+        along = (s[u] == s[v]) & (s[w] != s[u])
+        found.append(keys[along])
+
+        if feature_edges is not None and len(feature_edges):
+            found.append(self._encode(feature_edges))
+
+        return np.unique(np.concatenate(found))
+
+    def _initial_quadrics(self):
+        t = self.tris
+        n = self.n
+        co = self.co
+        p0, p1, p2 = co[t[:, 0]], co[t[:, 1]], co[t[:, 2]]
+        nrm = np.cross(p1 - p0, p2 - p0)
+        dbl = np.linalg.norm(nrm, axis=1)
+        unit = nrm / np.where(dbl > 0, dbl, 1.0)[:, None]
+        area = dbl * 0.5
+        d = -(unit * p0).sum(axis=1)
+
+        planes = _pack_planes(unit, d, area)
+        idx = t.ravel()
+        q = _accumulate(np.repeat(planes, 3, axis=0), idx, n)
+        vert_area = np.bincount(idx, weights=np.repeat(area, 3), minlength=n)
+
+        # Constraint planes through feature edges, perpendicular to the face,
+        # so collapses that drag a feature line sideways are expensive.
+        u, v = self._half_edges()
+        on_feature = _isin_sorted(self._key(u, v), self.feature_keys)
+        if on_feature.any():
+            hu, hv = u[on_feature], v[on_feature]
+            fn = unit[np.nonzero(on_feature)[0] // 3]
+            edge = co[hv] - co[hu]
+            cn = np.cross(edge, fn)
+            ln = np.linalg.norm(cn, axis=1)
+            good = ln > 0
+            cn = cn[good] / ln[good][:, None]
+            cd = -(cn * co[hu[good]]).sum(axis=1)
+            cw = FEATURE_WEIGHT * (edge[good] ** 2).sum(axis=1)
+            cq = _pack_planes(cn, cd, cw)
+            q += _accumulate(np.concatenate([cq, cq]),
+                             np.concatenate([hu[good], hv[good]]), n)
+
+        return q, vert_area
+
+    # -- simplification ----------------------------------------------------
+
+    def simplify(self, target_tris):
+        """Collapse edges until at most target_tris remain (or nothing can go)."""
+        target = max(int(target_tris), 1)
+        for _ in range(MAX_PASSES):
+            excess = len(self.tris) - target
+            if excess <= 0:
+                break
+            if not self._collapse_pass(excess):
+                break
+        return len(self.tris)
+
+    def _collapse_pass(self, excess):
+        n = self.n
+        u, v = self._half_edges()
+        ekeys, face_count = np.unique(self._key(u, v), return_counts=True)
+        ea = ekeys // n
+        eb = ekeys % n
+
+        # Candidates are cached between passes: an edge is only re-evaluated
+        # when something in the 1-ring of either endpoint changed.
+        m = len(ekeys)
+        keep = np.empty(m, dtype=np.int64)
+        rem = np.empty(m, dtype=np.int64)
+        pos = np.empty((m, 3))
+        cost = np.empty(m)
+        free = np.empty(m, dtype=bool)
+        checked = np.empty(m, dtype=bool)
+
+        cache = self._cache
+        if cache is None or not len(cache['keys']):
+            dirty = np.ones(m, dtype=bool)
+        else:
+            dirty = self._dirty[ea] | self._dirty[eb]
+            clean = np.nonzero(~dirty)[0]
+            at = np.minimum(np.searchsorted(cache['keys'], ekeys[clean]),
+                            len(cache['keys']) - 1)
+            found = cache['keys'][at] == ekeys[clean]
+            dirty[clean[~found]] = True
+            clean, at = clean[found], at[found]
+            for name, arr in (('keep', keep), ('rem', rem), ('pos', pos),
+                              ('cost', cost), ('free', free), ('checked', checked)):
+                arr[clean] = cache[name][at]
+
+        d = np.nonzero(dirty)[0]
+        if len(d):
+            keep[d], rem[d], pos[d], cost[d], free[d] = self._candidates(ea[d], eb[d], ekeys[d])
+            checked[d] = False
+        self._cache = {'keys': ekeys, 'keep': keep, 'rem': rem, 'pos': pos,
+                       'cost': cost, 'free': free, 'checked': checked}
+
+        snap = ~free
+        valid = np.isfinite(cost)
+        if not valid.any():
+            return 0
+
+        # Only the cheaper half of the candidates compete at first, which
+        # keeps the batched order close to a true greedy collapse order.
+        # If none of those survive, everything valid gets a turn. Fold
+        # tests run lazily, only on edges that are actually in the running.
+        sel = np.zeros(0, dtype=np.int64)
+        for pool in (valid & (cost <= np.median(cost[valid])), valid):
+            todo = np.nonzero(pool & ~checked)[0]
+            if len(todo):
+                self._check_folds(todo, ea, eb, keep, rem, pos, cost, free)
+                checked[todo] = True
+            pool &= np.isfinite(cost)
+            sel = self._select(ea, eb, cost, pool, keep, rem, face_count)
+            if len(sel):
+                break
+        if not len(sel):
+            return 0
+
+        sel = sel[np.argsort(cost[sel], kind='stable')]
+        removed = np.cumsum(face_count[sel])
+        cut = int(np.searchsorted(removed, excess)) + 1
+        sel = sel[:cut]
+
+        before = len(self.tris)
+        self._apply(keep[sel], rem[sel], pos[sel], snap[sel])
+        return before - len(self.tris)
+
+    def _candidates(self, ea, eb, ekeys):
+        """
+        Collapse candidate for each edge: kept vertex, removed vertex, new
+        position and quadric cost (inf where the collapse isn't allowed).
+        free marks collapses where both endpoints are off feature lines and
+        the kept vertex moves. Fold-over is tested later, see _check_folds.
+        """
+        n = self.n
+        co = self.co
+        fk = self.feature_keys
+        deg = np.bincount(fk // n, minlength=n) + np.bincount(fk % n, minlength=n)
+        feat_v = deg > 0
+        line_v = (deg == 2) & ~self.locked
+        is_feat = _isin_sorted(ekeys, fk)
+
+        fa = feat_v[ea]
+        fb = feat_v[eb]
+        same = self.vsets[ea] == self.vsets[eb]
+        free = same & ~fa & ~fb
+        snap_to_a = same & fa & ~fb
+        snap_to_b = same & ~fa & fb
+        both = same & fa & fb & is_feat & (line_v[ea] | line_v[eb])
+
+        keep = ea.copy()
+        rem = eb.copy()
+        pos = co[ea].copy()
+        cost = np.full(len(ea), np.inf)
+        qsum = self.quadrics[ea] + self.quadrics[eb]
+
+        if free.any():
+            p = _optimal_points(qsum[free], co[ea[free]], co[eb[free]])
+            pos[free] = p
+            cost[free] = quadric_error(qsum[free], p)
+
+        if snap_to_a.any():
+            cost[snap_to_a] = quadric_error(qsum[snap_to_a], co[ea[snap_to_a]])
+
+        if snap_to_b.any():
+            keep[snap_to_b] = eb[snap_to_b]
+            rem[snap_to_b] = ea[snap_to_b]
+            pos[snap_to_b] = co[eb[snap_to_b]]
+            cost[snap_to_b] = quadric_error(qsum[snap_to_b], co[eb[snap_to_b]])
+
+        if both.any():
+            qb = qsum[both]
+            at_a = np.where(line_v[eb[both]], quadric_error(qb, co[ea[both]]), np.inf)
+            at_b = np.where(line_v[ea[both]], quadric_error(qb, co[eb[both]]), np.inf)
+            idx = np.nonzero(both)[0]
+            flip = idx[at_b < at_a]
+            keep[flip] = eb[flip]
+            rem[flip] = ea[flip]
+            pos[idx] = co[keep[idx]]
+            cost[idx] = np.minimum(at_a, at_b)
+
+        cost = np.maximum(cost, 0.0)
+        return keep, rem, pos, cost, free
+
+    def _select(self, ea, eb, cost, valid, keep, rem, face_count):
+        """
+        Rank-based independent set: an edge wins when it is the cheapest
+        candidate over every face touching either endpoint, so no face is
+        modified by two collapses in the same pass. A few rounds are run,
+        each one skipping the neighbourhoods already claimed.
+        """
+        n = self.n
+        t = self.tris
+        big = len(ea) + 1
+
+        # Costs are ranked in coarse buckets with a hashed tie-break, so flat
+        # or regular areas don't degenerate into one long monotone ordering
+        # with almost no local minima. Anything below the noise floor ties.
+        safe = np.maximum(np.where(valid, cost, 0.0), self.cost_floor)
+        bucket = np.floor(np.log2(safe) * COST_BUCKETS).astype(np.int64)
+        bucket[~valid] = np.iinfo(np.int64).max
+        tie = ((ea * 2654435761 + eb * 40503) % 4294967291).astype(np.int64)
+        order = np.lexsort((tie, bucket))
+        rank = np.empty(len(ea), dtype=np.int64)
+        rank[order] = np.arange(len(ea))
+
+        valid = valid.copy()
+        claimed = np.zeros(n, dtype=bool)
+        chosen = []
+        for _ in range(SELECT_ROUNDS):
+            cand = np.nonzero(valid & ~claimed[ea] & ~claimed[eb])[0]
+            if not len(cand):
+                break
+            vmin = _scatter_min(np.concatenate([ea[cand], eb[cand]]),
+                                np.concatenate([rank[cand], rank[cand]]), n, big)
+            fmin = vmin[t].min(axis=1)
+            vmin2 = _scatter_min(t.ravel(), np.repeat(fmin, 3), n, big)
+            won = cand[(rank[cand] == vmin2[ea[cand]]) & (rank[cand] == vmin2[eb[cand]])]
+            if not len(won):
+                break
+
+            # Losers of the link test drop out without claiming anything.
+            ok = self._link_condition(keep[won], rem[won], face_count[won], ea, eb)
+            valid[won[~ok]] = False
+            won = won[ok]
+            if not len(won):
+                continue
+
+            chosen.append(won)
+            hit = np.zeros(n, dtype=bool)
+            hit[ea[won]] = True
+            hit[eb[won]] = True
+            claimed[t[hit[t].any(axis=1)].ravel()] = True
+
+        if not chosen:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(chosen)
+
+    def _check_folds(self, idx, ea, eb, keep, rem, pos, cost, free):
+        """
+        Fold-over test for the candidates idx, in place. A free collapse
+        that fails at its optimal point gets the midpoint, then either
+        endpoint; anything still folding gets cost inf.
+        """
+        co = self.co
+        star = self._vertex_faces()
+        ok = self._flips_ok(star, keep[idx], rem[idx], pos[idx], free[idx])
+        for alt in range(3):
+            pending = ~ok & free[idx]
+            retry = idx[pending]
+            if not len(retry):
+                break
+            if alt == 0:
+                pos[retry] = (co[ea[retry]] + co[eb[retry]]) * 0.5
+            else:
+                pos[retry] = co[(ea, eb)[alt - 1][retry]]
+            qsum = self.quadrics[ea[retry]] + self.quadrics[eb[retry]]
+            cost[retry] = np.maximum(quadric_error(qsum, pos[retry]), 0.0)
+            ok[pending] = self._flips_ok(star, keep[retry], rem[retry], pos[retry], free[retry])
+        cost[idx[~ok]] = np.inf
+
+    def _vertex_faces(self):
+        """(sorted vertex per corner, face per corner) — a vertex->faces CSR."""
+        flat = self.tris.ravel()
+        order = np.argsort(flat, kind='stable')
+        return flat[order], order // 3
+
+    def _flips_ok(self, star, keep, rem, pos, moves_keep):
+        """
+        False for collapses that would fold, flip or flatten a surviving face.
+        Faces around the removed vertex always move; faces around the kept
+        vertex only when it moves too (free collapses). Runs in chunks to
+        keep memory flat on big meshes.
+        """
+        t = self.tris
+        vert_sorted, face_of = star
+        limit2 = FLIP_LIMIT * FLIP_LIMIT
+        tiny = 1e-28
+
+        ok = np.ones(len(keep), dtype=bool)
+        for lo in range(0, len(keep), FLIP_CHUNK):
+            hi = min(lo + FLIP_CHUNK, len(keep))
+            k = keep[lo:hi]
+            r = rem[lo:hi]
+            mk = np.nonzero(moves_keep[lo:hi])[0]
+            ends = np.concatenate([r, k[mk]])
+            owners = np.concatenate([np.arange(hi - lo), mk])
+            own, at = _gather_ranges(np.searchsorted(vert_sorted, ends, 'left'),
+                                     np.searchsorted(vert_sorted, ends, 'right'))
+            own = owners[own]
+            tt = t[face_of[at]]
+            is_k = tt == k[own][:, None]
+            is_r = tt == r[own][:, None]
+            live = ~(is_k.any(axis=1) & is_r.any(axis=1))
+            own, tt = own[live], tt[live]
+            corner = (is_k[live] | is_r[live]).argmax(axis=1)
+
+            p = self.co[tt]
+            q = p.copy()
+            q[np.arange(len(q)), corner] = pos[lo:hi][own]
+            n_old = _cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+            n_new = _cross(q[:, 1] - q[:, 0], q[:, 2] - q[:, 0])
+            l_old = (n_old * n_old).sum(axis=1)
+            l_new = (n_new * n_new).sum(axis=1)
+            dot = (n_old * n_new).sum(axis=1)
+            bad = (l_old > tiny) & ((l_new <= tiny) | (dot <= 0.0)
+                                    | (dot * dot < limit2 * l_old * l_new))
+            ok[lo + own[bad]] = False
+        return ok
+
+    def _link_condition(self, keep, rem, face_count, ea, eb):
+        """Reject collapses whose endpoints share more neighbours than faces."""
+        if not len(keep):
+            return np.zeros(0, dtype=bool)
+        n = self.n
+        src = np.concatenate([ea, eb])
+        dst = np.concatenate([eb, ea])
+        order = np.argsort(src, kind='stable')
+        src = src[order]
+        dst = dst[order]
+
+        ends = np.concatenate([keep, rem])
+        owner, idx = _gather_ranges(np.searchsorted(src, ends, 'left'),
+                                    np.searchsorted(src, ends, 'right'))
+        owner %= len(keep)
+        tagged = owner * n + dst[idx]
+        uniq, cnt = np.unique(tagged, return_counts=True)
+        common = np.bincount(uniq[cnt > 1] // n, minlength=len(keep))
+        return common <= face_count
+
+    def _apply(self, keep, rem, pos, snap):
+        if self.corner.shape[2]:
+            self._update_corners(keep, rem, pos, snap)
+
+        self.co[keep] = pos
+        self.quadrics[keep] += self.quadrics[rem]
+        self.area[keep] += self.area[rem]
+
+        remap = np.arange(self.n)
+        remap[rem] = keep
+        self.tris = remap[self.tris]
+        self._keep_faces(self._non_degenerate(self.tris))
+
+        # Everything in the 1-ring of a kept vertex needs re-evaluating
+        moved = np.zeros(self.n, dtype=bool)
+        moved[keep] = True
+        self._dirty = np.zeros(self.n, dtype=bool)
+        self._dirty[self.tris[moved[self.tris].any(axis=1)].ravel()] = True
+
+        self.feature_keys = self._remap_keys(self.feature_keys, remap)
+        for name, keys in self.edge_sets.items():
+            self.edge_sets[name] = self._remap_keys(keys, remap)
+
+    def _update_corners(self, keep, rem, pos, snap):
+        t = self.tris
+        cor = self.corner
+        chans = cor.shape[2]
+        cid = np.full(self.n, -1, dtype=np.int64)
+        ids = np.arange(len(keep))
+        cid[keep] = ids
+        cid[rem] = ids
+        ccid = cid[t]
+        hit = ccid >= 0
+        safe = np.where(hit, ccid, 0)
+
+        # Free collapses: attributes are continuous around both vertices, so
+        # interpolate along the edge to the new position.
+        free = ~snap
+        if free.any():
+            vattr = np.zeros((self.n, chans))
+            vattr[t.ravel()] = cor.reshape(-1, chans)
+            a = vattr[keep]
+            b = vattr[rem]
+            seg = self.co[rem] - self.co[keep]
+            l2 = (seg * seg).sum(axis=1)
+            s = ((pos - self.co[keep]) * seg).sum(axis=1) / np.where(l2 > 0, l2, 1.0)
+            s = np.clip(s, 0.0, 1.0)
+            new = a + s[:, None] * (b - a)
+            m = hit & free[safe]
+            cor[m] = new[ccid[m]]
+
+        # Snap collapses: the removed vertex takes the kept vertex's value
+        # from the same side of the seam, read off the faces being deleted.
+        if snap.any():
+            fcid = np.where(hit, ccid, -1).max(axis=1)
+            fsafe = np.maximum(fcid, 0)
+            is_k = t == keep[fsafe][:, None]
+            is_r = t == rem[fsafe][:, None]
+            dying = np.nonzero((fcid >= 0) & snap[fsafe] & is_k.any(axis=1) & is_r.any(axis=1))[0]
+            dc = fcid[dying]
+            ka = cor[dying, is_k[dying].argmax(axis=1)]
+            ra = cor[dying, is_r[dying].argmax(axis=1)]
+
+            order = np.argsort(dc, kind='stable')
+            dc, ka, ra = dc[order], ka[order], ra[order]
+            first = np.r_[True, dc[1:] != dc[:-1]]
+            side1_k = np.zeros((len(keep), chans))
+            side1_r = np.zeros((len(keep), chans))
+            side1_k[dc[first]] = ka[first]
+            side1_r[dc[first]] = ra[first]
+            side2_k = side1_k.copy()
+            side2_r = side1_r.copy()
+            side2_k[dc[~first]] = ka[~first]
+            side2_r[dc[~first]] = ra[~first]
+
+            m = hit & snap[safe] & (t == rem[safe])
+            c = ccid[m]
+            val = cor[m]
+            d1 = ((val - side1_r[c]) ** 2).sum(axis=1)
+            d2 = ((val - side2_r[c]) ** 2).sum(axis=1)
+            cor[m] = np.where((d1 <= d2)[:, None], side1_k[c], side2_k[c])
+
+    # -- output ------------------------------------------------------------
+
+    def result(self):
+        """
+        Compact snapshot of the current level:
+          co, tris, corner_attrs, face_attrs  — arrays for the new mesh
+          vertex_source — original index of every output vertex
+          edge_sets     — carried edge lists in output indices
+          tris_count, error_max, error_mean — metrics (error in model units,
+                                              RMS distance to source planes)
+        """
+        t = self.tris
+        if len(t):
+            _, first = np.unique(np.sort(t, axis=1), axis=0, return_index=True)
+            first.sort()
+        else:
+            first = np.zeros(0, dtype=np.int64)
+        t = t[first]
+
+        used = np.unique(t)
+        index = np.full(self.n, -1, dtype=np.int64)
+        index[used] = np.arange(len(used))
+
+        edge_sets = {}
+        for name, keys in self.edge_sets.items():
+            a = index[keys // self.n]
+            b = index[keys % self.n]
+            ok = (a >= 0) & (b >= 0)
+            edge_sets[name] = np.stack([a[ok], b[ok]], axis=1)
+
+        if len(used):
+            err = quadric_error(self.quadrics[used], self.co[used])
+            err = np.sqrt(np.maximum(err, 0.0) / np.maximum(self.area[used], 1e-12))
+            error_max = float(err.max())
+            error_mean = float(err.mean())
+        else:
+            error_max = error_mean = 0.0
+
+        return {
+            'co': self.co[used],
+            'tris': index[t],
+            'corner_attrs': self.corner[first],
+            'face_attrs': self.face_attrs[first],
+            'vertex_source': used,
+            'edge_sets': edge_sets,
+            'tris_count': len(t),
+            'error_max': error_max,
+            'error_mean': error_mean,
+        }
+
+
+def simplify_levels(mesh_data, targets):
+    """
+    Build a progressive chain: each target is reached from the previous
+    level. mesh_data holds the Simplifier keyword arguments.
+    Returns one result() dict per target.
+    """
+    simplifier = Simplifier(**mesh_data)
+    levels = []
+    for target in targets:
+        simplifier.simplify(target)
+        levels.append(simplifier.result())
+    return levels
+
+
+# ---------------------------------------------------------------------------
+# Worker process entry point
+#
+#   python mesh_simplify.py <source.npz> <result.npz> <target> [<target> ...]
+#
+# geometry.py starts one of these per LOD so levels build concurrently and
+# Blender stays responsive. Arrays travel as .npz files: no pickling of addon
+# modules, and the worker never needs bpy or the addon package.
+# ---------------------------------------------------------------------------
+
+_EDGE_SET_PREFIX = "edge_set:"
+
+
+def save_source(path, mesh_data):
+    """Write Simplifier keyword arguments to an .npz file."""
+    arrays = {}
+    for key, value in mesh_data.items():
+        if value is None:
+            continue
+        if key == "edge_sets":
+            for name, pairs in value.items():
+                arrays[_EDGE_SET_PREFIX + name] = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        else:
+            arrays[key] = np.asarray(value)
+    np.savez(path, **arrays)
+
+
+def load_source(path):
+    """Inverse of save_source."""
+    mesh_data = {"edge_sets": {}}
+    with np.load(path) as data:
+        for key in data.files:
+            if key.startswith(_EDGE_SET_PREFIX):
+                mesh_data["edge_sets"][key[len(_EDGE_SET_PREFIX):]] = data[key]
+            else:
+                mesh_data[key] = data[key]
+    return mesh_data
+
+
+def save_levels(path, levels):
+    """Write a list of result() dicts to an .npz file."""
+    arrays = {"count": np.array(len(levels))}
+    for i, level in enumerate(levels):
+        prefix = "L{}/".format(i)
+        for key, value in level.items():
+            if key == "edge_sets":
+                for name, pairs in value.items():
+                    arrays[prefix + _EDGE_SET_PREFIX + name] = pairs
+            else:
+                arrays[prefix + key] = np.asarray(value)
+    np.savez(path, **arrays)
+
+
+def load_levels(path):
+    """Inverse of save_levels."""
+    with np.load(path) as data:
+        levels = [{"edge_sets": {}} for _ in range(int(data["count"]))]
+        for key in data.files:
+            if key == "count":
+                continue
+            prefix, name = key.split("/", 1)
+            level = levels[int(prefix[1:])]
+            if name.startswith(_EDGE_SET_PREFIX):
+                level["edge_sets"][name[len(_EDGE_SET_PREFIX):]] = data[key]
+            elif data[key].ndim == 0:
+                level[name] = data[key].item()
+            else:
+                level[name] = data[key]
+    return levels
+
+
+def _main(argv):
+    if len(argv) < 3:
+        print("usage: mesh_simplify.py <source.npz> <result.npz> <target> [<target> ...]")
+        return 2
+    source, result = argv[0], argv[1]
+    targets = [int(t) for t in argv[2:]]
+    levels = simplify_levels(load_source(source), targets)
+    # Write next to the final name and rename, so the poller never sees a
+    # half-written file.
+    tmp = result + ".part.npz"
+    save_levels(tmp, levels)
+    os.replace(tmp, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -12,6 +12,8 @@ Skeleton bones come from vertex groups that have a hidden_selection set.
 
 import os
 
+from .geometry import MAX_DOORS
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -64,7 +66,7 @@ def _collect_door_configs(scene):
     out = {}
     if scene is None:
         return out
-    for di in range(1, 9):
+    for di in range(1, MAX_DOORS + 1):
         vg = getattr(scene, 'dgm_door_{}_vgroup'.format(di), "").strip()
         if not vg:
             continue
@@ -4,7 +4,8 @@ DayZ Geometry Maker - Operators and Panel
 
 import bpy
 import math
-from . import geometry, updater, baker_bridge, ladder_generator, cabin_generator
+import re
+from . import geometry, updater, baker_bridge, ladder_generator, cabin_generator, preview, integrity, assets, template_library
 
 
 # ---------------------------------------------------------------------------
@@ -39,7 +40,9 @@ class DGM_OT_create_geometry(bpy.types.Operator):
         if not context.scene.dgm_target_object:
             self.report({'ERROR'}, "Select a target object first")
             return {'CANCELLED'}
-        geometry.create_geometry(mass=self.mass)
+        scene = context.scene
+        geometry.create_geometry(mass=self.mass, fit=scene.dgm_box_fit,
+                                 count=scene.dgm_box_fit_count)
         return {'FINISHED'}
 
 
@@ -90,7 +93,8 @@ class DGM_OT_create_view_geometry(bpy.types.Operator):
         if not context.scene.dgm_target_object:
             self.report({'ERROR'}, "Select a target object first")
             return {'CANCELLED'}
-        geometry.create_view_geometry()
+        scene = context.scene
+        geometry.create_view_geometry(fit=scene.dgm_box_fit, count=scene.dgm_box_fit_count)
         return {'FINISHED'}
 
 
@@ -142,8 +146,13 @@ class DGM_OT_create_shadow_volumes(bpy.types.Operator):
         if not context.scene.dgm_target_object:
             self.report({'ERROR'}, "Select a target object first")
             return {'CANCELLED'}
-        geometry.create_shadow_volumes()
-        self.report({'INFO'}, "Shadow Volume and Shadow Volume 2 created")
+        results = geometry.create_shadow_volumes(context.scene.dgm_shadow_far_tris)
+        problems = ["{} ({} open, {} non-manifold edges)".format(obj.name, open_edges, non_manifold)
+                    for obj, open_edges, non_manifold in results if open_edges or non_manifold]
+        if problems:
+            self.report({'WARNING'}, "Shadow volume not closed: " + ", ".join(problems))
+        else:
+            self.report({'INFO'}, "Shadow Volume and Shadow Volume 2 created")
         return {'FINISHED'}
 
 
@@ -197,7 +206,8 @@ class DGM_OT_create_land_contact(bpy.types.Operator):
     bl_label = "Create Land Contact"
     bl_description = (
         "Land Contact LOD (2e15): single vertices where object touches ground. "
-        "Creates 4 contact points at the base corners"
+        "Places contact points on the mesh's lowest vertices, spread for the "
+        "widest support"
     )
     bl_options = {'REGISTER', 'UNDO'}
 
@@ -205,7 +215,9 @@ class DGM_OT_create_land_contact(bpy.types.Operator):
         if not context.scene.dgm_target_object:
             self.report({'ERROR'}, "Select a target object first")
             return {'CANCELLED'}
-        geometry.create_land_contact()
+        scene = context.scene
+        geometry.create_land_contact(scene.dgm_land_contact_points,
+                                     scene.dgm_land_contact_tolerance)
         return {'FINISHED'}
 
 
@@ -373,6 +385,69 @@ class DGM_OT_memory_add_lights(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class DGM_OT_memory_detect_lights(bpy.types.Operator):
+    bl_idname = "dgm.memory_detect_lights"
+    bl_label = "Detect Lights"
+    bl_description = (
+        "Place light_N points from the mesh: light / lamp named selections, "
+        "or one point per patch of emissive faces"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        if not context.scene.dgm_target_object:
+            self.report({'ERROR'}, "Select a target object first")
+            return {'CANCELLED'}
+        count = geometry.add_memory_lights_from_mesh()
+        if not count:
+            self.report({'WARNING'}, "No light selections or emissive materials found")
+            return {'CANCELLED'}
+        context.scene.dgm_memory_lights_count = count
+        self.report({'INFO'}, "Placed {} light point(s)".format(count))
+        return {'FINISHED'}
+
+
+def _door_sort_key(name):
+    """Sort door groups on their number, so door2 comes before door10; unnumbered last."""
+    number = re.search(r"\d+", name)
+    return (int(number.group()) if number else float("inf"), name.lower())
+
+
+class DGM_OT_memory_detect_doors(bpy.types.Operator):
+    bl_idname = "dgm.memory_detect_doors"
+    bl_label = "Detect Doors"
+    bl_description = (
+        "Place door axis points on the hinge edge of each door's vertex group. "
+        "Uses the Door Geometry groups already set, otherwise vertex groups named door*"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scene = context.scene
+        target = scene.dgm_target_object
+        if not target or target.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh target object first")
+            return {'CANCELLED'}
+
+        names = [getattr(scene, 'dgm_door_{}_vgroup'.format(i), "").strip()
+                 for i in range(1, geometry.MAX_DOORS + 1)]
+        if not any(names):
+            found = sorted((vg.name for vg in target.vertex_groups
+                            if "door" in vg.name.lower() and "axis" not in vg.name.lower()),
+                           key=_door_sort_key)
+            names = (found + [""] * geometry.MAX_DOORS)[:geometry.MAX_DOORS]
+            for i, name in enumerate(names, 1):
+                setattr(scene, 'dgm_door_{}_vgroup'.format(i), name)
+
+        placed = geometry.add_memory_doors_from_mesh(names)
+        if not placed:
+            self.report({'WARNING'}, "No door vertex groups found")
+            return {'CANCELLED'}
+        scene.dgm_memory_doors_count = max(placed)
+        self.report({'INFO'}, "Placed axis points for {} door(s)".format(len(placed)))
+        return {'FINISHED'}
+
+
 class DGM_OT_memory_add_damage(bpy.types.Operator):
     bl_idname = "dgm.memory_add_damage"
     bl_label = "Damage Hide"
@@ -438,12 +513,10 @@ class DGM_OT_memory_move_point(bpy.types.Operator):
         mem.select_set(True)
         context.view_layer.objects.active = mem
 
-        for v in mem.data.vertices:
-            v.select = False
-        for v in mem.data.vertices:
-            for g in v.groups:
-                if g.group == vg.index:
-                    v.select = True
+        select = [False] * len(mem.data.vertices)
+        for i in geometry.memory_point_vertices(self.point_name):
+            select[i] = True
+        mem.data.vertices.foreach_set("select", select)
 
         bpy.ops.object.mode_set(mode='EDIT')
         bpy.ops.mesh.select_mode(type='VERT')
@@ -496,20 +569,15 @@ def _get_axis_midpoint_and_vector(door_idx):
     mem = geometry.get_memory_object()
     if not mem:
         return None, None
-    vg1 = mem.vertex_groups.get('door_{}_axis_1'.format(door_idx))
-    vg2 = mem.vertex_groups.get('door_{}_axis_2'.format(door_idx))
-    if not vg1 or not vg2:
-        return None, None
 
-    def _vert_for_group(vg):
-        for v in mem.data.vertices:
-            for g in v.groups:
-                if g.group == vg.index:
-                    return mem.matrix_world @ v.co
-        return None
+    def _vert_for_group(name):
+        verts = geometry.memory_point_vertices(name)
+        if not verts:
+            return None
+        return mem.matrix_world @ mem.data.vertices[verts[0]].co
 
-    p1 = _vert_for_group(vg1)
-    p2 = _vert_for_group(vg2)
+    p1 = _vert_for_group('door_{}_axis_1'.format(door_idx))
+    p2 = _vert_for_group('door_{}_axis_2'.format(door_idx))
     if p1 is None or p2 is None:
         return None, None
 
@@ -725,7 +793,45 @@ class DGM_OT_create_lods(bpy.types.Operator):
         if not context.scene.dgm_target_object:
             self.report({'ERROR'}, "Select a target object first")
             return {'CANCELLED'}
-        geometry.create_lod_meshes()
+        method = context.scene.dgm_lod_method
+        if ladder_generator.is_confirmed_ladder(context.scene.dgm_target_object):
+            # Generated ladders are rebuilt per LOD rather than decimated
+            lods = geometry.create_ladder_lods()
+            if lods:
+                self.report({'INFO'}, "{} ladder LODs created, {}: {} tris".format(
+                    len(lods), lods[-1].name, lods[-1]["dgm_lod_tris"]))
+        elif cabin_generator.is_confirmed_cabin(context.scene.dgm_target_object):
+            # Generated cabins too: openings are filled in at distance
+            lods = geometry.create_cabin_lods()
+            if lods:
+                self.report({'INFO'}, "{} cabin LODs created, {}: {} tris".format(
+                    len(lods), lods[-1].name, lods[-1]["dgm_lod_tris"]))
+        elif method == 'PARALLEL':
+            queued = geometry.create_lod_parallel()
+            if queued:
+                self.report({'INFO'}, "Building {} LODs in the background".format(queued))
+        elif method == 'CHAIN':
+            lods = geometry.create_lod_chain()
+            if lods:
+                self.report({'INFO'}, "{} LODs created, {}: {} tris".format(
+                    len(lods), lods[-1].name, lods[-1]["dgm_lod_tris"]))
+        else:
+            geometry.create_lod_meshes()
+        return {'FINISHED'}
+
+
+class DGM_OT_merge_duplicate_materials(bpy.types.Operator):
+    bl_idname = "dgm.merge_duplicate_materials"
+    bl_label = "Merge Duplicate Materials"
+    bl_description = (
+        "Merge materials with identical DayZ texture / rvmat settings across the "
+        "file into one, e.g. per-LOD copies left by older LOD generation"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        removed = geometry.merge_duplicate_materials()
+        self.report({'INFO'}, "Merged {} duplicate material(s)".format(removed))
         return {'FINISHED'}
 
 
@@ -966,6 +1072,124 @@ class DGM_OT_bake_selections(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class DGM_OT_cancel_bake(bpy.types.Operator):
+    bl_idname = "dgm.cancel_bake"
+    bl_label = "Cancel Bake"
+    bl_description = ("Stop queued and background selection bakes. "
+                      "A bake running in this Blender finishes first")
+
+    def execute(self, context):
+        baker_bridge.cancel_bake()
+        return {'FINISHED'}
+
+
+# ---------------------------------------------------------------------------
+# Main panel state cache
+# ---------------------------------------------------------------------------
+# draw() runs on every redraw, so what it needs to know about the Memory LOD
+# and the target's named selections is computed once and reused until the
+# Memory index or the target changes. Nothing here writes to blend data.
+
+_panel_cache = {"key": None, "state": None}
+
+
+def _panel_state(scene):
+    """
+    Cached panel facts:
+      memory  — names of the memory points that exist
+      ladders — {ladder index: [existing point names]} for slots in use
+      doors   — door indices with both axis points
+      stale   — indices of selection_mats whose vertex group is gone
+    """
+    target = scene.dgm_target_object
+    if target is not None:
+        target_key = (target.as_pointer(), len(target.vertex_groups),
+                      len(target.dgm_props.selection_mats), _target_generation)
+    else:
+        target_key = None
+    key = (geometry.memory_index_key(), target_key)
+    if _panel_cache["key"] == key:
+        return _panel_cache["state"]
+
+    memory = frozenset(geometry.memory_index())
+    ladders = {}
+    for li in range(1, 4):
+        present = [n for n in geometry.ladder_point_names(li) if n in memory]
+        if present:
+            ladders[li] = present
+    doors = frozenset(
+        di for di in range(1, geometry.MAX_DOORS + 1)
+        if 'door_{}_axis_1'.format(di) in memory and 'door_{}_axis_2'.format(di) in memory
+    )
+    stale = frozenset()
+    if target is not None:
+        groups = {vg.name for vg in target.vertex_groups}
+        stale = frozenset(i for i, sm in enumerate(target.dgm_props.selection_mats)
+                          if sm.vgroup_name not in groups)
+
+    state = {"memory": memory, "ladders": ladders, "doors": doors, "stale": stale}
+    _panel_cache["key"] = key
+    _panel_cache["state"] = state
+    return state
+
+
+_target_generation = 0
+
+
+def _invalidate_panel_state():
+    global _target_generation
+    _target_generation += 1
+
+
+@bpy.app.handlers.persistent
+def _panel_depsgraph_update(scene, depsgraph):
+    target = getattr(scene, "dgm_target_object", None)
+    if target is None:
+        return
+    pointer = target.as_pointer()
+    for update in depsgraph.updates:
+        if update.id.original.as_pointer() == pointer:
+            _invalidate_panel_state()
+            return
+
+
+def _cleanup_stale_selections_deferred():
+    """Timer: drop stale selection entries outside of draw()."""
+    target = getattr(bpy.context.scene, "dgm_target_object", None)
+    if target is not None:
+        _cleanup_stale_selections(target)
+        _invalidate_panel_state()
+    return None
+
+
+def _draw_bake_queue(layout, scene):
+    """Parallel bake options, or progress / ETA of the running per-selection bake."""
+    progress = baker_bridge.bake_progress()
+    if progress is None:
+        row = layout.row(align=True)
+        row.prop(scene, "dgm_bake_parallel", toggle=True, icon='MOD_ARRAY')
+        sub = row.row(align=True)
+        sub.enabled = scene.dgm_bake_parallel
+        sub.prop(scene, "dgm_bake_workers", text="At Once")
+        summary = baker_bridge.last_bake_summary()
+        if summary:
+            layout.label(text=summary, icon='CHECKMARK')
+        return
+
+    box = layout.box()
+    text = "Baking {}/{}".format(progress["done"], progress["total"])
+    if progress["failed"]:
+        text += "  ({} failed)".format(progress["failed"])
+    if progress["eta"] is not None:
+        text += "  —  ETA {}".format(baker_bridge.format_seconds(progress["eta"]))
+    box.label(text=text, icon='TIME')
+    box.progress(factor=progress["done"] / max(1, progress["total"]),
+                 text="{} elapsed".format(baker_bridge.format_seconds(progress["elapsed"])))
+    for name in progress["running"]:
+        box.label(text=name, icon='RENDER_STILL')
+    box.operator("dgm.cancel_bake", icon='CANCEL')
+
+
 def _draw_named_selections_content(layout, context):
     """Draw the Named Selections section body — call inside an expanded section box."""
     scene = context.scene
@@ -973,7 +1197,9 @@ def _draw_named_selections_content(layout, context):
     props = target.dgm_props
     baker_ok = baker_bridge.baker_licensed()
 
-    _cleanup_stale_selections(target)
+    stale = _panel_state(scene)["stale"]
+    if stale and not bpy.app.timers.is_registered(_cleanup_stale_selections_deferred):
+        bpy.app.timers.register(_cleanup_stale_selections_deferred, first_interval=0.0)
 
     add_row = layout.row(align=True)
     add_row.prop_search(scene, "dgm_pending_selection", target, "vertex_groups", text="")
@@ -1074,6 +1300,8 @@ def _draw_named_selections_content(layout, context):
 
             bake_box.operator("dgm.bake_selections", text="Bake Marked Selections", icon='RENDER_STILL')
 
+            _draw_bake_queue(bake_box, scene)
+
     if not props.selection_mats:
         layout.label(text="No selections — pick a vertex group and click +", icon='INFO')
         return
@@ -1081,6 +1309,8 @@ def _draw_named_selections_content(layout, context):
     layout.separator()
 
     for i, sm in enumerate(props.selection_mats):
+        if i in stale:
+            continue
         entry_box = layout.box()
         header = entry_box.row(align=True)
         header.label(text=sm.vgroup_name, icon='GROUP_VERTEX')
@@ -1104,6 +1334,99 @@ def _draw_named_selections_content(layout, context):
             col.prop(sm, "rv_mat", text="RVMat (.rvmat)")
 
 
+# ---------------------------------------------------------------------------
+# P3D templates
+# ---------------------------------------------------------------------------
+
+class DGM_OT_place_template(bpy.types.Operator):
+    bl_idname = "dgm.place_template"
+    bl_label = "Place Template"
+    bl_description = ("Place an instance of a template piece at the 3D cursor. "
+                      "Instances share their meshes and are expanded into the LODs on export")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: bpy.props.StringProperty()
+
+    def execute(self, context):
+        try:
+            inst = template_library.place_instance(self.name, context.scene.cursor.location.copy())
+        except Exception as e:
+            self.report({'ERROR'}, "Could not load template '{}': {}".format(self.name, e))
+            return {'CANCELLED'}
+        geometry.set_active(inst)
+        self.report({'INFO'}, "Placed {}".format(inst.name))
+        return {'FINISHED'}
+
+
+class DGM_OT_make_template_real(bpy.types.Operator):
+    bl_idname = "dgm.make_template_real"
+    bl_label = "Make Editable"
+    bl_description = "Replace the selected template instances with editable copies of their LOD parts"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return any(template_library.is_template_instance(o) for o in context.selected_objects)
+
+    def execute(self, context):
+        geometry.ensure_object_mode()
+        count = 0
+        for inst in [o for o in context.selected_objects if template_library.is_template_instance(o)]:
+            count += len(template_library.make_real(inst))
+        template_library.clear_unused()
+        self.report({'INFO'}, "Created {} editable part(s)".format(count))
+        return {'FINISHED'}
+
+
+class DGM_OT_reload_asset_templates(bpy.types.Operator):
+    bl_idname = "dgm.reload_asset_templates"
+    bl_label = "Reload Templates"
+    bl_description = ("Decode all template P3Ds again and refresh placed instances "
+                      "(changed files are also picked up when placing)")
+
+    def execute(self, context):
+        assets.clear()
+        failed = assets.preload()
+        for name in {o.get("dgm_template") for o in template_library.scene_instances(context.scene)}:
+            try:
+                template_library.library_collection(name)
+            except Exception as e:
+                print("[DGM] Failed to refresh template '{}': {}".format(name, e))
+                failed += 1
+        template_library.clear_unused()
+        if failed:
+            self.report({'WARNING'}, "{} template(s) could not be loaded, see console".format(failed))
+        return {'FINISHED'}
+
+
+def draw_asset_templates_section(box, context):
+    found = template_library.pieces()
+    if not found:
+        box.label(text="No templates found", icon='INFO')
+    placed = {}
+    for inst in template_library.scene_instances(context.scene):
+        placed[inst.get("dgm_template")] = placed.get(inst.get("dgm_template"), 0) + 1
+
+    for category, label, icon in template_library.CATEGORIES:
+        names = [n for n, p in found.items() if p["category"] == category]
+        if not names:
+            continue
+        col = box.column(align=True)
+        col.label(text=label, icon=icon)
+        for name in names:
+            row = col.row(align=True)
+            count = placed.get(name, 0)
+            row.label(text="{}  ({} placed)".format(name, count) if count else name,
+                      icon='BLANK1' if found[name]["source"] == "bundled" else 'USER')
+            row.operator("dgm.place_template", text="", icon='ADD').name = name
+
+    row = box.row(align=True)
+    row.operator("dgm.make_template_real", icon='OUTLINER_OB_GROUP_INSTANCE')
+    row.operator("dgm.reload_asset_templates", text="", icon='FILE_REFRESH')
+    if assets.user_assets_dir() is None:
+        box.label(text="Set a template folder in the addon preferences", icon='PREFERENCES')
+
+
 # ---------------------------------------------------------------------------
 # Main Panel
 # ---------------------------------------------------------------------------
@@ -1140,6 +1463,10 @@ class DGM_PT_generators(bpy.types.Panel):
         if is_open:
             cabin_generator.draw_cabin_generator_section(box, context)
 
+        box, is_open = _gen_section("dgm_show_templates", "Template Library", 'OUTLINER_OB_GROUP_INSTANCE')
+        if is_open:
+            draw_asset_templates_section(box, context)
+
 class DGM_PT_main_panel(bpy.types.Panel):
     bl_label = "DayZ Geometry Maker"
     bl_idname = "DGM_PT_main_panel"
@@ -1183,11 +1510,16 @@ class DGM_PT_main_panel(bpy.types.Panel):
         # ---- Collision / Functional Geometry ----
         box, is_open = _section_header("dgm_show_collision", "Collision & Functional")
         if is_open:
+            row = box.row(align=True)
+            row.prop(scene, "dgm_box_fit", text="")
+            if scene.dgm_box_fit == 'MULTI':
+                row.prop(scene, "dgm_box_fit_count", text="Boxes")
             col = box.column(align=True)
             col.operator("dgm.create_geometry",                text="Add Geometry")
             col.operator("dgm.create_geometry_from_selection", text="Add Geometry from Selection")
             col.operator("dgm.create_view_geometry",           text="View Geometry (6e15)")
             col.operator("dgm.create_fire_geometry",           text="Fire Geometry (7e15)")
+            box.prop(scene, "dgm_shadow_far_tris", text="Far Shadow Tris")
             box.operator("dgm.create_shadow_volumes",          text="Shadow Volumes (1e4 + 1.001e4)")
 
 
@@ -1203,6 +1535,9 @@ class DGM_PT_main_panel(bpy.types.Panel):
         box, is_open = _section_header("dgm_show_terrain", "Terrain & Navigation")
         if is_open:
             col = box.column(align=True)
+            lc_row = col.row(align=True)
+            lc_row.prop(scene, "dgm_land_contact_points", text="Points")
+            lc_row.prop(scene, "dgm_land_contact_tolerance", text="Tolerance")
             col.operator("dgm.create_land_contact", text="Land Contact (2e15)")
             col.operator("dgm.create_roadway",      text="Roadway (3e15)")
 
@@ -1210,6 +1545,8 @@ class DGM_PT_main_panel(bpy.types.Panel):
         box, is_open = _section_header("dgm_show_memory", "Memory Points (1e15)")
         if is_open:
             moving = scene.dgm_moving_memory_point
+            state = _panel_state(scene)
+            present = state["memory"]
 
             def _move_btn(row, point_name):
                 is_moving = (moving == point_name)
@@ -1222,7 +1559,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
                 if isinstance(point_names, str):
                     point_names = [point_names]
 
-                any_exists = any(geometry.memory_point_exists(n) for n in point_names)
+                any_exists = any(n in present for n in point_names)
 
                 hrow = parent.row(align=True)
                 dot_icon = 'KEYFRAME_HLT' if any_exists else 'KEYFRAME'
@@ -1235,7 +1572,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
 
                 if any_exists:
                     for pt in point_names:
-                        if not geometry.memory_point_exists(pt):
+                        if pt not in present:
                             continue
                         sub_row = parent.row(align=True)
                         sub_row.separator(factor=3.0)
@@ -1246,7 +1583,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
                 count = getattr(scene, count_prop)
                 all_names = name_fn(count)
                 flat_names = [n for grp in all_names for n in grp]
-                any_exists = any(geometry.memory_point_exists(n) for n in flat_names)
+                any_exists = any(n in present for n in flat_names)
 
                 hrow = parent.row(align=True)
                 dot_icon = 'KEYFRAME_HLT' if any_exists else 'KEYFRAME'
@@ -1265,7 +1602,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
                             grp_row.separator(factor=2.0)
                             grp_row.label(text=grp_label, icon='RIGHTARROW_THIN')
                         for pt in grp:
-                            if not geometry.memory_point_exists(pt):
+                            if pt not in present:
                                 continue
                             sub_row = parent.row(align=True)
                             sub_row.separator(factor=3.0)
@@ -1295,18 +1632,11 @@ class DGM_PT_main_panel(bpy.types.Panel):
             sub_hrow = sub.row(align=True)
             sub_hrow.label(text="", icon='KEYFRAME')
             sub_hrow.label(text="Ladders")
+            sub_hrow.operator("dgm.memory_add_all_ladders", text="All", icon='ADD')
 
             for li in range(1, 4):
-                prefix = "ladder{}".format(li)
-                lad_points = [
-                    prefix,
-                    prefix + '_bottom_front',
-                    prefix + '_con',
-                    prefix + '_con_dir',
-                    prefix + '_dir',
-                    prefix + '_top_front',
-                ]
-                lad_exists = any(geometry.memory_point_exists(n) for n in lad_points)
+                lad_present = state["ladders"].get(li, [])
+                lad_exists = bool(lad_present)
 
                 lrow = sub.row(align=True)
                 lrow.separator(factor=2.0)
@@ -1323,9 +1653,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
                     add_op.ladder_idx = li
 
                 if lad_exists:
-                    for pt in lad_points:
-                        if not geometry.memory_point_exists(pt):
-                            continue
+                    for pt in lad_present:
                         sub_row = sub.row(align=True)
                         sub_row.separator(factor=3.0)
                         sub_row.label(text=pt, icon='DOT')
@@ -1338,13 +1666,12 @@ class DGM_PT_main_panel(bpy.types.Panel):
                 ]
             _mem_group_dynamic(sub, "Door Points", "dgm.memory_add_doors",
                                "dgm_memory_doors_count", _door_groups)
+            sub.operator("dgm.memory_detect_doors", text="Detect Doors from Mesh", icon='VIEWZOOM')
 
             # Door rotation setup — shown per-door when both axis points exist
             door_count = scene.dgm_memory_doors_count
             for di in range(1, door_count + 1):
-                axis_exists = (geometry.memory_point_exists('door_{}_axis_1'.format(di)) and
-                               geometry.memory_point_exists('door_{}_axis_2'.format(di)))
-                if not axis_exists:
+                if di not in state["doors"]:
                     continue
 
                 target = scene.dgm_target_object
@@ -1426,6 +1753,7 @@ class DGM_PT_main_panel(bpy.types.Panel):
                 return [['light_{}'.format(i)] for i in range(1, count + 1)]
             _mem_group_dynamic(sub, "Light Positions", "dgm.memory_add_lights",
                                "dgm_memory_lights_count", _light_groups)
+            sub.operator("dgm.memory_detect_lights", text="Detect Lights from Mesh", icon='VIEWZOOM')
 
             _mem_group(sub, "Damage Hide", "dgm.memory_add_damage", 'damageHide')
 
@@ -1441,6 +1769,9 @@ class DGM_PT_main_panel(bpy.types.Panel):
             sub = box.box()
             sub.label(text="LOD index shown in Object Builder as e.g. 1.000, 2.000", icon='INFO')
             sub.label(text="Halve polys each step. ~500 polys min at highest index.")
+            target = scene.dgm_target_object
+            is_ladder = ladder_generator.is_confirmed_ladder(target)
+            is_cabin = cabin_generator.is_confirmed_cabin(target)
             for lod_num, lod_label in [
                 (1, "LOD 1.000  (highest detail)"),
                 (2, "LOD 2.000"),
@@ -1452,8 +1783,20 @@ class DGM_PT_main_panel(bpy.types.Panel):
                 lod_row = sub.row(align=True)
                 lod_row.prop(scene, "dgm_lod{}".format(lod_num), text="")
                 lod_row.label(text=lod_label)
+                if scene.dgm_lod_method != 'DECIMATE' and lod_num > 1 and not (is_ladder or is_cabin):
+                    lod_row.prop(scene, "dgm_lod{}_tris".format(lod_num), text="Tris")
             sub.separator()
+            if is_ladder or is_cabin:
+                sub.label(text="{}: LODs rebuilt from its parameters".format(
+                    "Ladder" if is_ladder else "Cabin"), icon='INFO')
+            else:
+                sub.prop(scene, "dgm_lod_method", text="Method")
+            pending = geometry.lod_builds_pending()
+            if pending:
+                sub.label(text="Building {} LOD(s)...".format(pending), icon='TIME')
+            sub.prop(scene, "dgm_share_lod_materials")
             sub.operator("dgm.create_lods", text="Create Selected LODs", icon='MESH_DATA')
+            sub.operator("dgm.merge_duplicate_materials", icon='MATERIAL')
 
         # ---- Export ----
         box, is_open = _section_header("dgm_show_export", "Export")
@@ -1477,8 +1820,8 @@ class DGM_PT_main_panel(bpy.types.Panel):
 
             # Scripts path — only relevant for container_base template
             if getattr(scene, "dgm_config_template", "container_base") == 'container_base':
-                has_doors = (geometry.memory_point_exists('door_1_axis_1') or
-                             geometry.memory_point_exists('door_1_axis_2'))
+                present = _panel_state(scene)["memory"]
+                has_doors = 'door_1_axis_1' in present or 'door_1_axis_2' in present
                 if has_doors:
                     col.prop(scene, "dgm_scripts_path", text="Scripts")
 
@@ -1510,6 +1853,7 @@ def register_scene_props():
     S.dgm_show_generators  = bpy.props.BoolProperty(default=False)
     S.dgm_show_ladder_gen  = bpy.props.BoolProperty(default=False)
     S.dgm_show_cabin_gen   = bpy.props.BoolProperty(default=False)
+    S.dgm_show_templates   = bpy.props.BoolProperty(default=False)
     S.dgm_show_collision   = bpy.props.BoolProperty(default=False)
     S.dgm_show_interior    = bpy.props.BoolProperty(default=False)
     S.dgm_show_terrain     = bpy.props.BoolProperty(default=False)
@@ -1518,6 +1862,19 @@ def register_scene_props():
     S.dgm_show_export      = bpy.props.BoolProperty(default=False)
     S.dgm_cta_baking_open  = bpy.props.BoolProperty(default=False)
 
+    # Per-selection bake queue
+    S.dgm_bake_parallel = bpy.props.BoolProperty(
+        name="Parallel Bakes",
+        description="Bake selections concurrently in background Blender processes when "
+                    "the baker supports it. Falls back to one at a time in this Blender",
+        default=True,
+    )
+    S.dgm_bake_workers = bpy.props.IntProperty(
+        name="Bakes at Once",
+        description="Background bakes to run at the same time. 0 = half the CPU cores",
+        default=0, min=0, max=16,
+    )
+
     # Fire Geometry quality
     S.dgm_fire_quality = bpy.props.IntProperty(
         name="Fire Geometry Subdivisions",
@@ -1526,8 +1883,8 @@ def register_scene_props():
     )
 
     # Memory point counts
-    S.dgm_memory_doors_count  = bpy.props.IntProperty(name="Doors",   default=1, min=1, max=8)
-    S.dgm_memory_lights_count = bpy.props.IntProperty(name="Lights",  default=1, min=1, max=8)
+    S.dgm_memory_doors_count  = bpy.props.IntProperty(name="Doors",   default=1, min=1, max=geometry.MAX_DOORS)
+    S.dgm_memory_lights_count = bpy.props.IntProperty(name="Lights",  default=1, min=1, max=512, soft_max=64)
     S.dgm_memory_ladders_count = bpy.props.IntProperty(name="Ladders", default=1, min=1, max=3)
 
     # Active move point name — empty string means none active
@@ -1537,8 +1894,8 @@ def register_scene_props():
     S.dgm_door_pose_active     = bpy.props.BoolProperty(default=False)
     S.dgm_door_pose_active_idx = bpy.props.IntProperty(default=0)
 
-    # Per-door config properties (supports up to 8 doors)
-    for _di in range(1, 9):
+    # Per-door config properties (one set per door slot)
+    for _di in range(1, geometry.MAX_DOORS + 1):
         setattr(S, 'dgm_door_{}_vgroup'.format(_di),
                 bpy.props.StringProperty(name="Door {} Vertex Group".format(_di), default=""))
         setattr(S, 'dgm_door_{}_closed_angle'.format(_di),
@@ -1584,6 +1941,38 @@ def register_scene_props():
         default=True,
     )
 
+    # Box fit for Geometry / View Geometry
+    S.dgm_box_fit = bpy.props.EnumProperty(
+        name="Box Fit",
+        description="Shape of the boxes built by Add Geometry and View Geometry",
+        items=geometry.BOX_FITS,
+        default='AABB',
+    )
+    S.dgm_box_fit_count = bpy.props.IntProperty(
+        name="Box Count",
+        description="Maximum number of oriented boxes for the Oriented Boxes fit",
+        default=2, min=2, max=8,
+    )
+
+    # Far shadow volume budget
+    S.dgm_shadow_far_tris = bpy.props.IntProperty(
+        name="Far Shadow Triangles",
+        description="Simplify Shadow Volume 2 to this many triangles. 0 = keep full detail",
+        default=0, min=0,
+    )
+
+    # Land Contact solver
+    S.dgm_land_contact_points = bpy.props.IntProperty(
+        name="Contact Points",
+        description="Number of ground contact points, spread for the largest support area",
+        default=4, min=1, max=16,
+    )
+    S.dgm_land_contact_tolerance = bpy.props.FloatProperty(
+        name="Ground Tolerance",
+        description="Vertices this close to the lowest point count as touching the ground",
+        default=0.05, min=0.0, max=10.0, subtype='DISTANCE', unit='LENGTH',
+    )
+
     # Resolution LOD toggles + view distances (real game meters per wiki guidance)
     for i in range(1, 7):
         setattr(S, "dgm_lod{}".format(i), bpy.props.BoolProperty(
@@ -1594,6 +1983,31 @@ def register_scene_props():
             description="LOD index number — shows as e.g. 1.000 in Object Builder. Use 1, 2, 3... sequentially",
             default=float(i), min=0.0, max=9999.0,
         ))
+        setattr(S, "dgm_lod{}_tris".format(i), bpy.props.IntProperty(
+            name="LOD {} Triangles".format(i),
+            description="Triangle budget for this LOD in the chain. 0 = automatic (~500 tris at the last LOD)",
+            default=0, min=0,
+        ))
+    S.dgm_share_lod_materials = bpy.props.BoolProperty(
+        name="Shared LOD Materials",
+        description="Generated LODs reuse the source materials. A LOD gets its own copy "
+                    "only once its DayZ material settings are edited",
+        default=True,
+    )
+    S.dgm_lod_method = bpy.props.EnumProperty(
+        name="LOD Method",
+        items=[
+            ('PARALLEL', "Parallel Budgets",
+             "Each LOD simplified from the source to a triangle budget in its own "
+             "worker process. Blender stays responsive while LODs build"),
+            ('CHAIN', "Budget Chain",
+             "Each LOD simplified from the previous one to a triangle budget. "
+             "Keeps UV seams, sharp edges and named selections"),
+            ('DECIMATE', "Decimate Ratios",
+             "Blender Decimate modifier with fixed ratios, each LOD from the source"),
+        ],
+        default='PARALLEL',
+    )
 
 
 def unregister_scene_props():
@@ -1601,16 +2015,19 @@ def unregister_scene_props():
     props = [
         "dgm_target_object",
         "dgm_pending_selection",
-        "dgm_show_selections", "dgm_show_generators", "dgm_show_ladder_gen", "dgm_show_cabin_gen", "dgm_show_collision", "dgm_show_interior", "dgm_show_terrain",
+        "dgm_show_selections", "dgm_show_generators", "dgm_show_ladder_gen", "dgm_show_cabin_gen", "dgm_show_templates", "dgm_show_collision", "dgm_show_interior", "dgm_show_terrain",
         "dgm_show_memory", "dgm_show_lods", "dgm_show_export", "dgm_cta_baking_open",
+        "dgm_bake_parallel", "dgm_bake_workers",
         "dgm_fire_quality",
         "dgm_memory_doors_count", "dgm_memory_lights_count", "dgm_memory_ladders_count",
         "dgm_moving_memory_point",
         "dgm_door_pose_active", "dgm_door_pose_active_idx",
         "dgm_p3d_path", "dgm_textures_path", "dgm_scripts_path", "dgm_config_template",
         "dgm_write_model_cfg",
+        "dgm_land_contact_points", "dgm_land_contact_tolerance",
+        "dgm_shadow_far_tris", "dgm_box_fit", "dgm_box_fit_count",
     ]
-    for _di in range(1, 9):
+    for _di in range(1, geometry.MAX_DOORS + 1):
         props += [
             'dgm_door_{}_vgroup'.format(_di),
             'dgm_door_{}_closed_angle'.format(_di),
@@ -1621,6 +2038,9 @@ def unregister_scene_props():
     for i in range(1, 7):
         props.append("dgm_lod{}".format(i))
         props.append("dgm_lod{}_dist".format(i))
+        props.append("dgm_lod{}_tris".format(i))
+    props.append("dgm_lod_method")
+    props.append("dgm_share_lod_materials")
     for p in props:
         if hasattr(S, p):
             try:
@@ -1663,6 +2083,42 @@ class DGM_OT_memory_add_ladder_n(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class DGM_OT_memory_add_all_ladders(bpy.types.Operator):
+    """Add memory points, view geometry and collision for every generated ladder."""
+    bl_idname = "dgm.memory_add_all_ladders"
+    bl_label = "Add All Ladders"
+    bl_description = (
+        "Add memory points and view geometry for every DZ_Ladder_N in the scene "
+        "in one pass (ladder N fills slot N), optionally with collision"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    collision: bpy.props.BoolProperty(
+        name="Collision",
+        description="Also (re)generate Geometry LOD collision for each ladder",
+        default=True,
+    )
+    mass_per_stringer: bpy.props.FloatProperty(
+        name="Mass per Stringer (kg)",
+        description="Collision mass of each stringer box in kg",
+        default=20.0, min=1.0, max=500.0, step=10,
+    )
+
+    def execute(self, context):
+        count, skipped = geometry.add_all_ladders(collision=self.collision,
+                                                  mass_per_stringer=self.mass_per_stringer)
+        note = ""
+        if skipped:
+            note = " (skipped {}: not DZ_Ladder_N, or slot taken)".format(", ".join(skipped))
+        if not count:
+            self.report({'WARNING'}, "No generated ladders (DZ_Ladder_N) in the scene" + note)
+            return {'CANCELLED'}
+        scene = context.scene
+        scene.dgm_memory_ladders_count = min(max(scene.dgm_memory_ladders_count, count), 3)
+        self.report({'WARNING'} if skipped else {'INFO'}, "Added {} ladder(s)".format(count) + note)
+        return {'FINISHED'}
+
+
 class DGM_OT_memory_delete_ladder(bpy.types.Operator):
     """Delete all memory points of a ladder group."""
     bl_idname = "dgm.memory_delete_ladder"
@@ -1721,13 +2177,7 @@ class DGM_OT_memory_rotate_ladder(bpy.types.Operator):
 
         verts_to_rotate = set()
         for name in point_names:
-            vg = mem.vertex_groups.get(name)
-            if not vg:
-                continue
-            for v in mem.data.vertices:
-                for g in v.groups:
-                    if g.group == vg.index:
-                        verts_to_rotate.add(v.index)
+            verts_to_rotate.update(geometry.memory_point_vertices(name))
 
         if not verts_to_rotate:
             self.report({'WARNING'}, "No ladder{} points found".format(self.ladder_idx))
@@ -1792,14 +2242,22 @@ operator_classes = (
     DGM_OT_door_finish_pose,
     DGM_OT_door_cancel_pose,
     DGM_OT_create_lods,
+    DGM_OT_merge_duplicate_materials,
+    DGM_OT_memory_detect_lights,
+    DGM_OT_memory_detect_doors,
     DGM_OT_add_named_prop,
     DGM_OT_remove_named_prop,
     DGM_OT_add_selection,
     DGM_OT_remove_selection,
     DGM_OT_bake_selections,
+    DGM_OT_cancel_bake,
     DGM_OT_memory_add_ladder_n,
+    DGM_OT_memory_add_all_ladders,
     DGM_OT_memory_delete_ladder,
     DGM_OT_memory_rotate_ladder,
+    DGM_OT_place_template,
+    DGM_OT_make_template_real,
+    DGM_OT_reload_asset_templates,
     DGM_PT_object_props,
     DGM_PT_generators,
     DGM_PT_main_panel,
@@ -1812,9 +2270,21 @@ def register():
     ladder_generator.register()
     cabin_generator.register()
     register_scene_props()
+    geometry.register_handlers()
+    integrity.register_handlers()
+    if _panel_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_panel_depsgraph_update)
 
 
 def unregister():
+    geometry.cancel_all_lod_builds()
+    baker_bridge.cancel_bake(force=True)
+    preview.clear()
+    assets.clear()
+    geometry.unregister_handlers()
+    integrity.unregister_handlers()
+    if _panel_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_panel_depsgraph_update)
     unregister_scene_props()
     ladder_generator.unregister()
     cabin_generator.unregister()
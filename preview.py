@@ -0,0 +1,131 @@
+"""
+DayZ Geometry Maker - Live Preview
+Shared preview engine for the generator dialogs (ladder, cabin).
+
+Built meshes are kept in a small LRU cache keyed by generator and parameter
+values, so stepping a value back and forth or confirming the dialog reuses
+an earlier build. Rapid edits (slider drags) are coalesced by a timer: each
+edit replaces the pending rebuild, and only the last value is built once the
+edits pause for DEBOUNCE seconds.
+"""
+
+import time
+from collections import OrderedDict
+
+import bpy
+
+
+# Built meshes kept for reuse
+_CACHE_SIZE = 24
+
+# Seconds without further edits before a pending preview is rebuilt
+DEBOUNCE = 0.08
+
+_builds = OrderedDict()   # (kind, params key) -> builder result
+_pending = {}             # token -> (due time, callback)
+_applied = {}             # mesh pointer -> ((kind, params key), vertex count) last written
+
+
+# ---------------------------------------------------------------------------
+# Build cache
+# ---------------------------------------------------------------------------
+
+def params_key(params):
+    """Hashable key for a parameter dict; floats are rounded so UI noise doesn't miss."""
+    return tuple(sorted((k, round(v, 6) if isinstance(v, float) else v)
+                        for k, v in params.items()))
+
+
+def build(kind, builder, params):
+    """builder(params) through the LRU cache. Results are shared — don't modify them."""
+    key = (kind, params_key(params))
+    hit = _builds.get(key)
+    if hit is not None:
+        _builds.move_to_end(key)
+        return hit
+    result = builder(params)
+    _builds[key] = result
+    while len(_builds) > _CACHE_SIZE:
+        _builds.popitem(last=False)
+    return result
+
+
+def apply(obj, kind, builder, writer, params):
+    """
+    Build (cached) and write the result into obj's mesh with writer(mesh, result).
+    The write is skipped when the mesh already shows these parameters.
+    Returns the builder result.
+    """
+    result = build(kind, builder, params)
+    mesh = obj.data
+    key = (kind, params_key(params))
+    ptr = mesh.as_pointer()
+    if _applied.get(ptr) != (key, len(mesh.vertices)):
+        writer(mesh, result)
+        _applied[ptr] = (key, len(mesh.vertices))
+    return result
+
+
+def forget(obj):
+    """Mark obj's mesh as changed outside the preview (snapshot restore etc.)."""
+    if obj is not None:
+        _applied.pop(obj.data.as_pointer(), None)
+
+
+# ---------------------------------------------------------------------------
+# Debounce
+# ---------------------------------------------------------------------------
+
+def schedule(token, callback, delay=DEBOUNCE):
+    """Run callback once no new schedule() for token arrived for `delay` seconds."""
+    _pending[token] = (time.monotonic() + delay, callback)
+    if not bpy.app.timers.is_registered(_flush_due):
+        bpy.app.timers.register(_flush_due, first_interval=delay)
+
+
+def flush(token):
+    """Run token's pending callback now (e.g. before the dialog commits)."""
+    item = _pending.pop(token, None)
+    if item is not None:
+        _run(item[1])
+
+
+def cancel(token):
+    """Drop token's pending callback."""
+    _pending.pop(token, None)
+
+
+def _run(callback):
+    try:
+        callback()
+    except Exception as e:
+        print("[DGM] Preview rebuild failed: {}".format(e))
+
+
+def _flush_due():
+    now = time.monotonic()
+    for token in [t for t, (due, _cb) in _pending.items() if due <= now]:
+        _run(_pending.pop(token)[1])
+    _redraw_view3d()
+    if not _pending:
+        return None
+    return max(0.01, min(due for due, _cb in _pending.values()) - now)
+
+
+def _redraw_view3d():
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    except Exception:
+        pass
+
+
+def clear():
+    """Drop pending rebuilds and cached builds (addon unregister)."""
+    _pending.clear()
+    _builds.clear()
+    _applied.clear()
+    if bpy.app.timers.is_registered(_flush_due):
+        bpy.app.timers.unregister(_flush_due)
@@ -3,6 +3,8 @@ DayZ Geometry Maker - Properties
 Standalone property definitions (no ArmaToolbox dependency).
 """
 
+import json
+
 import bpy
 
 LOD_PRESETS = [
@@ -196,23 +198,97 @@ class DGMObjectProperties(bpy.types.PropertyGroup):
     selection_mat_index: bpy.props.IntProperty(default=-1)
 
 
+# ---------------------------------------------------------------------------
+# Shared LOD materials — copy on write
+# ---------------------------------------------------------------------------
+
+# DayZ settings that make two materials different on export
+MATERIAL_SETTINGS = ("tex_type", "texture", "rv_mat", "color_value", "color_type", "color_string")
+
+_cow_busy = False
+
+
+def material_settings(mp):
+    """Hashable snapshot of a material's dgm_mat settings."""
+    return tuple(
+        tuple(round(c, 6) for c in mp.color_value) if key == "color_value" else getattr(mp, key)
+        for key in MATERIAL_SETTINGS
+    )
+
+
+def mark_material_shared(mat):
+    """Remember mat's current settings so a LOD edit can be split off."""
+    mat["dgm_mat_base"] = json.dumps(material_settings(mat.dgm_mat))
+
+
+def _restore_settings(mp, settings):
+    for key, value in zip(MATERIAL_SETTINGS, settings):
+        setattr(mp, key, tuple(value) if key == "color_value" else value)
+
+
+def _material_object_users(mat):
+    return sum(
+        1 for obj in bpy.data.objects
+        if any(slot.material == mat for slot in obj.material_slots)
+    )
+
+
+def _on_material_edit(self, context):
+    """
+    Copy on write for materials shared between the source and its LODs.
+    An edit made while a shared-material LOD is active gives that LOD its
+    own copy with the new settings and puts the shared one back; an edit
+    anywhere else applies to every user.
+    """
+    global _cow_busy
+    if _cow_busy:
+        return
+    mat = self.id_data
+    base = mat.get("dgm_mat_base")
+    if base is None:
+        return
+
+    obj = getattr(context, "object", None)
+    prefix = obj.get("dgm_shared_materials") if obj is not None else None
+    if (prefix and any(slot.material == mat for slot in obj.material_slots)
+            and _material_object_users(mat) > 1):
+        _cow_busy = True
+        try:
+            own = mat.copy()
+            own.name = "{}_{}".format(prefix, mat.name)
+            del own["dgm_mat_base"]
+            _restore_settings(mat.dgm_mat, json.loads(base))
+            for slot in obj.material_slots:
+                if slot.material == mat:
+                    slot.material = own
+        finally:
+            _cow_busy = False
+        print("[DGM] {}: material '{}' diverged, now '{}'".format(obj.name, mat.name, own.name))
+        return
+
+    mark_material_shared(mat)
+
+
 class DGMMaterialProperties(bpy.types.PropertyGroup):
     texture: bpy.props.StringProperty(
         name="Face Texture",
         description="Texture path (e.g. dz\\data\\texture.paa)",
         subtype="FILE_PATH",
         default="",
+        update=_on_material_edit,
     )
     rv_mat: bpy.props.StringProperty(
         name="RVMat Material",
         description="RVMat path (e.g. dz\\data\\material.rvmat)",
         subtype="FILE_PATH",
         default="",
+        update=_on_material_edit,
     )
     tex_type: bpy.props.EnumProperty(
         name="Color Map Type",
         description="Source of color for this surface",
         items=TEXTURE_CLASS,
+        update=_on_material_edit,
     )
     color_value: bpy.props.FloatVectorProperty(
         name="Color",
@@ -220,15 +296,18 @@ class DGMMaterialProperties(bpy.types.PropertyGroup):
         subtype='COLOR',
         min=0.0, max=1.0,
         default=(1.0, 1.0, 1.0),
+        update=_on_material_edit,
     )
     color_type: bpy.props.EnumProperty(
         name="Color Type",
         description="Texture suffix type",
         items=TEXTURE_TYPES,
+        update=_on_material_edit,
     )
     color_string: bpy.props.StringProperty(
         name="Resulting String",
         description="Resulting value for the procedural texture",
+        update=_on_material_edit,
     )
 
 
@@ -0,0 +1,294 @@
+"""
+DayZ Geometry Maker - Template Library
+Reusable sub-assemblies (ladders, doors, windows, light fittings) placed as
+collection instances and expanded into real geometry only at export.
+
+A piece is one or more registry P3Ds (see assets). Each LOD of a piece is
+built once into a library collection that is not linked to the scene:
+one object per LOD, with its memory points / Geometry components as vertex
+groups. Placing the piece adds an Empty instancing that collection, so a
+hundred placed doors share the same few meshes.
+
+On export every instance is expanded into temporary objects with their
+own copy of the library meshes (vertex group names live on the mesh, so
+they can't be renamed on a shared one), moved to the instance's transform
+and joined into the matching LODs. Numbered selections are renamed to the instance's slot
+("ladder1" -> "ladder3") and Geometry components are given unique names so
+they stay separate components.
+"""
+
+import json
+import os
+
+import bpy
+
+from . import assets
+
+
+# Library collections / meshes / objects are named with this prefix
+LIBRARY_PREFIX = "DGM_T_"
+
+# Scene collection holding placed instances
+INSTANCE_COLLECTION = "Templates"
+
+# (category, label, icon). User P3Ds fall into a category by name prefix
+# ("door_wood.p3d" -> door), anything else is "misc".
+CATEGORIES = (
+    ("ladder", "Ladders",         'MESH_CYLINDER'),
+    ("door",   "Doors",           'MOD_BUILD'),
+    ("window", "Windows",         'MESH_GRID'),
+    ("light",  "Light Fittings",  'LIGHT'),
+    ("misc",   "Other",           'FILE_3D'),
+)
+
+# Pieces built from several bundled assets (their LODs are combined)
+BUNDLED_PIECES = {
+    "ladder": ("ladder_view_geometry", "ladder_memory"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Catalogue
+# ---------------------------------------------------------------------------
+
+def _category(name):
+    for category, _label, _icon in CATEGORIES:
+        if name == category or name.startswith(category + "_"):
+            return category
+    return "misc"
+
+
+def pieces():
+    """
+    {piece name: {"category", "source", "assets"}} for the bundled pieces and
+    every P3D in the user template folder (one piece per file).
+    """
+    files = assets.asset_files()
+    bundled_parts = {a for parts in BUNDLED_PIECES.values() for a in parts}
+    found = {}
+    for name, parts in BUNDLED_PIECES.items():
+        if all(p in files for p in parts):
+            found[name] = {"category": _category(name), "source": "bundled", "assets": parts}
+    for name, (_path, source) in files.items():
+        if name in bundled_parts or name in found:
+            continue
+        found[name] = {"category": _category(name), "source": source, "assets": (name,)}
+    return found
+
+
+def _signature(piece):
+    """Source files and mtimes of a piece; the library is rebuilt when it changes."""
+    sig = []
+    for name in piece["assets"]:
+        path = assets.get(name)["path"]
+        sig.append([path, os.path.getmtime(path)])
+    return json.dumps(sig)
+
+
+# ---------------------------------------------------------------------------
+# Library
+# ---------------------------------------------------------------------------
+
+def library_collection(name):
+    """
+    The library collection of a piece, built on first use and rebuilt in
+    place (instances follow) when one of its P3Ds changed on disk.
+    """
+    piece = pieces().get(name)
+    if piece is None:
+        raise KeyError("Unknown template: {}".format(name))
+
+    col_name = LIBRARY_PREFIX + name
+    col = bpy.data.collections.get(col_name)
+    sig = _signature(piece)
+    if col is not None and col.get("dgm_template_sig") == sig and len(col.objects):
+        return col
+    if col is None:
+        col = bpy.data.collections.new(col_name)
+    else:
+        _clear_library(col)
+
+    from . import geometry
+    index = 0
+    for asset_name in piece["assets"]:
+        for lod in assets.get(asset_name)["lods"]:
+            obj_name = "{}{}.{}".format(LIBRARY_PREFIX, name, index)
+            mesh = bpy.data.meshes.new(obj_name)
+            assets.write_mesh(mesh, lod)
+            obj = bpy.data.objects.new(obj_name, mesh)
+            col.objects.link(obj)
+            geometry.add_selection_groups(obj, lod["selections"])
+            lod_value, distance = geometry.lod_from_resolution(lod["resolution"])
+            geometry.set_dgm_props(obj, lod_value, lod_distance=distance)
+            geometry.assign_default_material(obj)
+            obj["dgm_template_source"] = name
+            index += 1
+
+    col["dgm_template_sig"] = sig
+    col["dgm_template"] = name
+    return col
+
+
+def _clear_library(col):
+    for obj in list(col.objects):
+        mesh = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def is_template_source(obj):
+    """True for the library objects behind instances (never exported directly)."""
+    return bool(obj.get("dgm_template_source"))
+
+
+def is_template_instance(obj):
+    return (obj.type == 'EMPTY' and obj.get("dgm_template")
+            and obj.instance_type == 'COLLECTION' and obj.instance_collection is not None)
+
+
+def scene_instances(scene=None, name=None):
+    """Placed template instances in the scene (optionally of one piece)."""
+    scene = scene or bpy.context.scene
+    return [o for o in scene.objects if is_template_instance(o)
+            and (name is None or o.get("dgm_template") == name)]
+
+
+# ---------------------------------------------------------------------------
+# Placing
+# ---------------------------------------------------------------------------
+
+def _used_slots(category, scene):
+    """Slot numbers taken by instances of category or by Memory groups ("door2_axis")."""
+    used = {int(o.get("dgm_template_slot", 0)) for o in scene_instances(scene)
+            if _category(o.get("dgm_template", "")) == category}
+    from . import geometry
+    mem = geometry.get_memory_object()
+    if mem is not None:
+        for vg in mem.vertex_groups:
+            rest = vg.name[len(category):]
+            digits = rest.split("_", 1)[0]
+            if vg.name.startswith(category) and digits.isdigit():
+                used.add(int(digits))
+    return used
+
+
+def place_instance(name, location=(0.0, 0.0, 0.0)):
+    """Add an instance of a piece at location. Returns the instancing Empty."""
+    col = library_collection(name)
+    scene = bpy.context.scene
+    category = _category(name)
+    used = _used_slots(category, scene)
+    slot = next(i for i in range(1, len(used) + 2) if i not in used)
+
+    inst = bpy.data.objects.new("{}.{}".format(name, slot), None)
+    inst.empty_display_size = 0.25
+    inst.instance_type = 'COLLECTION'
+    inst.instance_collection = col
+    inst.location = location
+    inst["dgm_template"] = name
+    inst["dgm_template_slot"] = slot
+
+    from . import geometry
+    target = geometry.get_or_create_collection(INSTANCE_COLLECTION)
+    target.objects.link(inst)
+    return inst
+
+
+# ---------------------------------------------------------------------------
+# Expansion
+# ---------------------------------------------------------------------------
+
+def _instance_renames(inst, obj):
+    """Vertex group renames for one expanded part of inst."""
+    name = inst.get("dgm_template", "")
+    category = _category(name)
+    slot = int(inst.get("dgm_template_slot", 1))
+    renames = {}
+    for vg in obj.vertex_groups:
+        if vg.name.startswith("Component"):
+            renames[vg.name] = "Component_{}_{}".format(inst.name, vg.name)
+        elif category != "misc" and vg.name.startswith(category + "1"):
+            rest = vg.name[len(category) + 1:]
+            if not rest[:1].isdigit():
+                renames[vg.name] = "{}{}{}".format(category, slot, rest)
+    return renames
+
+
+def expand_instance(inst, collection):
+    """
+    Objects for every LOD part of inst, linked to collection, at the
+    instance's transform. Each part gets its own mesh copy before its
+    vertex groups are renamed, so the library meshes are never touched.
+    """
+    out = []
+    for src in inst.instance_collection.objects:
+        obj = src.copy()
+        obj.data = src.data.copy()
+        del obj["dgm_template_source"]
+        collection.objects.link(obj)
+        obj.matrix_world = inst.matrix_world @ src.matrix_world
+        for old, new in _instance_renames(inst, obj).items():
+            obj.vertex_groups[old].name = new
+        out.append(obj)
+    return out
+
+
+def expand_for_export(objects, collection):
+    """
+    Template instances among objects expanded into temporary parts linked to
+    collection. Library objects must be filtered out of the export by the
+    caller (is_template_source).
+    """
+    out = []
+    for inst in objects:
+        if is_template_instance(inst):
+            out.extend(expand_instance(inst, collection))
+    return out
+
+
+def remove_expanded(parts):
+    """Delete parts made by expand_for_export with their mesh copies."""
+    for obj in parts:
+        try:
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+        except ReferenceError:
+            continue
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def make_real(inst):
+    """
+    Replace an instance with editable copies of its parts, moved to the
+    collection of their LOD type. Geometry components get fresh ComponentXX
+    numbers. Returns the new objects.
+    """
+    from . import geometry
+    from .properties import lod_name
+    parts = expand_instance(inst, bpy.context.scene.collection)
+    for obj in parts:
+        lod = obj.dgm_props.lod
+        col_name = "Resolution LODs" if lod == '-1.0' else lod_name(float(lod))
+        obj.name = "{}.{}".format(inst.name, col_name)
+        geometry.move_to_collection(obj, col_name)
+
+        comps = [vg for vg in obj.vertex_groups if vg.name.startswith("Component")]
+        if lod == geometry.LOD_VALUES["Geometry"]:
+            indices = geometry.allocate_components(len(comps))
+        else:
+            first = geometry._next_collection_component(col_name)
+            indices = range(first, first + len(comps))
+        for vg, idx in zip(comps, indices):
+            vg.name = "Component{:02d}".format(idx)
+    bpy.data.objects.remove(inst, do_unlink=True)
+    return parts
+
+
+def clear_unused():
+    """Remove library collections no instance uses any more."""
+    for col in list(bpy.data.collections):
+        if col.get("dgm_template") and col.users == 0:
+            _clear_library(col)
+            bpy.data.collections.remove(col)
@@ -357,9 +357,26 @@ class DGMAddonPreferences(bpy.types.AddonPreferences):
         default=False,
     )
 
+    user_assets_path: bpy.props.StringProperty(
+        name="Template folder",
+        description=(
+            "Folder with extra template P3Ds (door / window presets etc.). "
+            "They are listed in the Template Library next to the bundled pieces. "
+            "Name them door_*, window_*, light_* or ladder_* to sort them by category"
+        ),
+        subtype='DIR_PATH',
+        default="",
+    )
+
     def draw(self, context):
         layout = self.layout
 
+        # ---- Template folder ----
+        box = layout.box()
+        box.label(text="Template Library", icon='FILE_3D')
+        box.prop(self, "user_assets_path")
+        layout.separator()
+
         # ---- Branch selector ----
         branch_box = layout.box()
         row = branch_box.row(align=True)